@@ -10,10 +10,13 @@ from app.extensions import db, login_manager
 # =========================================================
 # FACTORY
 # =========================================================
-def create_app():
+def create_app(config=None):
     """
     Factory principal da aplicação.
     Permite múltiplos ambientes, testes e escala futura.
+
+    `config` (dict opcional) sobrescreve a configuração do
+    ambiente, ex.: o banco usado nos testes.
     """
 
     # Carrega variáveis do .env
@@ -24,6 +27,9 @@ def create_app():
     # Carrega configuração baseada no ambiente
     app.config.from_object(get_config())
 
+    if config:
+        app.config.update(config)
+
     # =====================================================
     # INICIALIZA EXTENSÕES
     # =====================================================
@@ -73,6 +79,7 @@ def create_app():
     from app.tenant.routes import tenant_bp
     from app.tenant.cash_routes import cash_bp
     from app.tenant.reports_routes import tenant_reports_bp
+    from app.tenant.api_routes import tenant_api_bp
     from app.booking.routes import booking_bp
 
     app.register_blueprint(auth_bp)
@@ -80,8 +87,22 @@ def create_app():
     app.register_blueprint(tenant_bp)
     app.register_blueprint(cash_bp)
     app.register_blueprint(tenant_reports_bp)
+    app.register_blueprint(tenant_api_bp)
     app.register_blueprint(booking_bp)
 
+    # =====================================================
+    # CACHE DE RELATÓRIOS — invalida a cada commit com
+    # escrita em movimentos, despesas ou agendamentos
+    # =====================================================
+    from app.utils.report_cache import registrar_eventos
+    registrar_eventos(db.session)
+
+    # =====================================================
+    # COMANDOS CLI
+    # =====================================================
+    from app.cli import register_commands
+    register_commands(app)
+
     # =====================================================
     # HEALTHCHECK (Render exige rota válida)
     # =====================================================
@@ -103,6 +124,18 @@ def create_app():
     def inject_now():
         return {"now": datetime.utcnow}
 
+    # Branding do tenant logado (logo, nome) vindo do cache,
+    # sem carregar current_user.tenant a cada render
+    @app.context_processor
+    def inject_branding():
+        from flask_login import current_user
+        from app.utils.tenant_cache import get_tenant_by_id
+
+        if not current_user.is_authenticated:
+            return {"branding": None}
+
+        return {"branding": get_tenant_by_id(current_user.tenant_id)}
+
     return app
 
 
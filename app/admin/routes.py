@@ -1,7 +1,8 @@
 from flask import (
     Blueprint, render_template,
     request, redirect, url_for,
-    flash, abort, session
+    flash, abort, session, jsonify,
+    current_app, Response
 )
 from flask_login import (
     login_required,
@@ -9,12 +10,15 @@ from flask_login import (
     login_user
 )
 
-from sqlalchemy import func
-from datetime import datetime, timedelta
-
 from app.extensions import db
 from app.models.tenant import Tenant
 from app.models.user import User
+from app.models.report_job import ReportJob, CONCLUIDO
+from app.admin.services import (
+    financeiro_global, get_global_kpis, listar_tenants_resumo
+)
+from app.utils.tenant_cache import cache_stats
+from app.utils.report_jobs import solicitar
 
 
 admin_bp = Blueprint(
@@ -34,11 +38,7 @@ def dashboard():
     if not current_user.is_admin_global():
         abort(403)
 
-    tenants = Tenant.query.order_by(Tenant.criado_em.desc()).all()
-
-    total_tenants = len(tenants)
-    ativos = len([t for t in tenants if t.ativo])
-    inativos = len([t for t in tenants if not t.ativo])
+    kpis = get_global_kpis()
 
     period = request.args.get("period", "30")
 
@@ -47,83 +47,40 @@ def dashboard():
     except:
         days = 30
 
-    start_date = datetime.utcnow() - timedelta(days=days)
-
-    total_faturamento = 0
-    ranking = []
-    faturamento_mensal = []
+    job = None
+    financeiro = {
+        "total_faturamento": 0,
+        "ranking": [],
+        "faturamento_mensal": [],
+    }
 
     try:
-        from app.models.cash_movement import CashMovement
-
-        # ============================
-        # TOTAL FATURAMENTO
-        # ============================
-        total_faturamento = (
-            db.session.query(func.sum(CashMovement.valor))
-            .filter(CashMovement.tipo == "ENTRADA")
-            .filter(CashMovement.criado_em >= start_date)
-            .scalar()
-        ) or 0
-
-        # ============================
-        # RANKING DE TENANTS
-        # ============================
-        ranking_query = (
-            db.session.query(
-                Tenant,
-                func.coalesce(func.sum(CashMovement.valor), 0).label("faturamento")
-            )
-            .outerjoin(CashMovement, CashMovement.tenant_id == Tenant.id)
-            .filter(
-                (CashMovement.tipo == "ENTRADA") |
-                (CashMovement.tipo.is_(None))
+        # Períodos longos: calculados num job em segundo
+        # plano; a página acompanha e recarrega ao terminar
+        if days > current_app.config.get("REPORT_JOBS_MIN_DAYS", 92):
+            job = solicitar(
+                None, current_user.id, "admin_dashboard", {"days": days}
             )
-            .filter(
-                (CashMovement.criado_em >= start_date) |
-                (CashMovement.criado_em.is_(None))
-            )
-            .group_by(Tenant.id)
-            .order_by(func.sum(CashMovement.valor).desc())
-            .all()
-        )
-
-        ranking = [
-            {"tenant": r[0], "faturamento": float(r[1] or 0)}
-            for r in ranking_query
-        ]
-
-        # ============================
-        # FATURAMENTO MENSAL
-        # PostgreSQL compatible
-        # ============================
-        faturamento_raw = (
-            db.session.query(
-                func.to_char(CashMovement.criado_em, 'YYYY-MM').label("mes"),
-                func.sum(CashMovement.valor)
-            )
-            .filter(CashMovement.tipo == "ENTRADA")
-            .filter(CashMovement.criado_em >= start_date)
-            .group_by("mes")
-            .order_by("mes")
-            .all()
-        )
 
-        faturamento_mensal = [(m, float(v or 0)) for m, v in faturamento_raw]
+            if job.status == CONCLUIDO:
+                financeiro = job.payload
+        else:
+            financeiro = financeiro_global(days)
 
     except Exception as e:
         print("Dashboard Financeiro não disponível:", e)
 
     return render_template(
         "admin/dashboard.html",
-        tenants=tenants,
-        total_tenants=total_tenants,
-        ativos=ativos,
-        inativos=inativos,
+        tenants=listar_tenants_resumo(),
+        total_tenants=kpis["total"],
+        ativos=kpis["ativos"],
+        inativos=kpis["inativos"],
         period=str(period),
-        total_faturamento=total_faturamento,
-        ranking=ranking,
-        faturamento_mensal=faturamento_mensal
+        total_faturamento=financeiro["total_faturamento"],
+        ranking=financeiro["ranking"],
+        faturamento_mensal=financeiro["faturamento_mensal"],
+        job=job
     )
 
 
@@ -267,3 +224,59 @@ def return_admin():
 
     flash("Você voltou para o painel administrativo", "success")
     return redirect(url_for("admin.dashboard"))
+
+
+
+# =========================================================
+# MÉTRICAS DO CACHE DE TENANTS
+# =========================================================
+@admin_bp.route("/cache/stats", methods=["GET"])
+@login_required
+def cache_stats_view():
+
+    if not current_user.is_admin_global():
+        abort(403)
+
+    return jsonify({"tenants": cache_stats()})
+
+
+
+# =========================================================
+# JOBS DE RELATÓRIO DA PLATAFORMA
+# =========================================================
+@admin_bp.route("/reports/jobs/<int:job_id>", methods=["GET"])
+@login_required
+def job_status(job_id):
+
+    return jsonify(_job_da_plataforma(job_id).para_dict())
+
+
+@admin_bp.route("/reports/jobs/<int:job_id>/download", methods=["GET"])
+@login_required
+def job_download(job_id):
+
+    job = _job_da_plataforma(job_id)
+
+    if job.status != CONCLUIDO:
+        abort(409)
+
+    return Response(
+        job.resultado,
+        mimetype="application/json",
+        headers={
+            "Content-Disposition":
+                f"attachment; filename=relatorio_{job.tipo}_{job.id}.json"
+        }
+    )
+
+
+def _job_da_plataforma(job_id):
+    if not current_user.is_admin_global():
+        abort(403)
+
+    job = ReportJob.query.get_or_404(job_id)
+
+    if job.tenant_id is not None:
+        abort(404)
+
+    return job
@@ -1,11 +1,15 @@
+from datetime import timedelta
+
 from sqlalchemy import func
-from datetime import date
 
 from app.extensions import db
 from app.models.tenant import Tenant
 from app.models.user import User
 from app.models.payment import Payment
 from app.models.appointment import Appointment
+from app.utils.dates import hoje_local
+from app.utils.db import conta_se
+from app.utils import timebucket
 
 
 # =========================================================
@@ -16,6 +20,23 @@ def get_all_tenants():
     return Tenant.query.order_by(Tenant.criado_em.desc()).all()
 
 
+def listar_tenants_resumo():
+    """
+    Lista leve para a tabela do dashboard: só id, nome,
+    slug e ativo (sem carregar as entidades completas)
+    """
+    return (
+        db.session.query(
+            Tenant.id,
+            Tenant.nome,
+            Tenant.slug,
+            Tenant.ativo
+        )
+        .order_by(Tenant.criado_em.desc())
+        .all()
+    )
+
+
 def get_tenant_by_id(tenant_id: int):
     return Tenant.query.get_or_404(tenant_id)
 
@@ -34,16 +55,19 @@ def get_tenant_admin(tenant_id: int):
 
 def get_global_kpis():
     """
-    KPIs gerais da plataforma
+    KPIs gerais da plataforma (uma consulta, contagens
+    condicionais no banco)
     """
-    total_tenants = Tenant.query.count()
-    tenants_ativos = Tenant.query.filter_by(ativo=True).count()
-    tenants_inativos = Tenant.query.filter_by(ativo=False).count()
+    total_tenants, tenants_ativos, tenants_inativos = db.session.query(
+        func.count(Tenant.id),
+        conta_se(Tenant.ativo.is_(True)),
+        conta_se(Tenant.ativo.is_(False))
+    ).one()
 
     return {
-        "total": total_tenants,
-        "ativos": tenants_ativos,
-        "inativos": tenants_inativos
+        "total": int(total_tenants or 0),
+        "ativos": int(tenants_ativos or 0),
+        "inativos": int(tenants_inativos or 0)
     }
 
 
@@ -85,6 +109,91 @@ def get_top_tenants_by_faturamento(limit=5):
     return results
 
 
+def financeiro_global(days: int):
+    """
+    Faturamento da plataforma nos últimos `days` dias:
+    total, ranking por barbearia e série mensal.
+
+    Lê platform_daily_metrics (uma linha por tenant / dia).
+    Só tipos simples (o payload também é gravado pelos jobs
+    de relatório).
+    """
+    from app.models.platform_daily_metric import PlatformDailyMetric as P
+
+    hoje = hoje_local()
+    inicio = hoje - timedelta(days=days)
+
+    # ============================
+    # RANKING DE TENANTS
+    # Todos os tenants entram: o filtro de período fica no
+    # ON do LEFT JOIN (no WHERE descartaria quem não teve
+    # movimento na janela). O total sai da soma do ranking.
+    # ============================
+    faturamento = func.coalesce(func.sum(P.entradas), 0)
+
+    ranking_query = (
+        db.session.query(
+            Tenant.id,
+            Tenant.nome,
+            Tenant.ativo,
+            faturamento.label("faturamento")
+        )
+        .outerjoin(
+            P,
+            db.and_(
+                P.tenant_id == Tenant.id,
+                P.dia >= inicio,
+                P.dia <= hoje
+            )
+        )
+        .group_by(Tenant.id, Tenant.nome, Tenant.ativo)
+        .order_by(faturamento.desc(), Tenant.nome)
+        .all()
+    )
+
+    ranking = [
+        {
+            "tenant": {"id": tenant_id, "nome": nome, "ativo": bool(ativo)},
+            "faturamento": float(valor or 0),
+        }
+        for tenant_id, nome, ativo, valor in ranking_query
+    ]
+
+    # ============================
+    # FATURAMENTO MENSAL
+    # Agrupamento portável (Postgres / SQLite),
+    # meses sem movimento entram com zero
+    # ============================
+    mes = timebucket.periodo(P.dia, timebucket.MES)
+
+    faturamento_raw = (
+        db.session.query(
+            mes,
+            func.sum(P.entradas)
+        )
+        .filter(P.dia >= inicio, P.dia <= hoje)
+        .group_by(mes)
+        .all()
+    )
+
+    faturamento_mensal = [
+        (inicio_mes.strftime("%Y-%m"), float(v or 0))
+        for inicio_mes, v in timebucket.preencher(
+            faturamento_raw,
+            inicio,
+            hoje,
+            timebucket.MES,
+            0
+        )
+    ]
+
+    return {
+        "total_faturamento": sum(item["faturamento"] for item in ranking),
+        "ranking": ranking,
+        "faturamento_mensal": faturamento_mensal,
+    }
+
+
 # =========================================================
 # AGENDAMENTOS
 # =========================================================
@@ -103,11 +212,9 @@ def get_tenant_completed_appointments(tenant_id: int):
 
 
 def get_tenant_appointments_today(tenant_id: int):
-    today = date.today()
-
     return Appointment.query.filter(
         Appointment.tenant_id == tenant_id,
-        func.date(Appointment.data_hora) == today
+        Appointment.data_local == hoje_local(tenant_id)
     ).count()
 
 
@@ -0,0 +1,371 @@
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta
+
+from app.extensions import db
+from app.models.appointment import Appointment
+from app.models.service import Service
+from app.models.available_slot import AvailableSlot
+from app.models.barber_schedule import BarberSchedule
+from app.models.schedule_exception import ScheduleException
+from app.utils.dates import filtro_periodo
+
+# =========================================================
+# DISPONIBILIDADE VIRTUAL (REGRAS DE AGENDA)
+# =========================================================
+# Horários de barbeiros com BarberSchedule não ficam
+# gravados na tabela available_slots. Eles são calculados
+# sob demanda:
+#
+#   regras expandidas
+#   − exceções (bloqueios / fechamentos)
+#   − agendamentos existentes
+#   − horários já materializados em available_slots
+#
+# Um horário virtual só vira linha em available_slots no
+# momento da reserva (ver reservar_servico).
+# =========================================================
+
+# Duração assumida de um slot quando o dia tem um só horário
+PASSO_PADRAO_MIN = 30
+
+
+def horarios_virtuais(tenant_id, barber_id, data_inicio, data_fim):
+    """
+    Lista ordenada de (data, hora) livres pelas regras do
+    barbeiro entre data_inicio e data_fim (inclusive).
+
+    Custo fixo de 4 consultas, independente do tamanho
+    da janela.
+    """
+    regras = _regras(tenant_id, barber_id, data_inicio, data_fim)
+
+    if not regras:
+        return []
+
+    dados = _carregar(tenant_id, barber_id, data_inicio, data_fim)
+
+    return _expandir_livres(regras, *dados, data_inicio, data_fim)
+
+
+def barbeiros_com_regra(tenant_id, barber_ids):
+    """
+    Quais destes barbeiros têm regra de agenda ativa
+    """
+    rows = db.session.query(
+        BarberSchedule.barber_id
+    ).filter(
+        BarberSchedule.tenant_id == tenant_id,
+        BarberSchedule.barber_id.in_(barber_ids),
+        BarberSchedule.ativo == True
+    ).distinct().all()
+
+    return sorted(barber_id for barber_id, in rows)
+
+
+# =========================================================
+# AGENDA DO DIA (CONSULTA POR DURAÇÃO)
+# =========================================================
+class AgendaDia:
+    """
+    Agenda de UM barbeiro em UM dia, em listas ordenadas
+    para responder por bisect, em O(log n):
+
+        "o serviço de N minutos pode começar às T?"
+
+    - livres: inícios de horários livres (materializados
+      e virtuais)
+    - blocos: trechos contínuos livres [inicio, fim), cada
+      horário livre ocupando um passo da grade
+    - ocupados: agendamentos [inicio, inicio + duração),
+      unidos quando se sobrepõem
+    """
+
+    def __init__(self, dia, livres, virtuais, ocupados, passo):
+        self.dia = dia
+        self.passo = passo
+        self.livres = sorted(livres)
+        self.virtuais = set(virtuais)
+
+        self.blocos = _unir([(h, h + passo) for h in self.livres])
+        self._blocos_inicio = [b[0] for b in self.blocos]
+
+        self.ocupados = _unir(sorted(ocupados))
+        self._ocupados_inicio = [o[0] for o in self.ocupados]
+
+    def livre(self, inicio) -> bool:
+        i = bisect_left(self.livres, inicio)
+        return i < len(self.livres) and self.livres[i] == inicio
+
+    def cabe(self, inicio, duracao_min) -> bool:
+        """
+        Começa num horário livre, cabe inteiro num trecho
+        contínuo livre e não cruza nenhum agendamento.
+        """
+        if not self.livre(inicio):
+            return False
+
+        fim = inicio + timedelta(minutes=max(duracao_min or 0, 1))
+
+        # Trecho livre que contém o início
+        i = bisect_right(self._blocos_inicio, inicio) - 1
+        if i < 0 or self.blocos[i][1] < fim:
+            return False
+
+        # Último agendamento que começa antes do fim
+        j = bisect_left(self._ocupados_inicio, fim) - 1
+        return j < 0 or self.ocupados[j][1] <= inicio
+
+    def cobertos(self, inicio, duracao_min):
+        """
+        Horários livres consumidos pelo serviço
+        """
+        fim = inicio + timedelta(minutes=max(duracao_min or 0, 1))
+
+        return self.livres[
+            bisect_left(self.livres, inicio):bisect_left(self.livres, fim)
+        ]
+
+
+def agendas(tenant_id, barber_id, data_inicio, data_fim):
+    """
+    {dia: AgendaDia} do barbeiro na janela (inclusive).
+
+    Mesmo custo de horarios_virtuais: 4 consultas.
+    """
+    regras = _regras(tenant_id, barber_id, data_inicio, data_fim)
+    excecoes, ocupados, slots = _carregar(
+        tenant_id, barber_id, data_inicio, data_fim
+    )
+
+    virtuais = _expandir_livres(
+        regras, excecoes, ocupados, slots, data_inicio, data_fim
+    ) if regras else []
+
+    # Todos os inícios do dia (qualquer status) definem a grade
+    grade = {}
+    livres = {}
+    virtuais_dia = {}
+
+    for data, hora, disponivel in slots:
+        inicio = datetime.combine(data, hora)
+        grade.setdefault(data, []).append(inicio)
+        if disponivel:
+            livres.setdefault(data, []).append(inicio)
+
+    for data, hora in virtuais:
+        inicio = datetime.combine(data, hora)
+        grade.setdefault(data, []).append(inicio)
+        livres.setdefault(data, []).append(inicio)
+        virtuais_dia.setdefault(data, []).append(inicio)
+
+    ocupados_dia = {}
+    for intervalo in ocupados:
+        ocupados_dia.setdefault(intervalo[0].date(), []).append(intervalo)
+
+    resultado = {}
+
+    for dia, inicios in grade.items():
+        inicios.sort()
+
+        passos = [b - a for a, b in zip(inicios, inicios[1:]) if b > a]
+        passo = min(passos) if passos else timedelta(minutes=PASSO_PADRAO_MIN)
+
+        resultado[dia] = AgendaDia(
+            dia=dia,
+            livres=livres.get(dia, []),
+            virtuais=virtuais_dia.get(dia, []),
+            ocupados=ocupados_dia.get(dia, []),
+            passo=passo
+        )
+
+    return resultado
+
+
+def reservar_servico(tenant_id, barber_id, agenda, inicio, duracao_min) -> bool:
+    """
+    Ocupa TODOS os horários cobertos pelo serviço.
+
+    Horários virtuais cobertos são materializados antes;
+    depois um único UPDATE condicional marca o intervalo.
+    Se outro agendamento levou algum deles, o número de
+    linhas alteradas não bate e a reserva falha (o chamador
+    faz rollback). Não faz commit.
+    """
+    cobertos = agenda.cobertos(inicio, duracao_min)
+
+    virtuais = [h for h in cobertos if h in agenda.virtuais]
+
+    if virtuais:
+        AvailableSlot.inserir_em_lote(
+            tenant_id=tenant_id,
+            barber_id=barber_id,
+            horarios=[(h.date(), h.time()) for h in virtuais]
+        )
+
+    fim = inicio + timedelta(minutes=max(duracao_min or 0, 1))
+
+    return AvailableSlot.reservar_periodo(
+        tenant_id=tenant_id,
+        barber_id=barber_id,
+        data=inicio.date(),
+        hora_inicio=inicio.time(),
+        hora_fim=fim.time() if fim.date() == inicio.date() else None,
+        esperados=len(cobertos)
+    )
+
+
+# =========================================================
+# HELPERS
+# =========================================================
+def _regras(tenant_id, barber_id, data_inicio, data_fim):
+    return BarberSchedule.query.filter(
+        BarberSchedule.tenant_id == tenant_id,
+        BarberSchedule.barber_id == barber_id,
+        BarberSchedule.ativo == True,
+        BarberSchedule.valido_de <= data_fim,
+        db.or_(
+            BarberSchedule.valido_ate.is_(None),
+            BarberSchedule.valido_ate >= data_inicio
+        )
+    ).all()
+
+
+def _carregar(tenant_id, barber_id, data_inicio, data_fim):
+    """
+    (exceções, agendamentos, slots materializados) da janela
+    """
+    excecoes = ScheduleException.query.filter(
+        ScheduleException.tenant_id == tenant_id,
+        db.or_(
+            ScheduleException.barber_id.is_(None),
+            ScheduleException.barber_id == barber_id
+        ),
+        ScheduleException.data >= data_inicio,
+        ScheduleException.data <= data_fim
+    ).all()
+
+    ocupados = _intervalos_agendados(
+        tenant_id, barber_id, data_inicio, data_fim
+    )
+
+    # Horários que já têm linha própria (livre, ocupada
+    # ou bloqueada) seguem as regras da linha
+    slots = db.session.query(
+        AvailableSlot.data,
+        AvailableSlot.hora,
+        AvailableSlot.disponivel
+    ).filter(
+        AvailableSlot.tenant_id == tenant_id,
+        AvailableSlot.barber_id == barber_id,
+        AvailableSlot.data >= data_inicio,
+        AvailableSlot.data <= data_fim
+    ).all()
+
+    return excecoes, ocupados, slots
+
+
+def _expandir_livres(regras, excecoes, ocupados, slots,
+                     data_inicio, data_fim):
+    materializados = {(data, hora) for data, hora, _ in slots}
+
+    livres = set()
+    dia = data_inicio
+
+    while dia <= data_fim:
+        bloqueios = [e for e in excecoes if e.data == dia]
+
+        if not any(e.dia_inteiro for e in bloqueios):
+            for regra in regras:
+                if not regra.vale_em(dia):
+                    continue
+
+                for hora in _expandir(dia, regra):
+                    if (dia, hora) in materializados:
+                        continue
+
+                    inicio = datetime.combine(dia, hora)
+                    fim = inicio + timedelta(minutes=regra.intervalo_min)
+
+                    if _bloqueado(bloqueios, inicio, fim):
+                        continue
+                    if _sobrepoe(ocupados, inicio, fim):
+                        continue
+
+                    livres.add((dia, hora))
+
+        dia += timedelta(days=1)
+
+    return sorted(livres)
+
+
+def _expandir(dia, regra):
+    # Regra com intervalo <= 0 (anterior à validação) não
+    # gera horários: o laço abaixo nunca terminaria
+    if not regra.intervalo_min or regra.intervalo_min <= 0:
+        return
+
+    passo = timedelta(minutes=regra.intervalo_min)
+    atual = datetime.combine(dia, regra.hora_inicio)
+    fim = datetime.combine(dia, regra.hora_fim)
+
+    while atual < fim:
+        yield atual.time()
+        atual += passo
+
+
+def _intervalos_agendados(tenant_id, barber_id, data_inicio, data_fim):
+    """
+    Intervalos [inicio, fim) ocupados por agendamentos
+    não cancelados, considerando a duração do serviço.
+    """
+    rows = db.session.query(
+        Appointment.data_hora,
+        Service.duracao_min
+    ).join(
+        Service, Service.id == Appointment.service_id
+    ).filter(
+        Appointment.tenant_id == tenant_id,
+        Appointment.barber_id == barber_id,
+        Appointment.status != "CANCELADO",
+        *filtro_periodo(Appointment.data_hora, data_inicio, data_fim)
+    ).all()
+
+    return [
+        (inicio, inicio + timedelta(minutes=duracao or 0))
+        for inicio, duracao in rows
+    ]
+
+
+def _unir(intervalos):
+    """
+    Une intervalos ordenados que se tocam ou se sobrepõem
+    """
+    unidos = []
+
+    for inicio, fim in intervalos:
+        if unidos and inicio <= unidos[-1][1]:
+            unidos[-1] = (unidos[-1][0], max(unidos[-1][1], fim))
+        else:
+            unidos.append((inicio, fim))
+
+    return unidos
+
+
+def _bloqueado(bloqueios, inicio, fim):
+    for e in bloqueios:
+        if e.dia_inteiro:
+            return True
+
+        bloqueio_inicio = datetime.combine(e.data, e.hora_inicio)
+        bloqueio_fim = datetime.combine(e.data, e.hora_fim)
+
+        if inicio < bloqueio_fim and bloqueio_inicio < fim:
+            return True
+    return False
+
+
+def _sobrepoe(intervalos, inicio, fim):
+    return any(
+        inicio < ocupado_fim and ocupado_inicio < fim
+        for ocupado_inicio, ocupado_fim in intervalos
+    )
@@ -0,0 +1,130 @@
+import secrets
+import threading
+import time
+from datetime import datetime, timedelta
+
+# =========================================================
+# RETENÇÃO TEMPORÁRIA DE HORÁRIOS (HOLD)
+# =========================================================
+# Ao escolher um horário, o cliente o "segura" por alguns
+# minutos enquanto preenche o formulário. Outros clientes
+# deixam de ver o horário no feed e não conseguem reservá-lo.
+#
+# Armazenamento em memória do processo, com expiração:
+# - chave: (tenant_id, barber_id, data, hora)
+# - cada token segura no máximo um horário (o inicial);
+#   a reserva e os feeds com serviço conferem todos os
+#   horários cobertos pela duração, não só o inicial
+# - itens vencidos são removidos sob demanda (varredura
+#   preguiçosa), sem thread de limpeza
+#
+# Com vários workers o hold vale só no worker que o criou;
+# a reserva atômica do slot continua sendo a garantia
+# final contra conflito.
+# =========================================================
+
+# Intervalo mínimo entre varreduras completas (segundos)
+VARREDURA_INTERVALO = 30
+
+_lock = threading.Lock()
+_holds = {}      # chave → (token, expira_em)
+_por_token = {}  # token → chave
+_ultima_varredura = 0.0
+
+
+def segurar(tenant_id, barber_id, data, hora, minutos, token=None):
+    """
+    Segura o horário para o token informado (ou um novo).
+
+    Retorna (token, expira_em) ou None se outro cliente
+    já segura o horário.
+    """
+    chave = (tenant_id, barber_id, data, hora)
+    agora = time.monotonic()
+
+    with _lock:
+        _varrer(agora)
+
+        atual = _holds.get(chave)
+        if atual and atual[1] > agora and atual[0] != token:
+            return None
+
+        token = token or secrets.token_urlsafe(16)
+
+        # Um horário por token: troca de horário libera o anterior
+        anterior = _por_token.get(token)
+        if anterior and anterior != chave:
+            _holds.pop(anterior, None)
+
+        _holds[chave] = (token, agora + minutos * 60)
+        _por_token[token] = chave
+
+    expira_em = datetime.utcnow() + timedelta(minutes=minutos)
+    return token, expira_em
+
+
+def liberar(token):
+    """
+    Libera o horário segurado pelo token (se houver)
+    """
+    if not token:
+        return
+
+    with _lock:
+        chave = _por_token.pop(token, None)
+        if chave and _holds.get(chave, (None,))[0] == token:
+            del _holds[chave]
+
+
+def retido_por_outro(tenant_id, barber_id, data, hora, token=None) -> bool:
+    """
+    O horário está segurado por um token diferente?
+    """
+    agora = time.monotonic()
+
+    with _lock:
+        atual = _holds.get((tenant_id, barber_id, data, hora))
+
+    return bool(atual and atual[1] > agora and atual[0] != token)
+
+
+def horarios_retidos(tenant_id, barber_id, token=None):
+    """
+    Conjunto de (data, hora) segurados por outros clientes
+    """
+    agora = time.monotonic()
+
+    with _lock:
+        _varrer(agora)
+
+        return {
+            (data, hora)
+            for (t_id, b_id, data, hora), (dono, expira_em) in _holds.items()
+            if t_id == tenant_id
+            and b_id == barber_id
+            and expira_em > agora
+            and dono != token
+        }
+
+
+def _varrer(agora):
+    """
+    Remove holds vencidos. Roda no máximo a cada
+    VARREDURA_INTERVALO segundos; chamar com _lock.
+    """
+    global _ultima_varredura
+
+    if agora - _ultima_varredura < VARREDURA_INTERVALO:
+        return
+
+    _ultima_varredura = agora
+
+    vencidos = [
+        chave for chave, (_, expira_em) in _holds.items()
+        if expira_em <= agora
+    ]
+
+    for chave in vencidos:
+        token, _ = _holds.pop(chave)
+        if _por_token.get(token) == chave:
+            del _por_token[token]
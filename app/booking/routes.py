@@ -1,9 +1,11 @@
 from flask import (
     Blueprint, render_template,
     request, redirect, url_for,
-    flash
+    flash, jsonify, abort, current_app
 )
-from datetime import datetime
+from datetime import datetime, timedelta
+from collections import namedtuple
+from sqlalchemy import tuple_, func
 
 from app.extensions import db
 from app.models.tenant import Tenant
@@ -11,6 +13,15 @@ from app.models.user import User
 from app.models.service import Service
 from app.models.appointment import Appointment
 from app.models.available_slot import AvailableSlot
+from app.utils.tenant_cache import get_tenant_by_slug
+from app.utils.dates import agora_local
+from app.booking import holds
+from app.booking.availability import (
+    horarios_virtuais,
+    barbeiros_com_regra,
+    agendas,
+    reservar_servico
+)
 
 
 booking_bp = Blueprint(
@@ -18,6 +29,36 @@ booking_bp = Blueprint(
     __name__
 )
 
+# Janela padrão do feed de horários (uma semana)
+SLOTS_JANELA_DIAS = 7
+
+# Janela máxima aceita pelo feed (limita a expansão de regras)
+SLOTS_JANELA_MAXIMA_DIAS = 31
+
+# Limites de paginação do feed
+SLOTS_LIMITE_PADRAO = 100
+SLOTS_LIMITE_MAXIMO = 300
+
+# "Primeiro disponível" entre todos os barbeiros
+PRIMEIROS_JANELA_DIAS = 14
+PRIMEIROS_LIMITE_PADRAO = 10
+PRIMEIROS_LIMITE_MAXIMO = 50
+
+# Resultado da validação de um POST de agendamento
+ValidacaoAgendamento = namedtuple(
+    "ValidacaoAgendamento",
+    [
+        "tenant_id",
+        "barber_ok",
+        "service_ok",
+        "duracao_min",
+        "slot_id",
+        "slot_data",
+        "slot_hora",
+        "slot_livre",
+    ]
+)
+
 
 # =========================================================
 # AGENDAMENTO PÚBLICO
@@ -25,21 +66,6 @@ booking_bp = Blueprint(
 @booking_bp.route("/<slug>/agendar", methods=["GET", "POST"])
 def agendar(slug):
 
-    tenant = Tenant.query.filter_by(
-        slug=slug,
-        ativo=True
-    ).first_or_404()
-
-    # =========================
-    # LISTA BARBEIROS
-    # =========================
-    barbers = User.query.filter_by(
-        tenant_id=tenant.id,
-        role="BARBER",
-        ativo=True,
-        excluido=False
-    ).all()
-
     # =========================
     # POST — CONFIRMAR AGENDAMENTO
     # =========================
@@ -47,7 +73,8 @@ def agendar(slug):
 
         barber_id = request.form.get("barber_id", type=int)
         service_id = request.form.get("service_id", type=int)
-        slot_id = request.form.get("slot_id", type=int)
+        slot_id = request.form.get("slot_id")
+        hold_token = request.form.get("hold_token")
         cliente_nome = request.form.get("cliente_nome")
         cliente_whatsapp = request.form.get("cliente_whatsapp")
 
@@ -55,86 +82,132 @@ def agendar(slug):
             flash("Preencha todos os campos.", "danger")
             return redirect(request.url)
 
-        # =========================
-        # VALIDAR BARBEIRO
-        # =========================
-        barber = User.query.filter_by(
-            id=barber_id,
-            tenant_id=tenant.id,
-            role="BARBER",
-            ativo=True,
-            excluido=False
-        ).first()
-
-        if not barber:
-            flash("Barbeiro inválido.", "danger")
+        try:
+            slot_id, inicio = _parse_slot(slot_id)
+        except ValueError:
+            flash("Horário indisponível para este barbeiro.", "danger")
             return redirect(request.url)
 
         # =========================
-        # VALIDAR SERVIÇO DO BARBEIRO
+        # VALIDAR TENANT + BARBEIRO + SERVIÇO + HORÁRIO
         # =========================
-        service = Service.query.filter_by(
-            id=service_id,
-            tenant_id=tenant.id,
-            barber_id=barber_id,
-            ativo=True,
-            excluido=False
-        ).first()
+        validacao = _validar_agendamento(
+            slug, barber_id, service_id, slot_id, inicio
+        )
+
+        if not validacao:
+            abort(404)
+
+        tenant_id = validacao.tenant_id
+        slot_id = validacao.slot_id
+        erros = []
+
+        if not validacao.barber_ok:
+            erros.append("Barbeiro inválido.")
+
+        if not validacao.service_ok:
+            erros.append("Este serviço não pertence ao barbeiro selecionado.")
+
+        if inicio:
+            data, hora = inicio.date(), inicio.time()
+        else:
+            data, hora = validacao.slot_data, validacao.slot_hora
+
+        # Agenda do dia (slots + regras + agendamentos): o
+        # serviço precisa caber inteiro a partir do horário.
+        # Horário que já começou (fuso da barbearia) é
+        # recusado, como nos feeds.
+        agenda = None
+        data_hora = datetime.combine(data, hora) if data else None
+
+        if (not data or (slot_id and not validacao.slot_livre)
+                or data_hora <= agora_local(tenant_id)):
+            erros.append("Horário indisponível para este barbeiro.")
+
+        elif not erros:
+            agenda = agendas(tenant_id, barber_id, data, data).get(data)
+
+            if not agenda or not agenda.livre(data_hora):
+                erros.append("Horário indisponível para este barbeiro.")
+
+            elif not agenda.cabe(data_hora, validacao.duracao_min):
+                erros.append(
+                    f"Este serviço leva {validacao.duracao_min} min e "
+                    "não cabe a partir deste horário. Escolha outro."
+                )
 
-        if not service:
-            flash("Este serviço não pertence ao barbeiro selecionado.", "danger")
+            # Algum horário coberto pelo serviço (não só o
+            # inicial) segurado por outro cliente
+            elif _cruza_retido(
+                agenda.cobertos(data_hora, validacao.duracao_min),
+                lambda h: holds.retido_por_outro(
+                    tenant_id, barber_id, h.date(), h.time(), hold_token
+                )
+            ):
+                erros.append(
+                    "Este horário está reservado por outro cliente. Escolha outro."
+                )
+
+        if erros:
+            for erro in erros:
+                flash(erro, "danger")
             return redirect(request.url)
 
         # =========================
-        # VALIDAR HORÁRIO
+        # RESERVA ATÔMICA DOS SLOTS
         # =========================
-        slot = AvailableSlot.query.filter_by(
-            id=slot_id,
-            tenant_id=tenant.id,
-            barber_id=barber_id,
-            disponivel=True
-        ).first()
-
-        if not slot:
-            flash("Horário indisponível para este barbeiro.", "danger")
+        # Ocupa todos os slots cobertos pela duração do serviço
+        # num único UPDATE condicional; reservas simultâneas
+        # que se cruzam não conseguem todas as linhas
+        if not reservar_servico(
+            tenant_id, barber_id, agenda, data_hora, validacao.duracao_min
+        ):
+            db.session.rollback()
+            flash("Este horário acabou de ser reservado. Escolha outro.", "danger")
             return redirect(request.url)
 
-        data_hora = datetime.combine(slot.data, slot.hora)
-
         appointment = Appointment(
-            tenant_id=tenant.id,
+            tenant_id=tenant_id,
             barber_id=barber_id,
-            service_id=service.id,
+            service_id=service_id,
             cliente_nome=cliente_nome,
             cliente_whatsapp=cliente_whatsapp,
             data_hora=data_hora,
             status="AGENDADO"
         )
 
-        slot.disponivel = False
-
         db.session.add(appointment)
         db.session.commit()
 
+        holds.liberar(hold_token)
+
         flash("Agendamento realizado com sucesso!", "success")
         return redirect(request.url)
 
+    tenant = get_tenant_by_slug(slug) or abort(404)
+
+    # =========================
+    # LISTA BARBEIROS
+    # =========================
+    barbers = User.query.filter_by(
+        tenant_id=tenant.id,
+        role="BARBER",
+        ativo=True,
+        excluido=False
+    ).all()
+
     # =========================================================
     # GET — LISTAR DADOS PARA O FRONT
     # =========================================================
 
-    # Pegamos TODOS porque o filtro agora é no Front
+    # Serviços são poucos: vão no HTML. Os horários são
+    # carregados sob demanda pelo feed /<slug>/slots
     services = Service.query.filter_by(
         tenant_id=tenant.id,
         ativo=True,
         excluido=False
     ).all()
 
-    slots = AvailableSlot.query.filter_by(
-        tenant_id=tenant.id,
-        disponivel=True
-    ).all()
-
     # =========================
     # CONVERTER PARA JSON
     # =========================
@@ -148,20 +221,574 @@ def agendar(slug):
         for s in services
     ]
 
-    slots_json = [
-        {
-            "id": s.id,
-            "barber_id": s.barber_id,
-            "data": s.data.strftime("%Y-%m-%d"),
-            "hora": s.hora.strftime("%H:%M")
-        }
-        for s in slots
-    ]
-
     return render_template(
         "booking.html",
         tenant=tenant,
         barbers=barbers,
-        services=services_json,
-        slots=slots_json
+        services=services_json
+    )
+
+
+# =========================================================
+# FEED DE HORÁRIOS (JSON)
+# =========================================================
+@booking_bp.route("/<slug>/slots", methods=["GET"])
+def slots(slug):
+    """
+    Horários livres de UM barbeiro em uma janela de datas.
+
+    Parâmetros (query string):
+    - barber_id (obrigatório)
+    - inicio / fim: YYYY-MM-DD (padrão: hoje até +6 dias)
+    - cursor: devolvido em "next_cursor" da página anterior
+    - limit: tamanho da página
+    - hold: token de retenção do próprio cliente (opcional)
+    - service_id: só horários em que o serviço cabe inteiro
+      (opcional)
+
+    Nunca devolve horários passados (data e hora no fuso
+    da barbearia). Paginação por keyset
+    em (data, hora, id), sem OFFSET. Horários segurados
+    por outros clientes ficam de fora.
+    """
+
+    tenant = get_tenant_by_slug(slug) or abort(404)
+
+    barber_id = request.args.get("barber_id", type=int)
+
+    if not barber_id:
+        abort(400)
+
+    agora = agora_local(tenant.id)
+    hoje = agora.date()
+
+    try:
+        inicio = _parse_data(request.args.get("inicio")) or hoje
+        fim = (
+            _parse_data(request.args.get("fim"))
+            or inicio + timedelta(days=SLOTS_JANELA_DIAS - 1)
+        )
+        cursor = _parse_cursor(request.args.get("cursor"))
+    except ValueError:
+        abort(400)
+
+    inicio = max(inicio, hoje)
+    fim = min(fim, inicio + timedelta(days=SLOTS_JANELA_MAXIMA_DIAS - 1))
+
+    limite = request.args.get("limit", SLOTS_LIMITE_PADRAO, type=int)
+    limite = max(1, min(limite, SLOTS_LIMITE_MAXIMO))
+
+    query = AvailableSlot.query.filter(
+        AvailableSlot.tenant_id == tenant.id,
+        AvailableSlot.barber_id == barber_id,
+        AvailableSlot.disponivel == True,
+        AvailableSlot.data >= inicio,
+        AvailableSlot.data <= fim,
+        _depois_de(agora)
+    )
+
+    if cursor:
+        query = query.filter(
+            tuple_(
+                AvailableSlot.data,
+                AvailableSlot.hora,
+                AvailableSlot.id
+            ) > tuple_(*cursor)
+        )
+
+    # Busca um a mais para saber se existe próxima página
+    rows = query.order_by(
+        AvailableSlot.data.asc(),
+        AvailableSlot.hora.asc(),
+        AvailableSlot.id.asc()
+    ).limit(limite + 1).all()
+
+    # Horários materializados + virtuais (regras de agenda),
+    # na mesma ordem do keyset. Virtuais usam id 0.
+    itens = [
+        (s.data, s.hora, s.id)
+        for s in rows
+    ]
+
+    # Com serviço, a agenda do período responde "cabe?" e
+    # já traz os horários virtuais
+    service_id = request.args.get("service_id", type=int)
+    periodo = None
+
+    if service_id:
+        duracao = db.session.query(
+            Service.duracao_min
+        ).filter(
+            Service.id == service_id,
+            Service.tenant_id == tenant.id,
+            db.or_(
+                Service.barber_id == barber_id,
+                Service.barber_id.is_(None)
+            )
+        ).scalar()
+
+        if duracao is None:
+            abort(404)
+
+        periodo = agendas(tenant.id, barber_id, inicio, fim)
+        horarios = sorted(
+            (h.date(), h.time())
+            for agenda in periodo.values()
+            for h in agenda.virtuais
+        )
+    else:
+        horarios = horarios_virtuais(tenant.id, barber_id, inicio, fim)
+
+    virtuais = [
+        (data, hora, 0)
+        for data, hora in horarios
+        if (data, hora) > (hoje, agora.time())
+        and (not cursor or (data, hora, 0) > cursor)
+    ]
+
+    itens = sorted(itens + virtuais)
+
+    next_cursor = None
+    if len(itens) > limite:
+        itens = itens[:limite]
+        next_cursor = _format_cursor(*itens[-1])
+
+    # Filtra segurados (e, com serviço, horários em que ele
+    # não cabe) DEPOIS de fechar a página: o cursor continua
+    # apontando para o último item real
+    retidos = holds.horarios_retidos(
+        tenant.id, barber_id, request.args.get("hold")
+    )
+
+    if retidos:
+        itens = [
+            item for item in itens
+            if (item[0], item[1]) not in retidos
+        ]
+
+    if periodo is not None:
+        itens = [
+            (data, hora, slot_id)
+            for data, hora, slot_id in itens
+            if data in periodo
+            and _cabe_livre(
+                periodo[data], datetime.combine(data, hora), duracao, retidos
+            )
+        ]
+
+    return jsonify({
+        "barber_id": barber_id,
+        "inicio": inicio.isoformat(),
+        "fim": fim.isoformat(),
+        "slots": [
+            {
+                "id": slot_id or None,
+                "barber_id": barber_id,
+                "data": data.strftime("%Y-%m-%d"),
+                "hora": hora.strftime("%H:%M")
+            }
+            for data, hora, slot_id in itens
+        ],
+        "next_cursor": next_cursor
+    })
+
+
+# =========================================================
+# PRIMEIRO HORÁRIO DISPONÍVEL (QUALQUER BARBEIRO)
+# =========================================================
+@booking_bp.route("/<slug>/slots/first", methods=["GET"])
+def primeiros_horarios(slug):
+    """
+    Próximos N horários livres para um serviço, entre TODOS
+    os barbeiros que o atendem, em ordem de data/hora.
+
+    Parâmetros (query string):
+    - service_id (obrigatório)
+    - limit: quantidade de horários
+    - hold: token de retenção do próprio cliente (opcional)
+
+    Serviços são por barbeiro (Service.barber_id): em outro
+    barbeiro, o "mesmo" serviço é o cadastrado com o mesmo
+    nome. Serviço sem barbeiro vale para todos os barbeiros.
+    """
+
+    tenant = get_tenant_by_slug(slug) or abort(404)
+
+    service_id = request.args.get("service_id", type=int)
+
+    if not service_id:
+        abort(400)
+
+    limite = request.args.get("limit", PRIMEIROS_LIMITE_PADRAO, type=int)
+    limite = max(1, min(limite, PRIMEIROS_LIMITE_MAXIMO))
+
+    atendem = _barbeiros_do_servico(tenant.id, service_id)
+
+    if not atendem:
+        abort(404)
+
+    agora = agora_local(tenant.id)
+    hoje = agora.date()
+    fim = hoje + timedelta(days=PRIMEIROS_JANELA_DIAS - 1)
+
+    token = request.args.get("hold")
+    retidos = {
+        barber_id: holds.horarios_retidos(tenant.id, barber_id, token)
+        for barber_id in atendem
+    }
+
+    # Materializados: a consulta percorre o índice
+    # (tenant_id, disponivel, data, hora) e para no LIMIT.
+    # Busca a mais para descontar segurados e horários em
+    # que o serviço não cabe.
+    rows = db.session.query(
+        AvailableSlot.data,
+        AvailableSlot.hora,
+        AvailableSlot.barber_id,
+        AvailableSlot.id
+    ).filter(
+        AvailableSlot.tenant_id == tenant.id,
+        AvailableSlot.disponivel == True,
+        AvailableSlot.data >= hoje,
+        AvailableSlot.data <= fim,
+        _depois_de(agora),
+        AvailableSlot.barber_id.in_(list(atendem))
+    ).order_by(
+        AvailableSlot.data.asc(),
+        AvailableSlot.hora.asc(),
+        AvailableSlot.barber_id.asc()
+    ).limit(
+        limite * 2 + sum(len(r) for r in retidos.values())
+    ).all()
+
+    itens = [tuple(row) for row in rows]
+
+    # Agendas por barbeiro: montadas já para quem tem regra
+    # (trazem os horários virtuais) e, para os demais, só
+    # quando algum horário deles aparece na lista
+    periodos = {}
+
+    def periodo(barber_id):
+        if barber_id not in periodos:
+            periodos[barber_id] = agendas(tenant.id, barber_id, hoje, fim)
+        return periodos[barber_id]
+
+    for barber_id in barbeiros_com_regra(tenant.id, list(atendem)):
+        itens += [
+            (h.date(), h.time(), barber_id, 0)
+            for agenda in periodo(barber_id).values()
+            for h in agenda.virtuais
+            if h > agora
+        ]
+
+    livres = []
+
+    for data, hora, barber_id, slot_id in sorted(itens):
+        if len(livres) == limite:
+            break
+
+        if (data, hora) in retidos[barber_id]:
+            continue
+
+        agenda = periodo(barber_id).get(data)
+        duracao = atendem[barber_id][2]
+
+        if agenda and _cabe_livre(
+            agenda, datetime.combine(data, hora), duracao, retidos[barber_id]
+        ):
+            livres.append((data, hora, barber_id, slot_id))
+
+    itens = livres
+
+    return jsonify({
+        "service_id": service_id,
+        "slots": [
+            {
+                "id": slot_id or None,
+                "barber_id": barber_id,
+                "barber_nome": atendem[barber_id][0],
+                "service_id": atendem[barber_id][1],
+                "data": data.strftime("%Y-%m-%d"),
+                "hora": hora.strftime("%H:%M")
+            }
+            for data, hora, barber_id, slot_id in itens
+        ]
+    })
+
+
+# =========================================================
+# RETENÇÃO DE HORÁRIO (HOLD)
+# =========================================================
+@booking_bp.route("/<slug>/slots/hold", methods=["POST"])
+def segurar_horario(slug):
+    """
+    Segura o horário escolhido por SLOT_HOLD_MINUTES minutos.
+
+    Form:
+    - barber_id, slot_id (id ou "YYYY-MM-DDTHH:MM")
+    - hold_token: token anterior do cliente (opcional);
+      trocar de horário libera o anterior
+
+    409 se outro cliente já segura o horário.
+    """
+
+    tenant = get_tenant_by_slug(slug) or abort(404)
+
+    barber_id = request.form.get("barber_id", type=int)
+    token = request.form.get("hold_token") or None
+
+    try:
+        slot_id, inicio = _parse_slot(request.form.get("slot_id") or "")
+    except ValueError:
+        abort(400)
+
+    if not barber_id:
+        abort(400)
+
+    if slot_id:
+        slot = db.session.query(
+            AvailableSlot.data,
+            AvailableSlot.hora
+        ).filter_by(
+            id=slot_id,
+            tenant_id=tenant.id,
+            barber_id=barber_id,
+            disponivel=True
+        ).first()
+
+        if not slot:
+            return jsonify({"erro": "Horário indisponível."}), 409
+
+        data, hora = slot
+    else:
+        data, hora = inicio.date(), inicio.time()
+
+    minutos = current_app.config.get("SLOT_HOLD_MINUTES", 5)
+
+    resultado = holds.segurar(
+        tenant.id, barber_id, data, hora, minutos, token
+    )
+
+    if not resultado:
+        return jsonify({
+            "erro": "Este horário está reservado por outro cliente."
+        }), 409
+
+    token, expira_em = resultado
+
+    return jsonify({
+        "hold_token": token,
+        "expira_em": expira_em.isoformat() + "Z",
+        "minutos": minutos
+    })
+
+
+# =========================================================
+# HELPERS
+# =========================================================
+def _parse_slot(valor):
+    """
+    Slot materializado chega como id; horário virtual
+    (regra de agenda) chega como "YYYY-MM-DDTHH:MM".
+
+    Retorna (slot_id, None) ou (None, datetime).
+    """
+    if valor.isdigit():
+        return int(valor), None
+
+    return None, datetime.strptime(valor, "%Y-%m-%dT%H:%M")
+
+
+def _barbeiros_do_servico(tenant_id, service_id):
+    """
+    Barbeiros ativos que atendem o serviço:
+    {barber_id: (nome do barbeiro, service_id, duracao_min)}
+    """
+    servico = db.session.query(
+        Service.nome,
+        Service.barber_id,
+        Service.duracao_min
+    ).filter_by(
+        id=service_id,
+        tenant_id=tenant_id,
+        ativo=True,
+        excluido=False
+    ).first()
+
+    if not servico:
+        return {}
+
+    nome, barber_id, duracao_min = servico
+
+    barbeiros = db.session.query(
+        User.id,
+        User.nome
+    ).filter(
+        User.tenant_id == tenant_id,
+        User.role == "BARBER",
+        User.ativo == True,
+        User.excluido == False
+    )
+
+    # Serviço sem barbeiro: qualquer barbeiro do tenant
+    if barber_id is None:
+        return {
+            b_id: (b_nome, service_id, duracao_min)
+            for b_id, b_nome in barbeiros.all()
+        }
+
+    rows = barbeiros.add_columns(
+        Service.id,
+        Service.duracao_min
+    ).join(
+        Service, Service.barber_id == User.id
+    ).filter(
+        Service.tenant_id == tenant_id,
+        func.lower(Service.nome) == nome.lower(),
+        Service.ativo == True,
+        Service.excluido == False
+    ).order_by(
+        Service.id.asc()
+    ).all()
+
+    atendem = {}
+    for b_id, b_nome, s_id, s_duracao in rows:
+        atendem.setdefault(b_id, (b_nome, s_id, s_duracao))
+
+    return atendem
+
+
+def _validar_agendamento(slug, barber_id, service_id, slot_id, inicio):
+    """
+    Valida tenant, barbeiro, serviço e horário em UMA consulta.
+
+    Parte do tenant (pelo slug) e faz LEFT JOIN de cada
+    entidade com suas regras de validade; uma coluna NULL
+    indica o motivo da falha. Retorna None se o tenant não
+    existe ou está inativo.
+    """
+    if slot_id:
+        condicao_slot = AvailableSlot.id == slot_id
+    else:
+        condicao_slot = db.and_(
+            AvailableSlot.data == inicio.date(),
+            AvailableSlot.hora == inicio.time()
+        )
+
+    row = db.session.query(
+        Tenant.id,
+        User.id,
+        Service.id,
+        Service.duracao_min,
+        AvailableSlot.id,
+        AvailableSlot.data,
+        AvailableSlot.hora,
+        AvailableSlot.disponivel
+    ).select_from(
+        Tenant
+    ).outerjoin(
+        User,
+        db.and_(
+            User.id == barber_id,
+            User.tenant_id == Tenant.id,
+            User.role == "BARBER",
+            User.ativo == True,
+            User.excluido == False
+        )
+    ).outerjoin(
+        Service,
+        db.and_(
+            Service.id == service_id,
+            Service.tenant_id == Tenant.id,
+            Service.barber_id == barber_id,
+            Service.ativo == True,
+            Service.excluido == False
+        )
+    ).outerjoin(
+        AvailableSlot,
+        db.and_(
+            condicao_slot,
+            AvailableSlot.tenant_id == Tenant.id,
+            AvailableSlot.barber_id == barber_id
+        )
+    ).filter(
+        Tenant.slug == slug,
+        Tenant.ativo == True
+    ).first()
+
+    if not row:
+        return None
+
+    (tenant_id, barber_ok, service_ok, duracao_min,
+     slot_id, data, hora, disponivel) = row
+
+    return ValidacaoAgendamento(
+        tenant_id=tenant_id,
+        barber_ok=barber_ok is not None,
+        service_ok=service_ok is not None,
+        duracao_min=duracao_min,
+        slot_id=slot_id,
+        slot_data=data,
+        slot_hora=hora,
+        slot_livre=bool(disponivel)
+    )
+
+
+def _cruza_retido(cobertos, retido):
+    """
+    Algum dos horários cobertos pelo serviço está segurado
+    por outro cliente?
+    """
+    return any(retido(h) for h in cobertos)
+
+
+def _cabe_livre(agenda, inicio, duracao, retidos):
+    """
+    O serviço cabe a partir de `inicio` sem passar por
+    horário segurado por outro cliente (`retidos`:
+    conjunto de (data, hora))
+    """
+    return agenda.cabe(inicio, duracao) and not _cruza_retido(
+        agenda.cobertos(inicio, duracao),
+        lambda h: (h.date(), h.time()) in retidos
+    )
+
+
+def _depois_de(agora):
+    """
+    Slot materializado ainda não começou: dias seguintes,
+    ou hoje com hora posterior a agora (horário local)
+    """
+    return db.or_(
+        AvailableSlot.data > agora.date(),
+        db.and_(
+            AvailableSlot.data == agora.date(),
+            AvailableSlot.hora > agora.time()
+        )
+    )
+
+
+def _parse_data(valor):
+    if not valor:
+        return None
+    return datetime.strptime(valor, "%Y-%m-%d").date()
+
+
+def _format_cursor(data, hora, slot_id):
+    return f"{data.isoformat()}|{hora.strftime('%H:%M:%S')}|{slot_id}"
+
+
+def _parse_cursor(valor):
+    """
+    Cursor no formato "YYYY-MM-DD|HH:MM:SS|id"
+    """
+    if not valor:
+        return None
+
+    data, hora, slot_id = valor.split("|")
+
+    return (
+        datetime.strptime(data, "%Y-%m-%d").date(),
+        datetime.strptime(hora, "%H:%M:%S").time(),
+        int(slot_id)
     )
@@ -0,0 +1,72 @@
+import click
+
+from app.extensions import db
+
+# =========================================================
+# COMANDOS CLI (flask <comando>)
+# =========================================================
+
+
+def register_commands(app):
+
+    @app.cli.command("rebuild-daily-financials")
+    @click.option(
+        "--tenant-id", type=int, default=None,
+        help="Reconstrói só este tenant (padrão: todos)"
+    )
+    def rebuild_daily_financials(tenant_id):
+        """
+        Recalcula daily_financials (e platform_daily_metrics)
+        a partir de cash_movements e expenses. Um commit por
+        tenant.
+        """
+        from app.models.tenant import Tenant
+        from app.models.daily_financial import DailyFinancial
+
+        if tenant_id:
+            tenant_ids = [tenant_id]
+        else:
+            tenant_ids = [
+                t_id for t_id, in
+                db.session.query(Tenant.id).order_by(Tenant.id)
+            ]
+
+        for t_id in tenant_ids:
+            try:
+                linhas = DailyFinancial.reconstruir(t_id)
+                db.session.commit()
+            except Exception:
+                db.session.rollback()
+                raise
+
+            click.echo(f"✔ Tenant {t_id}: {linhas} linhas")
+
+    @app.cli.command("report-worker")
+    @click.option(
+        "--interval", type=float, default=2.0,
+        help="Segundos de espera quando a fila está vazia"
+    )
+    @click.option(
+        "--once", is_flag=True,
+        help="Processa o que houver na fila e sai"
+    )
+    def report_worker(interval, once):
+        """
+        Consome a fila de jobs de relatório (report_jobs).
+        Pode rodar em vários processos: a reserva usa
+        SKIP LOCKED.
+        """
+        from app.utils.report_jobs import executar_fila, processar
+
+        if once:
+            total = 0
+            while processar() is not None:
+                total += 1
+            click.echo(f"✔ {total} jobs processados")
+            return
+
+        click.echo("Aguardando jobs de relatório (Ctrl+C para sair)")
+        try:
+            executar_fila(intervalo=interval)
+        except KeyboardInterrupt:
+            pass
@@ -23,6 +23,8 @@ from .user import User
 from .service import Service
 from .appointment import Appointment
 from .available_slot import AvailableSlot
+from .barber_schedule import BarberSchedule
+from .schedule_exception import ScheduleException
 
 # ==============================
 # FINANCEIRO
@@ -31,6 +33,13 @@ from .payment import Payment
 from .expense import Expense
 from .cash_session import CashSession
 from .cash_movement import CashMovement
+from .daily_financial import DailyFinancial
+from .platform_daily_metric import PlatformDailyMetric
+
+# ==============================
+# RELATÓRIOS
+# ==============================
+from .report_job import ReportJob
 
 # ==============================
 # EXPORTS
@@ -44,10 +53,17 @@ __all__ = [
     "Service",
     "Appointment",
     "AvailableSlot",
+    "BarberSchedule",
+    "ScheduleException",
 
     # Financeiro
     "Payment",
     "Expense",
     "CashSession",
     "CashMovement",
+    "DailyFinancial",
+    "PlatformDailyMetric",
+
+    # Relatórios
+    "ReportJob",
 ]
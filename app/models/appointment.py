@@ -12,6 +12,28 @@ class Appointment(db.Model):
 
     __tablename__ = "appointments"
 
+    # Índices compostos para agenda e relatórios
+    # (filtros sempre por tenant + intervalo de data_hora)
+    __table_args__ = (
+        db.Index(
+            "ix_appointments_tenant_data_hora",
+            "tenant_id", "data_hora"
+        ),
+        db.Index(
+            "ix_appointments_tenant_barber_data_hora",
+            "tenant_id", "barber_id", "data_hora"
+        ),
+        db.Index(
+            "ix_appointments_tenant_status_data_hora",
+            "tenant_id", "status", "data_hora"
+        ),
+        # Relatórios diários pelo dia local
+        db.Index(
+            "ix_appointments_tenant_data_local",
+            "tenant_id", "data_local"
+        ),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
 
     # Relacionamento com tenant (barbearia)
@@ -42,6 +64,11 @@ class Appointment(db.Model):
     # Data e hora do agendamento
     data_hora = db.Column(db.DateTime, nullable=False)
 
+    # Dia do agendamento. data_hora já é o horário local da
+    # barbearia (o cliente escolhe o slot na agenda), então é
+    # só a data dela; mantido em sync no insert/update.
+    data_local = db.Column(db.Date, nullable=False)
+
     # Status do agendamento
     status = db.Column(
         db.String(20),
@@ -72,6 +99,23 @@ class Appointment(db.Model):
         nullable=False
     )
 
+    # =====================================================
+    # RELACIONAMENTOS
+    # =====================================================
+    # lazy="select": listas devem pedir joinedload/selectinload
+    # explicitamente (ver pagina_agendamentos)
+    barber = db.relationship(
+        "User",
+        foreign_keys=[barber_id],
+        lazy="select"
+    )
+
+    service = db.relationship(
+        "Service",
+        foreign_keys=[service_id],
+        lazy="select"
+    )
+
     # =====================================================
     # MÉTODOS DE DOMÍNIO
     # =====================================================
@@ -107,3 +151,13 @@ class Appointment(db.Model):
             f"{self.data_hora.strftime('%d/%m/%Y %H:%M')} | "
             f"Status: {self.status}>"
         )
+
+
+# =========================================================
+# DIA LOCAL (INSERT / REAGENDAMENTO)
+# =========================================================
+@db.event.listens_for(Appointment, "before_insert")
+@db.event.listens_for(Appointment, "before_update")
+def _preencher_data_local(mapper, connection, agendamento):
+    if agendamento.data_hora is not None:
+        agendamento.data_local = agendamento.data_hora.date()
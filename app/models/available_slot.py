@@ -1,4 +1,4 @@
-from datetime import datetime
+from datetime import datetime, timedelta
 from app.extensions import db
 
 # =========================================================
@@ -14,6 +14,24 @@ from app.extensions import db
 class AvailableSlot(db.Model):
     __tablename__ = "available_slots"
 
+    # Um barbeiro não pode ter dois slots no mesmo horário
+    __table_args__ = (
+        db.UniqueConstraint(
+            "tenant_id", "barber_id", "data", "hora",
+            name="uq_available_slots_barber_data_hora"
+        ),
+        # "Primeiro horário disponível" entre todos os barbeiros:
+        # varre só os livres do tenant, já na ordem (data, hora)
+        db.Index(
+            "ix_available_slots_tenant_disponivel_data_hora",
+            "tenant_id", "disponivel", "data", "hora"
+        ),
+    )
+
+    # Linhas por INSERT na geração em lote
+    # (8 colunas × 100 = 800 parâmetros, abaixo do limite do SQLite)
+    LOTE_INSERCAO = 100
+
     id = db.Column(db.Integer, primary_key=True)
 
     # =====================================================
@@ -99,6 +117,48 @@ class AvailableSlot(db.Model):
 
         return not bool(existe)
 
+    @staticmethod
+    def reservar_periodo(tenant_id, barber_id, data,
+                         hora_inicio, hora_fim, esperados) -> bool:
+        """
+        Ocupa, de forma atômica, todos os slots do barbeiro
+        em [hora_inicio, hora_fim) na data (hora_fim None =
+        até o fim do dia):
+
+            UPDATE available_slots SET disponivel = false
+            WHERE data = :data AND hora >= :ini AND hora < :fim
+              AND disponivel = true
+
+        Reservas concorrentes disputam as mesmas linhas; se
+        alguma já tinha sido ocupada o rowcount não bate com
+        `esperados` e o chamador deve fazer rollback.
+        Não faz commit.
+        """
+        from sqlalchemy import update
+
+        condicoes = [
+            AvailableSlot.tenant_id == tenant_id,
+            AvailableSlot.barber_id == barber_id,
+            AvailableSlot.data == data,
+            AvailableSlot.hora >= hora_inicio,
+            AvailableSlot.disponivel == True
+        ]
+
+        if hora_fim is not None:
+            condicoes.append(AvailableSlot.hora < hora_fim)
+
+        result = db.session.execute(
+            update(AvailableSlot)
+            .where(*condicoes)
+            .values(
+                disponivel=False,
+                atualizado_em=datetime.utcnow()
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+        return esperados > 0 and result.rowcount == esperados
+
     def bloquear(self):
         self.disponivel = False
         self.bloqueado_manual = True
@@ -107,6 +167,62 @@ class AvailableSlot(db.Model):
         self.disponivel = True
         self.bloqueado_manual = False
 
+    # =====================================================
+    # GERAÇÃO EM LOTE
+    # =====================================================
+    @staticmethod
+    def candidatos(data_inicio, data_fim, weekdays,
+                   hora_inicio, hora_fim, intervalo):
+        """
+        Gera os pares (data, hora) da grade pedida,
+        sem consultar o banco.
+        """
+        passo = timedelta(minutes=intervalo)
+        dia = data_inicio
+
+        while dia <= data_fim:
+            if dia.weekday() in weekdays:
+                atual = datetime.combine(dia, hora_inicio)
+                fim = datetime.combine(dia, hora_fim)
+
+                while atual < fim:
+                    yield dia, atual.time()
+                    atual += passo
+
+            dia += timedelta(days=1)
+
+    @staticmethod
+    def inserir_em_lote(tenant_id, barber_id, horarios):
+        """
+        Insere os horários com um INSERT multi-linha por lote,
+        ignorando os que já existem (constraint única).
+
+        Não faz commit.
+        Retorna (criados, ignorados).
+        """
+        from app.utils.db import insert_ignore, em_lotes
+
+        criados = 0
+        total = 0
+
+        for lote in em_lotes(horarios, AvailableSlot.LOTE_INSERCAO):
+            total += len(lote)
+
+            result = db.session.execute(
+                insert_ignore(AvailableSlot.__table__).values([
+                    {
+                        "tenant_id": tenant_id,
+                        "barber_id": barber_id,
+                        "data": data,
+                        "hora": hora
+                    }
+                    for data, hora in lote
+                ])
+            )
+            criados += max(result.rowcount, 0)
+
+        return criados, total - criados
+
     # =====================================================
     # HELPERS
     # =====================================================
@@ -0,0 +1,130 @@
+from datetime import datetime, date
+from app.extensions import db
+
+# =========================================================
+# MODEL: REGRA DE AGENDA DO BARBEIRO
+# =========================================================
+# Em vez de materializar um AvailableSlot por horário,
+# a barbearia cadastra regras semanais:
+#   "segunda, 09:00–18:00, a cada 30 min, a partir de X"
+#
+# A disponibilidade é calculada sob demanda expandindo
+# as regras (ver app/booking/availability.py).
+# =========================================================
+
+class BarberSchedule(db.Model):
+    __tablename__ = "barber_schedules"
+
+    __table_args__ = (
+        db.Index(
+            "ix_barber_schedules_tenant_barber",
+            "tenant_id", "barber_id"
+        ),
+        db.CheckConstraint(
+            "intervalo_min > 0",
+            name="ck_barber_schedules_intervalo_positivo"
+        ),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+
+    # =====================================================
+    # MULTI-TENANT
+    # =====================================================
+    tenant_id = db.Column(
+        db.Integer,
+        db.ForeignKey("tenants.id"),
+        nullable=False
+    )
+
+    barber_id = db.Column(
+        db.Integer,
+        db.ForeignKey("users.id"),
+        nullable=False
+    )
+
+    # =====================================================
+    # REGRA
+    # =====================================================
+    # 0 = segunda ... 6 = domingo (date.weekday())
+    dia_semana = db.Column(
+        db.Integer,
+        nullable=False
+    )
+
+    hora_inicio = db.Column(
+        db.Time,
+        nullable=False
+    )
+
+    hora_fim = db.Column(
+        db.Time,
+        nullable=False
+    )
+
+    intervalo_min = db.Column(
+        db.Integer,
+        nullable=False,
+        default=30
+    )
+
+    # =====================================================
+    # VIGÊNCIA
+    # =====================================================
+    valido_de = db.Column(
+        db.Date,
+        nullable=False,
+        default=date.today
+    )
+
+    valido_ate = db.Column(
+        db.Date,
+        nullable=True
+    )  # None = sem data de término
+
+    ativo = db.Column(
+        db.Boolean,
+        default=True,
+        nullable=False
+    )
+
+    # =====================================================
+    # AUDITORIA
+    # =====================================================
+    criado_em = db.Column(
+        db.DateTime,
+        default=datetime.utcnow,
+        nullable=False
+    )
+
+    atualizado_em = db.Column(
+        db.DateTime,
+        default=datetime.utcnow,
+        onupdate=datetime.utcnow,
+        nullable=False
+    )
+
+    # =====================================================
+    # HELPERS
+    # =====================================================
+    def vale_em(self, dia: date) -> bool:
+        """
+        A regra se aplica a este dia?
+        """
+        if not self.ativo or dia.weekday() != self.dia_semana:
+            return False
+        if dia < self.valido_de:
+            return False
+        if self.valido_ate and dia > self.valido_ate:
+            return False
+        return True
+
+    # =====================================================
+    # REPRESENTAÇÃO
+    # =====================================================
+    def __repr__(self):
+        return (
+            f"<BarberSchedule barber_id={self.barber_id} "
+            f"dia={self.dia_semana} "
+            f"{self.hora_inicio}-{self.hora_fim}/{self.intervalo_min}min>"
+        )
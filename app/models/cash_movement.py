@@ -20,6 +20,34 @@ class CashMovement(db.Model):
 
     __tablename__ = "cash_movements"
 
+    # Relatórios filtram por tenant + intervalo de criado_em
+    __table_args__ = (
+        db.Index(
+            "ix_cash_movements_tenant_criado_em",
+            "tenant_id", "criado_em"
+        ),
+        # Relatórios diários pelo dia local
+        db.Index(
+            "ix_cash_movements_tenant_data_local",
+            "tenant_id", "data_local"
+        ),
+        # Movimentos de uma sessão paginados por (criado_em, id)
+        db.Index(
+            "ix_cash_movements_session_criado_em_id",
+            "cash_session_id", "criado_em", "id"
+        ),
+        # Um pagamento entra no caixa uma única vez
+        # (NULLs não conflitam entre si)
+        db.UniqueConstraint(
+            "payment_id",
+            name="uq_cash_movements_payment_id"
+        ),
+    )
+
+    # Linhas por INSERT na sincronização em lote
+    # (11 colunas × 80 = 880 parâmetros, abaixo do limite do SQLite)
+    LOTE_INSERCAO = 80
+
     id = db.Column(db.Integer, primary_key=True)
 
     # ==============================
@@ -52,7 +80,8 @@ class CashMovement(db.Model):
         db.String(20),
         nullable=False
     )
-    # ENTRADA | SAIDA | AJUSTE | SANGRIA | REFORCO
+    # ENTRADA | SAIDA | SANGRIA | REFORCO
+    # (ajustes manuais: ENTRADA / SAIDA com categoria AJUSTE)
 
     categoria = db.Column(
         db.String(50),
@@ -110,6 +139,12 @@ class CashMovement(db.Model):
         index=True
     )
 
+    # Dia de criado_em no fuso do tenant (gravado no insert)
+    data_local = db.Column(
+        db.Date,
+        nullable=False
+    )
+
     # ==============================
     # HELPERS
     # ==============================
@@ -129,9 +164,73 @@ class CashMovement(db.Model):
     def eh_saida(self):
         return self.tipo == "SAIDA"
 
+    # ==============================
+    # CONSULTAS
+    # ==============================
+
+    # Linhas buscadas por ida ao banco na exportação
+    LOTE_EXPORTACAO = 500
+
+    @staticmethod
+    def pagina_da_sessao(cash_session_id, cursor=None, limite=None,
+                         decrescente=False):
+        """
+        Uma página dos movimentos da sessão, por keyset em
+        (criado_em, id). Retorna (movimentos, next_cursor).
+        Levanta ValueError se o cursor for inválido.
+        """
+        from app.utils.pagination import paginar, limite_pagina
+
+        return paginar(
+            CashMovement.query.filter(
+                CashMovement.cash_session_id == cash_session_id
+            ),
+            [CashMovement.criado_em, CashMovement.id],
+            lambda m: (m.criado_em, m.id),
+            cursor=cursor,
+            limite=limite or limite_pagina(None),
+            decrescente=decrescente
+        )
+
+    @staticmethod
+    def exportar(tenant_id, data_inicio, data_fim):
+        """
+        Itera os movimentos do tenant no período (dias locais
+        inclusivos), em ordem de (criado_em, id), sem carregar
+        tudo na memória: yield_per busca LOTE_EXPORTACAO linhas
+        por vez (cursor do lado do servidor no Postgres).
+
+        Gera tuplas leves (colunas), não objetos do ORM.
+        """
+        query = db.session.query(
+            CashMovement.id,
+            CashMovement.criado_em,
+            CashMovement.cash_session_id,
+            CashMovement.tipo,
+            CashMovement.categoria,
+            CashMovement.descricao,
+            CashMovement.valor,
+            CashMovement.metodo_pagamento,
+            CashMovement.appointment_id,
+            CashMovement.payment_id,
+            CashMovement.expense_id
+        ).filter(
+            CashMovement.tenant_id == tenant_id,
+            CashMovement.data_local.between(data_inicio, data_fim)
+        ).order_by(
+            CashMovement.criado_em.asc(),
+            CashMovement.id.asc()
+        ).execution_options(
+            yield_per=CashMovement.LOTE_EXPORTACAO
+        )
+
+        yield from query
+
     # ==============================
     # MÉTODOS DE NEGÓCIO
     # ==============================
+    # Não fazem commit: o movimento, o total da sessão e o
+    # consolidado diário entram na transação de quem chama.
 
     @staticmethod
     def registrar_entrada(
@@ -149,6 +248,7 @@ class CashMovement(db.Model):
         Registra entrada no caixa
         """
         valor = Decimal(valor)
+        agora, dia = CashMovement._agora(tenant_id)
 
         movimento = CashMovement(
             tenant_id=tenant_id,
@@ -160,12 +260,14 @@ class CashMovement(db.Model):
             descricao=descricao,
             metodo_pagamento=metodo_pagamento,
             appointment_id=appointment_id,
-            payment_id=payment_id
+            payment_id=payment_id,
+            criado_em=agora,
+            data_local=dia
         )
 
         db.session.add(movimento)
+        CashMovement._consolidar(movimento)
         cash_session.registrar_entrada(valor)
-        db.session.commit()
 
         return movimento
 
@@ -183,6 +285,7 @@ class CashMovement(db.Model):
         Registra saída no caixa
         """
         valor = Decimal(valor)
+        agora, dia = CashMovement._agora(tenant_id)
 
         movimento = CashMovement(
             tenant_id=tenant_id,
@@ -192,12 +295,14 @@ class CashMovement(db.Model):
             valor=valor,
             categoria=categoria,
             descricao=descricao,
-            expense_id=expense_id
+            expense_id=expense_id,
+            criado_em=agora,
+            data_local=dia
         )
 
         db.session.add(movimento)
+        CashMovement._consolidar(movimento)
         cash_session.registrar_saida(valor)
-        db.session.commit()
 
         return movimento
 
@@ -210,28 +315,194 @@ class CashMovement(db.Model):
         descricao=None
     ):
         """
-        Ajuste manual de caixa (positivo ou negativo)
+        Ajuste manual de caixa (positivo ou negativo).
+
+        Vira ENTRADA (positivo) ou SAIDA (negativo) com
+        categoria AJUSTE: o sinal fica no tipo, e movimento,
+        total da sessão e consolidado diário somam do mesmo
+        jeito que os demais lançamentos.
         """
         valor = Decimal(valor)
         tipo_movimento = "ENTRADA" if valor >= 0 else "SAIDA"
         valor_abs = abs(valor)
+        agora, dia = CashMovement._agora(tenant_id)
 
         movimento = CashMovement(
             tenant_id=tenant_id,
             cash_session_id=cash_session.id,
             usuario_id=usuario_id,
-            tipo="AJUSTE",
+            tipo=tipo_movimento,
+            categoria="AJUSTE",
             valor=valor_abs,
-            descricao=descricao
+            descricao=descricao,
+            criado_em=agora,
+            data_local=dia
         )
 
         db.session.add(movimento)
+        CashMovement._consolidar(movimento)
 
         if tipo_movimento == "ENTRADA":
             cash_session.registrar_entrada(valor_abs)
         else:
             cash_session.registrar_saida(valor_abs)
 
-        db.session.commit()
-
         return movimento
+
+    @staticmethod
+    def registrar_pagamentos(tenant_id, cash_session, usuario_id, pagamentos):
+        """
+        Lança vários pagamentos como entradas no caixa, em lote:
+
+        - INSERT multi-linha dos movimentos (ignora pagamentos
+          que já têm movimento: constraint única em payment_id)
+        - um UPDATE somando o total inserido na sessão
+        - um UPDATE ... WHERE id IN marcando os pagamentos
+
+        Rodar de novo com os mesmos pagamentos não duplica nada.
+        Não faz commit.
+        Retorna (inseridos, total_inserido).
+        """
+        from app.models.payment import Payment
+        from app.models.daily_financial import DailyFinancial
+        from app.utils.db import insert_ignore, em_lotes
+        from app.utils.report_cache import marcar_alteracao
+
+        agora, dia = CashMovement._agora(tenant_id)
+        inseridos = 0
+        total = Decimal("0.00")
+        por_metodo = {}
+        ids = []
+
+        for lote in em_lotes(pagamentos, CashMovement.LOTE_INSERCAO):
+            ids.extend(p.id for p in lote)
+
+            linhas = CashMovement._inserir_pagamentos(
+                insert_ignore(CashMovement.__table__).values([
+                    {
+                        "tenant_id": tenant_id,
+                        "cash_session_id": cash_session.id,
+                        "usuario_id": usuario_id,
+                        "tipo": "ENTRADA",
+                        "categoria": "PAGAMENTO",
+                        "descricao": f"Pagamento #{p.id}",
+                        "valor": Decimal(p.valor),
+                        "metodo_pagamento": p.metodo_pagamento,
+                        "payment_id": p.id,
+                        "criado_em": agora,
+                        "data_local": dia
+                    }
+                    for p in lote
+                ]),
+                cash_session.id,
+                [p.id for p in lote],
+                agora
+            )
+
+            for valor, metodo in linhas:
+                soma, quantidade = por_metodo.get(metodo, (Decimal("0.00"), 0))
+                por_metodo[metodo] = (soma + Decimal(valor), quantidade + 1)
+
+                inseridos += 1
+                total += Decimal(valor)
+
+        if inseridos:
+            cash_session.registrar_entrada(total)
+
+            # INSERT em lote não passa pelo flush do ORM
+            marcar_alteracao(db.session, tenant_id)
+
+        # Consolidado diário: um upsert por método de pagamento
+        for metodo, (soma, quantidade) in por_metodo.items():
+            DailyFinancial.registrar(
+                tenant_id=tenant_id,
+                dia=dia,
+                tipo="ENTRADA",
+                valor=soma,
+                categoria="PAGAMENTO",
+                metodo_pagamento=metodo,
+                quantidade=quantidade
+            )
+
+        if ids:
+            db.session.execute(
+                db.update(Payment).where(
+                    Payment.tenant_id == tenant_id,
+                    Payment.id.in_(ids)
+                ).values(
+                    sincronizado_caixa=True
+                ).execution_options(
+                    synchronize_session=False
+                )
+            )
+
+        return inseridos, total
+
+    @staticmethod
+    def _inserir_pagamentos(stmt, cash_session_id, payment_ids, agora):
+        """
+        Executa o INSERT e devolve (valor, metodo_pagamento)
+        de cada linha realmente inserida
+        """
+        colunas = [CashMovement.valor, CashMovement.metodo_pagamento]
+
+        if db.session.get_bind().dialect.insert_returning:
+            return db.session.execute(stmt.returning(*colunas)).all()
+
+        # Sem RETURNING: relê o que este INSERT gravou
+        db.session.execute(stmt)
+        return db.session.execute(
+            db.select(*colunas).where(
+                CashMovement.cash_session_id == cash_session_id,
+                CashMovement.payment_id.in_(payment_ids),
+                CashMovement.criado_em == agora
+            )
+        ).all()
+
+    @staticmethod
+    def _consolidar(movimento):
+        """
+        Soma o movimento no consolidado diário (daily_financials)
+        """
+        from app.models.daily_financial import DailyFinancial
+
+        DailyFinancial.registrar(
+            tenant_id=movimento.tenant_id,
+            dia=movimento.data_local,
+            tipo=movimento.tipo,
+            valor=movimento.valor,
+            categoria=movimento.categoria,
+            metodo_pagamento=movimento.metodo_pagamento
+        )
+
+    @staticmethod
+    def _agora(tenant_id):
+        """
+        (instante UTC, dia local no fuso do tenant)
+        """
+        from app.utils.dates import data_local
+        from app.utils.tenant_cache import fuso_do_tenant
+
+        agora = datetime.utcnow()
+        return agora, data_local(agora, fuso_do_tenant(tenant_id))
+
+
+# =========================================================
+# DIA LOCAL NO INSERT
+# =========================================================
+# Movimentos criados fora dos registrar_* (ORM) também
+# recebem data_local. INSERTs em lote (Core) passam o valor.
+# =========================================================
+@db.event.listens_for(CashMovement, "before_insert")
+def _preencher_data_local(mapper, connection, movimento):
+    from app.utils.dates import data_local
+    from app.utils.tenant_cache import fuso_do_tenant
+
+    if movimento.criado_em is None:
+        movimento.criado_em = datetime.utcnow()
+
+    if movimento.data_local is None:
+        movimento.data_local = data_local(
+            movimento.criado_em,
+            fuso_do_tenant(movimento.tenant_id, connection)
+        )
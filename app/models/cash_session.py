@@ -1,7 +1,36 @@
 from datetime import datetime
 from decimal import Decimal
 
+from flask import current_app
+
 from app.extensions import db
+from app.utils.cache import LRUCache
+
+# =========================================================
+# CACHE DO CAIXA ABERTO (TENANT → ID DA SESSÃO)
+# =========================================================
+# caixa_aberto roda em toda ação de caixa e em toda
+# conclusão de agendamento. Guardamos só o id: a linha é
+# lida pela PK (ou vem do identity map) e conferida, então
+# um id defasado (outro worker fechou o caixa) só custa
+# uma consulta a mais, nunca um caixa errado.
+#
+# abrir_caixa / fechar_caixa invalidam a entrada do tenant.
+# =========================================================
+
+_cache = None
+
+
+def _get_cache():
+    global _cache
+
+    if _cache is None:
+        _cache = LRUCache(
+            maxsize=current_app.config.get("CASH_SESSION_CACHE_SIZE", 1024),
+            ttl=current_app.config.get("CASH_SESSION_CACHE_TTL", 300)
+        )
+
+    return _cache
 
 
 class CashSession(db.Model):
@@ -17,6 +46,18 @@ class CashSession(db.Model):
 
     __tablename__ = "cash_sessions"
 
+    # No máximo UM caixa aberto por tenant. O índice parcial
+    # também atende a busca do caixa aberto (tenant + ABERTO).
+    __table_args__ = (
+        db.Index(
+            "uq_cash_sessions_tenant_aberto",
+            "tenant_id",
+            unique=True,
+            postgresql_where=db.text("status = 'ABERTO'"),
+            sqlite_where=db.text("status = 'ABERTO'")
+        ),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
 
     # ==============================
@@ -124,64 +165,125 @@ class CashSession(db.Model):
 
     @staticmethod
     def caixa_aberto(tenant_id):
-        return CashSession.query.filter_by(
+        cache = _get_cache()
+        caixa_id = cache.get(tenant_id)
+
+        if caixa_id is not None:
+            caixa = db.session.get(CashSession, caixa_id)
+
+            if caixa and caixa.tenant_id == tenant_id and caixa.esta_aberto:
+                return caixa
+
+            cache.delete(tenant_id)
+
+        caixa = CashSession.query.filter_by(
             tenant_id=tenant_id,
             status="ABERTO"
         ).first()
 
+        # Só o "tem caixa aberto" vai para o cache: um "não tem"
+        # defasado faria outro worker recusar ações de caixa
+        if caixa:
+            cache.set(tenant_id, caixa.id)
+
+        return caixa
+
+    @staticmethod
+    def invalidar_cache(tenant_id):
+        _get_cache().delete(tenant_id)
+
     @classmethod
     def get_or_create_aberta(cls, tenant_id, usuario_id):
         """
         Compatível com o dashboard:
         - Retorna caixa aberto
         - Se não existir, abre automaticamente
+
+        Abertura por upsert: se outra requisição abrir o caixa
+        ao mesmo tempo, o índice único parcial descarta este
+        INSERT e as duas usam o mesmo caixa.
+
+        Não faz commit.
         """
         caixa = cls.caixa_aberto(tenant_id)
 
         if caixa:
             return caixa
 
-        novo = cls(
-            tenant_id=tenant_id,
-            usuario_abertura_id=usuario_id,
-            status="ABERTO",
-            valor_inicial=Decimal("0.00"),
-            total_entradas=Decimal("0.00"),
-            total_saidas=Decimal("0.00")
-        )
-
-        db.session.add(novo)
-        db.session.commit()
+        cls._inserir_aberto(tenant_id, usuario_id)
 
-        return novo
+        return cls.caixa_aberto(tenant_id)
 
     # ==============================
     # OPERAÇÕES
     # ==============================
+    # Nenhuma operação faz commit: quem chama fecha a
+    # transação (uma por ação do usuário).
 
     @staticmethod
     def abrir_caixa(tenant_id, usuario_id, valor_inicial=0, observacoes=None):
-        if CashSession.caixa_aberto(tenant_id):
-            raise Exception("Já existe um caixa aberto para este tenant")
-
-        caixa = CashSession(
-            tenant_id=tenant_id,
-            usuario_abertura_id=usuario_id,
+        inserido = CashSession._inserir_aberto(
+            tenant_id,
+            usuario_id,
             valor_inicial=Decimal(valor_inicial),
             observacoes=observacoes
         )
 
-        db.session.add(caixa)
-        db.session.commit()
-        return caixa
+        if not inserido:
+            raise Exception("Já existe um caixa aberto para este tenant")
+
+        return CashSession.caixa_aberto(tenant_id)
+
+    @staticmethod
+    def _inserir_aberto(tenant_id, usuario_id,
+                        valor_inicial=Decimal("0.00"), observacoes=None):
+        """
+        INSERT ... ON CONFLICT DO NOTHING do caixa aberto.
+        Retorna False se o tenant já tinha um.
+        """
+        from app.utils.db import insert_ignore
+
+        result = db.session.execute(
+            insert_ignore(CashSession.__table__).values(
+                tenant_id=tenant_id,
+                usuario_abertura_id=usuario_id,
+                status="ABERTO",
+                valor_inicial=valor_inicial,
+                total_entradas=Decimal("0.00"),
+                total_saidas=Decimal("0.00"),
+                observacoes=observacoes
+            )
+        )
+
+        CashSession.invalidar_cache(tenant_id)
+
+        return result.rowcount > 0
 
     def registrar_entrada(self, valor):
-        self.total_entradas = Decimal(self.total_entradas) + Decimal(valor)
-        db.session.commit()
+        self._incrementar(total_entradas=Decimal(valor))
 
     def registrar_saida(self, valor):
-        self.total_saidas = Decimal(self.total_saidas) + Decimal(valor)
-        db.session.commit()
+        self._incrementar(total_saidas=Decimal(valor))
+
+    def _incrementar(self, **deltas):
+        """
+        Soma no banco (UPDATE ... SET col = col + :v RETURNING)
+        em vez de ler, somar no Python e gravar: duas entradas
+        simultâneas na mesma sessão não se perdem.
+
+        O valor devolvido vira o estado "limpo" do objeto, então
+        saldo_calculado já reflete o total atualizado.
+        """
+        from sqlalchemy.orm.attributes import set_committed_value
+        from app.utils.db import incrementar
+
+        # Garante a linha no banco (sessão recém-aberta)
+        db.session.flush()
+
+        novos = incrementar(CashSession, self.id, **deltas)
+
+        for nome, valor in zip(deltas, novos):
+            set_committed_value(self, nome, valor)
 
     def fechar_caixa(self, usuario_id, valor_final, observacoes=None):
         self.usuario_fechamento_id = usuario_id
@@ -192,4 +294,4 @@ class CashSession(db.Model):
         if observacoes:
             self.observacoes = observacoes
 
-        db.session.commit()
+        CashSession.invalidar_cache(self.tenant_id)
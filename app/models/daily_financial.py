@@ -0,0 +1,251 @@
+from collections import defaultdict
+from decimal import Decimal
+
+from app.extensions import db
+
+# =========================================================
+# MODEL: CONSOLIDADO FINANCEIRO DIÁRIO
+# =========================================================
+# Uma linha por (tenant, dia local, tipo, categoria,
+# método de pagamento) com a soma e a quantidade de
+# lançamentos. Mantida incrementalmente a cada movimento
+# de caixa e despesa; os relatórios leem só este intervalo
+# de dias, qualquer que seja o tamanho do período.
+#
+# tipo: tipo do CashMovement (ENTRADA | SAIDA ...)
+#       ou DESPESA para Expense.
+# Categoria / método ausentes viram "" (NULL não conflita
+# numa constraint única e quebraria o upsert).
+# =========================================================
+
+TIPO_DESPESA = "DESPESA"
+
+
+class DailyFinancial(db.Model):
+    __tablename__ = "daily_financials"
+
+    # A constraint também é o índice da leitura por período:
+    # tenant_id = ? AND dia BETWEEN ? AND ?
+    __table_args__ = (
+        db.UniqueConstraint(
+            "tenant_id", "dia", "tipo", "categoria", "metodo_pagamento",
+            name="uq_daily_financials_chave"
+        ),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+
+    # =====================================================
+    # CHAVE
+    # =====================================================
+    tenant_id = db.Column(
+        db.Integer,
+        db.ForeignKey("tenants.id"),
+        nullable=False
+    )
+
+    dia = db.Column(
+        db.Date,
+        nullable=False
+    )
+
+    tipo = db.Column(
+        db.String(20),
+        nullable=False
+    )
+
+    categoria = db.Column(
+        db.String(50),
+        nullable=False,
+        default="",
+        server_default=""
+    )
+
+    metodo_pagamento = db.Column(
+        db.String(30),
+        nullable=False,
+        default="",
+        server_default=""
+    )
+
+    # =====================================================
+    # TOTAIS
+    # =====================================================
+    total = db.Column(
+        db.Numeric(12, 2),
+        nullable=False,
+        default=Decimal("0.00")
+    )
+
+    quantidade = db.Column(
+        db.Integer,
+        nullable=False,
+        default=0
+    )
+
+    # =====================================================
+    # MANUTENÇÃO INCREMENTAL
+    # =====================================================
+    @staticmethod
+    def registrar(tenant_id, dia, tipo, valor, categoria=None,
+                  metodo_pagamento=None, quantidade=1):
+        """
+        Soma um lançamento (ou vários, via quantidade) no dia,
+        e nas métricas da plataforma (entradas / saídas).
+        Não faz commit.
+        """
+        from app.models.platform_daily_metric import PlatformDailyMetric
+        from app.utils.db import somar_ou_inserir
+
+        somar_ou_inserir(
+            DailyFinancial,
+            {
+                "tenant_id": tenant_id,
+                "dia": dia,
+                "tipo": tipo,
+                "categoria": categoria or "",
+                "metodo_pagamento": metodo_pagamento or "",
+            },
+            total=Decimal(valor),
+            quantidade=quantidade
+        )
+
+        PlatformDailyMetric.registrar(
+            tenant_id, dia, tipo, valor, quantidade=quantidade
+        )
+
+    # =====================================================
+    # RECONSTRUÇÃO (BACKFILL)
+    # =====================================================
+    @staticmethod
+    def reconstruir(tenant_id):
+        """
+        Recalcula do zero o consolidado do tenant a partir de
+        cash_movements e expenses. Os dois lados são agrupados
+        no banco (movimentos por data_local, já no fuso do
+        tenant), então só sobem as linhas do consolidado.
+        Refaz também as métricas da plataforma do tenant.
+
+        Não faz commit. Retorna o número de linhas gravadas.
+        """
+        from app.models.cash_movement import CashMovement
+        from app.models.expense import Expense
+        from app.models.platform_daily_metric import PlatformDailyMetric
+        from app.utils.report_cache import marcar_alteracao
+
+        totais = defaultdict(lambda: [Decimal("0.00"), 0])
+
+        movimentos = db.session.query(
+            CashMovement.data_local,
+            CashMovement.tipo,
+            CashMovement.categoria,
+            CashMovement.metodo_pagamento,
+            db.func.sum(CashMovement.valor),
+            db.func.count(CashMovement.id)
+        ).filter(
+            CashMovement.tenant_id == tenant_id
+        ).group_by(
+            CashMovement.data_local,
+            CashMovement.tipo,
+            CashMovement.categoria,
+            CashMovement.metodo_pagamento
+        )
+
+        for dia, tipo, categoria, metodo, soma, quantidade in movimentos:
+            chave = (dia, tipo, categoria or "", metodo or "")
+            totais[chave][0] += Decimal(soma)
+            totais[chave][1] += quantidade
+
+        # Despesas já têm a data do dia (local)
+        despesas = db.session.query(
+            Expense.data,
+            Expense.categoria,
+            Expense.metodo_pagamento,
+            db.func.sum(Expense.valor),
+            db.func.count(Expense.id)
+        ).filter(
+            Expense.tenant_id == tenant_id
+        ).group_by(
+            Expense.data,
+            Expense.categoria,
+            Expense.metodo_pagamento
+        )
+
+        for dia, categoria, metodo, soma, quantidade in despesas:
+            chave = (dia, TIPO_DESPESA, categoria or "", metodo or "")
+            totais[chave][0] += Decimal(soma)
+            totais[chave][1] += quantidade
+
+        db.session.execute(
+            db.delete(DailyFinancial).where(
+                DailyFinancial.tenant_id == tenant_id
+            )
+        )
+
+        linhas = [
+            {
+                "tenant_id": tenant_id,
+                "dia": dia,
+                "tipo": tipo,
+                "categoria": categoria,
+                "metodo_pagamento": metodo,
+                "total": total,
+                "quantidade": quantidade,
+            }
+            for (dia, tipo, categoria, metodo), (total, quantidade)
+            in totais.items()
+        ]
+
+        if linhas:
+            db.session.execute(db.insert(DailyFinancial), linhas)
+
+        PlatformDailyMetric.reconstruir(tenant_id)
+
+        marcar_alteracao(db.session, tenant_id, retroativo=True)
+
+        return len(linhas)
+
+    # =====================================================
+    # LEITURA (RELATÓRIOS)
+    # =====================================================
+    @staticmethod
+    def totais(tenant_id, data_inicio, data_fim):
+        """
+        Totais financeiros do período (dias inclusivos) numa
+        única leitura do intervalo:
+        faturamento (serviços), despesas, entradas, saídas.
+        """
+        from app.utils.db import soma_se
+
+        def soma(*condicoes):
+            return soma_se(DailyFinancial.total, *condicoes)
+
+        row = db.session.query(
+            soma(
+                DailyFinancial.tipo != TIPO_DESPESA,
+                DailyFinancial.categoria == "SERVICO"
+            ),
+            soma(DailyFinancial.tipo == TIPO_DESPESA),
+            soma(DailyFinancial.tipo == "ENTRADA"),
+            soma(DailyFinancial.tipo == "SAIDA")
+        ).filter(
+            DailyFinancial.tenant_id == tenant_id,
+            DailyFinancial.dia >= data_inicio,
+            DailyFinancial.dia <= data_fim
+        ).one()
+
+        return {
+            "faturamento": Decimal(row[0] or 0),
+            "despesas": Decimal(row[1] or 0),
+            "entradas": Decimal(row[2] or 0),
+            "saidas": Decimal(row[3] or 0),
+        }
+
+    # =====================================================
+    # REPRESENTAÇÃO
+    # =====================================================
+    def __repr__(self):
+        return (
+            f"<DailyFinancial {self.tenant_id} {self.dia} "
+            f"{self.tipo} {self.categoria} R$ {self.total}>"
+        )
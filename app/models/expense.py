@@ -70,6 +70,43 @@ class Expense(db.Model):
         """Facilita uso em gráficos"""
         return float(self.valor)
 
+    # =====================================================
+    # REGISTRO
+    # =====================================================
+
+    @staticmethod
+    def registrar(tenant_id, categoria, valor, descricao=None,
+                  metodo_pagamento=None, data=None):
+        """
+        Cria a despesa e soma no consolidado diário
+        (daily_financials). Não faz commit.
+        """
+        from decimal import Decimal
+        from app.models.daily_financial import DailyFinancial, TIPO_DESPESA
+        from app.utils.dates import hoje_local
+
+        despesa = Expense(
+            tenant_id=tenant_id,
+            categoria=categoria,
+            descricao=descricao,
+            valor=Decimal(valor),
+            metodo_pagamento=metodo_pagamento,
+            data=data or hoje_local(tenant_id)
+        )
+
+        db.session.add(despesa)
+
+        DailyFinancial.registrar(
+            tenant_id=tenant_id,
+            dia=despesa.data,
+            tipo=TIPO_DESPESA,
+            valor=despesa.valor,
+            categoria=categoria,
+            metodo_pagamento=metodo_pagamento
+        )
+
+        return despesa
+
     # =====================================================
     # QUERIES ÚTEIS (RELATÓRIOS)
     # =====================================================
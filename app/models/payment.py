@@ -17,6 +17,14 @@ class Payment(db.Model):
 
     __tablename__ = "payments"
 
+    # Relatórios diários pelo dia local
+    __table_args__ = (
+        db.Index(
+            "ix_payments_tenant_data_local",
+            "tenant_id", "data_local"
+        ),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
 
     # ==============================
@@ -77,6 +85,24 @@ class Payment(db.Model):
         default=datetime.utcnow
     )
 
+    # Dia de criado_em no fuso do tenant (gravado no insert)
+    data_local = db.Column(
+        db.Date,
+        nullable=False
+    )
+
+    # ==============================
+    # CAIXA
+    # ==============================
+    # Já lançado como entrada no caixa (ver
+    # CashMovement.registrar_pagamentos)
+    sincronizado_caixa = db.Column(
+        db.Boolean,
+        nullable=False,
+        default=False,
+        server_default=db.false()
+    )
+
     # ==============================
     # HELPERS
     # ==============================
@@ -147,3 +173,21 @@ class Payment(db.Model):
             .group_by(Payment.barber_id)
             .all()
         )
+
+
+# =========================================================
+# DIA LOCAL NO INSERT
+# =========================================================
+@db.event.listens_for(Payment, "before_insert")
+def _preencher_data_local(mapper, connection, pagamento):
+    from app.utils.dates import data_local
+    from app.utils.tenant_cache import fuso_do_tenant
+
+    if pagamento.criado_em is None:
+        pagamento.criado_em = datetime.utcnow()
+
+    if pagamento.data_local is None:
+        pagamento.data_local = data_local(
+            pagamento.criado_em,
+            fuso_do_tenant(pagamento.tenant_id, connection)
+        )
@@ -0,0 +1,159 @@
+from decimal import Decimal
+
+from app.extensions import db
+
+# =========================================================
+# MODEL: MÉTRICAS DIÁRIAS DA PLATAFORMA
+# =========================================================
+# Uma linha por (tenant, dia local) com as entradas e saídas
+# de caixa do dia. É a leitura do painel do admin global:
+# centenas de tenants × dias, em vez de todo o
+# cash_movements.
+#
+# Mantida junto com daily_financials (DailyFinancial.registrar
+# soma aqui os lançamentos de ENTRADA / SAIDA) e reconstruída
+# a partir dele (reconstruir), então as duas nunca divergem.
+# =========================================================
+
+TIPOS = ("ENTRADA", "SAIDA")
+
+
+class PlatformDailyMetric(db.Model):
+    __tablename__ = "platform_daily_metrics"
+
+    __table_args__ = (
+        db.UniqueConstraint(
+            "tenant_id", "dia",
+            name="uq_platform_daily_metrics_tenant_dia"
+        ),
+        # Painel global: todos os tenants de um intervalo de dias
+        db.Index(
+            "ix_platform_daily_metrics_dia_tenant",
+            "dia", "tenant_id"
+        ),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+
+    # =====================================================
+    # CHAVE
+    # =====================================================
+    tenant_id = db.Column(
+        db.Integer,
+        db.ForeignKey("tenants.id"),
+        nullable=False
+    )
+
+    dia = db.Column(
+        db.Date,
+        nullable=False
+    )
+
+    # =====================================================
+    # TOTAIS
+    # =====================================================
+    entradas = db.Column(
+        db.Numeric(12, 2),
+        nullable=False,
+        default=Decimal("0.00")
+    )
+
+    quantidade_entradas = db.Column(
+        db.Integer,
+        nullable=False,
+        default=0
+    )
+
+    saidas = db.Column(
+        db.Numeric(12, 2),
+        nullable=False,
+        default=Decimal("0.00")
+    )
+
+    quantidade_saidas = db.Column(
+        db.Integer,
+        nullable=False,
+        default=0
+    )
+
+    # =====================================================
+    # MANUTENÇÃO INCREMENTAL
+    # =====================================================
+    @staticmethod
+    def registrar(tenant_id, dia, tipo, valor, quantidade=1):
+        """
+        Soma lançamentos de ENTRADA / SAIDA no dia (outros
+        tipos são ignorados). Um upsert; não faz commit.
+        """
+        from app.utils.db import somar_ou_inserir
+
+        if tipo not in TIPOS:
+            return
+
+        if tipo == "ENTRADA":
+            deltas = {
+                "entradas": Decimal(valor),
+                "quantidade_entradas": quantidade,
+            }
+        else:
+            deltas = {
+                "saidas": Decimal(valor),
+                "quantidade_saidas": quantidade,
+            }
+
+        somar_ou_inserir(
+            PlatformDailyMetric,
+            {"tenant_id": tenant_id, "dia": dia},
+            **deltas
+        )
+
+    # =====================================================
+    # RECONSTRUÇÃO
+    # =====================================================
+    @staticmethod
+    def reconstruir(tenant_id):
+        """
+        Recalcula as linhas do tenant a partir de
+        daily_financials (INSERT ... SELECT agrupado).
+        Não faz commit.
+        """
+        from app.models.daily_financial import DailyFinancial
+        from app.utils.db import soma_se
+
+        db.session.execute(
+            db.delete(PlatformDailyMetric).where(
+                PlatformDailyMetric.tenant_id == tenant_id
+            )
+        )
+
+        entrada = DailyFinancial.tipo == "ENTRADA"
+        saida = DailyFinancial.tipo == "SAIDA"
+
+        origem = db.select(
+            DailyFinancial.tenant_id,
+            DailyFinancial.dia,
+            soma_se(DailyFinancial.total, entrada),
+            soma_se(DailyFinancial.quantidade, entrada),
+            soma_se(DailyFinancial.total, saida),
+            soma_se(DailyFinancial.quantidade, saida)
+        ).where(
+            DailyFinancial.tenant_id == tenant_id,
+            DailyFinancial.tipo.in_(TIPOS)
+        ).group_by(
+            DailyFinancial.tenant_id,
+            DailyFinancial.dia
+        )
+
+        db.session.execute(
+            db.insert(PlatformDailyMetric).from_select(
+                [
+                    "tenant_id", "dia",
+                    "entradas", "quantidade_entradas",
+                    "saidas", "quantidade_saidas",
+                ],
+                origem
+            )
+        )
+
+    def __repr__(self):
+        return f"<PlatformDailyMetric {self.tenant_id} | {self.dia}>"
@@ -0,0 +1,291 @@
+import json
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from app.extensions import db
+
+# =========================================================
+# MODEL: JOB DE RELATÓRIO (FILA NO BANCO)
+# =========================================================
+# Relatórios de períodos longos não são calculados dentro
+# da requisição: a rota grava um job PENDENTE e devolve o
+# id; um worker (thread do processo web ou `flask
+# report-worker`) reserva o job, calcula e grava o
+# resultado em JSON. O resultado fica guardado para ser
+# reaberto / baixado de novo.
+#
+# Reserva: SELECT ... FOR UPDATE SKIP LOCKED (Postgres) +
+# UPDATE condicional no status, então vários workers podem
+# ler a mesma fila sem pegar o mesmo job. No SQLite o FOR
+# UPDATE não existe e o UPDATE condicional basta.
+#
+# status: PENDENTE | PROCESSANDO | CONCLUIDO | ERRO
+# =========================================================
+
+PENDENTE = "PENDENTE"
+PROCESSANDO = "PROCESSANDO"
+CONCLUIDO = "CONCLUIDO"
+ERRO = "ERRO"
+
+
+class ReportJob(db.Model):
+    __tablename__ = "report_jobs"
+
+    __table_args__ = (
+        # Fila: próximo job por status, em ordem de chegada
+        db.Index(
+            "ix_report_jobs_status_criado_em",
+            "status", "criado_em"
+        ),
+        # Reaproveitamento: mesmo relatório já pedido
+        db.Index(
+            "ix_report_jobs_tenant_tipo_parametros",
+            "tenant_id", "tipo", "parametros"
+        ),
+    )
+
+    # Tentativas antes de marcar ERRO (worker que morreu
+    # no meio devolve o job para a fila)
+    MAXIMO_TENTATIVAS = 3
+
+    id = db.Column(db.Integer, primary_key=True)
+
+    # Nulo = relatório da plataforma (admin global)
+    tenant_id = db.Column(
+        db.Integer,
+        db.ForeignKey("tenants.id"),
+        nullable=True
+    )
+
+    usuario_id = db.Column(
+        db.Integer,
+        db.ForeignKey("users.id"),
+        nullable=False
+    )
+
+    # =====================================================
+    # PEDIDO
+    # =====================================================
+    tipo = db.Column(db.String(40), nullable=False)
+
+    # JSON canônico (chaves ordenadas): serve de chave
+    # para reaproveitar jobs iguais
+    parametros = db.Column(db.String(255), nullable=False)
+
+    # =====================================================
+    # EXECUÇÃO
+    # =====================================================
+    status = db.Column(
+        db.String(20),
+        nullable=False,
+        default=PENDENTE
+    )
+
+    tentativas = db.Column(db.Integer, nullable=False, default=0)
+
+    resultado = db.Column(db.Text, nullable=True)
+    erro = db.Column(db.String(255), nullable=True)
+
+    criado_em = db.Column(
+        db.DateTime,
+        nullable=False,
+        default=datetime.utcnow
+    )
+    iniciado_em = db.Column(db.DateTime, nullable=True)
+    concluido_em = db.Column(db.DateTime, nullable=True)
+
+    # =====================================================
+    # HELPERS
+    # =====================================================
+    @property
+    def finalizado(self):
+        return self.status in (CONCLUIDO, ERRO)
+
+    @property
+    def params(self):
+        return json.loads(self.parametros)
+
+    @property
+    def payload(self):
+        """
+        Resultado decodificado (valores decimais voltam como
+        Decimal), ou None
+        """
+        if self.resultado is None:
+            return None
+        return json.loads(self.resultado, parse_float=Decimal)
+
+    def para_dict(self):
+        return {
+            "id": self.id,
+            "tipo": self.tipo,
+            "status": self.status,
+            "parametros": self.params,
+            "erro": self.erro,
+            "criado_em": self.criado_em.isoformat(),
+            "concluido_em": (
+                self.concluido_em.isoformat() if self.concluido_em else None
+            ),
+        }
+
+    # =====================================================
+    # FILA
+    # =====================================================
+    @staticmethod
+    def enfileirar(tenant_id, usuario_id, tipo, parametros, reaproveitar_por):
+        """
+        Job para o relatório pedido. Reaproveita um job igual
+        (mesmo tenant, tipo e parâmetros) ainda na fila, ou
+        concluído há menos de `reaproveitar_por` segundos.
+        Não faz commit. Retorna (job, novo).
+        """
+        chave = _serializar(parametros)
+
+        existente = ReportJob.query.filter(
+            ReportJob.tenant_id == tenant_id,
+            ReportJob.tipo == tipo,
+            ReportJob.parametros == chave,
+            db.or_(
+                ReportJob.status.in_((PENDENTE, PROCESSANDO)),
+                db.and_(
+                    ReportJob.status == CONCLUIDO,
+                    ReportJob.concluido_em >= (
+                        datetime.utcnow() - timedelta(seconds=reaproveitar_por)
+                    )
+                )
+            )
+        ).order_by(
+            ReportJob.id.desc()
+        ).first()
+
+        if existente:
+            return existente, False
+
+        job = ReportJob(
+            tenant_id=tenant_id,
+            usuario_id=usuario_id,
+            tipo=tipo,
+            parametros=chave,
+            status=PENDENTE
+        )
+        db.session.add(job)
+        return job, True
+
+    @staticmethod
+    def reservar(job_id=None, expira_em=600):
+        """
+        Marca um job como PROCESSANDO e devolve o id (ou None).
+
+        Sem job_id: o mais antigo da fila; jobs PROCESSANDO
+        há mais de `expira_em` segundos (worker morreu) voltam
+        a ser elegíveis. Faz commit (a reserva precisa ficar
+        visível para os outros workers).
+        """
+        agora = datetime.utcnow()
+
+        elegivel = db.or_(
+            ReportJob.status == PENDENTE,
+            db.and_(
+                ReportJob.status == PROCESSANDO,
+                ReportJob.iniciado_em < agora - timedelta(seconds=expira_em)
+            )
+        )
+
+        if job_id is None:
+            job_id = db.session.execute(
+                db.select(ReportJob.id)
+                .where(elegivel)
+                .order_by(ReportJob.criado_em, ReportJob.id)
+                .limit(1)
+                .with_for_update(skip_locked=True)
+            ).scalar()
+
+            if job_id is None:
+                db.session.rollback()
+                return None
+
+        reservado = db.session.execute(
+            db.update(ReportJob).where(
+                ReportJob.id == job_id,
+                elegivel
+            ).values(
+                status=PROCESSANDO,
+                iniciado_em=agora,
+                tentativas=ReportJob.tentativas + 1
+            ).execution_options(
+                synchronize_session=False
+            )
+        ).rowcount
+
+        db.session.commit()
+        return job_id if reservado else None
+
+    @staticmethod
+    def concluir(job_id, payload):
+        db.session.execute(
+            db.update(ReportJob).where(
+                ReportJob.id == job_id
+            ).values(
+                status=CONCLUIDO,
+                resultado=_serializar(payload),
+                erro=None,
+                concluido_em=datetime.utcnow()
+            ).execution_options(
+                synchronize_session=False
+            )
+        )
+        db.session.commit()
+
+    @staticmethod
+    def falhar(job_id, erro):
+        """
+        Devolve o job para a fila, ou ERRO depois de
+        MAXIMO_TENTATIVAS
+        """
+        esgotado = ReportJob.tentativas >= ReportJob.MAXIMO_TENTATIVAS
+
+        db.session.execute(
+            db.update(ReportJob).where(
+                ReportJob.id == job_id
+            ).values(
+                status=db.case((esgotado, ERRO), else_=PENDENTE),
+                erro=str(erro)[:255],
+                concluido_em=db.case((esgotado, datetime.utcnow()), else_=None)
+            ).execution_options(
+                synchronize_session=False
+            )
+        )
+        db.session.commit()
+
+    @staticmethod
+    def limpar(dias):
+        """
+        Remove jobs finalizados há mais de `dias` dias.
+        Não faz commit. Retorna quantos foram removidos.
+        """
+        return db.session.execute(
+            db.delete(ReportJob).where(
+                ReportJob.status.in_((CONCLUIDO, ERRO)),
+                ReportJob.concluido_em < datetime.utcnow() - timedelta(days=dias)
+            ).execution_options(
+                synchronize_session=False
+            )
+        ).rowcount
+
+    def __repr__(self):
+        return f"<ReportJob {self.id} | {self.tipo} | {self.status}>"
+
+
+def _serializar(valor):
+    """
+    JSON canônico; Decimal vira número (lido de volta como
+    Decimal em `payload`), date vira ISO
+    """
+    def _padrao(obj):
+        if isinstance(obj, Decimal):
+            return float(obj)
+        if hasattr(obj, "isoformat"):
+            return obj.isoformat()
+        raise TypeError(f"não serializável: {type(obj).__name__}")
+
+    return json.dumps(valor, default=_padrao, sort_keys=True, separators=(",", ":"))
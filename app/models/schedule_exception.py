@@ -0,0 +1,90 @@
+from datetime import datetime
+from app.extensions import db
+
+# =========================================================
+# MODEL: EXCEÇÕES DE AGENDA
+# =========================================================
+# Bloqueios e fechamentos que se sobrepõem às regras
+# de BarberSchedule:
+# - barber_id vazio  → vale para a barbearia inteira
+# - horas vazias     → vale para o dia inteiro
+# =========================================================
+
+class ScheduleException(db.Model):
+    __tablename__ = "schedule_exceptions"
+
+    __table_args__ = (
+        db.Index(
+            "ix_schedule_exceptions_tenant_data",
+            "tenant_id", "data"
+        ),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+
+    # =====================================================
+    # MULTI-TENANT
+    # =====================================================
+    tenant_id = db.Column(
+        db.Integer,
+        db.ForeignKey("tenants.id"),
+        nullable=False
+    )
+
+    barber_id = db.Column(
+        db.Integer,
+        db.ForeignKey("users.id"),
+        nullable=True
+    )
+
+    # =====================================================
+    # PERÍODO BLOQUEADO
+    # =====================================================
+    data = db.Column(
+        db.Date,
+        nullable=False
+    )
+
+    hora_inicio = db.Column(
+        db.Time,
+        nullable=True
+    )
+
+    hora_fim = db.Column(
+        db.Time,
+        nullable=True
+    )
+
+    tipo = db.Column(
+        db.String(20),
+        nullable=False,
+        default="BLOQUEIO"
+    )  # BLOQUEIO | FECHAMENTO
+
+    motivo = db.Column(
+        db.String(255),
+        nullable=True
+    )
+
+    # =====================================================
+    # AUDITORIA
+    # =====================================================
+    criado_em = db.Column(
+        db.DateTime,
+        default=datetime.utcnow,
+        nullable=False
+    )
+
+    # =====================================================
+    # HELPERS
+    # =====================================================
+    @property
+    def dia_inteiro(self) -> bool:
+        return self.hora_inicio is None or self.hora_fim is None
+
+    # =====================================================
+    # REPRESENTAÇÃO
+    # =====================================================
+    def __repr__(self):
+        alvo = self.barber_id or "todos"
+        return f"<ScheduleException {self.tipo} barber={alvo} data={self.data}>"
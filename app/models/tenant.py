@@ -58,6 +58,16 @@ class Tenant(db.Model):
         nullable=True
     )
 
+    # =====================================================
+    # LOCALIZAÇÃO
+    # =====================================================
+    # Fuso IANA (ex.: America/Manaus). Vazio = TIMEZONE da app.
+    # Define o "dia local" de movimentos, pagamentos e relatórios.
+    fuso_horario = db.Column(
+        db.String(64),
+        nullable=True
+    )
+
     # =====================================================
     # STATUS
     # =====================================================
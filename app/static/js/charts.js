@@ -28,7 +28,11 @@ function renderRevenueExpenseProfitChart(ctxId, labels, revenue, expenses, profi
     const ctx = document.getElementById(ctxId);
     if (!ctx) return;
 
-    new Chart(ctx, {
+    // Recarregar (troca de período) reaproveita o canvas
+    const anterior = Chart.getChart(ctx);
+    if (anterior) anterior.destroy();
+
+    return new Chart(ctx, {
         type: "bar",
         data: {
             labels: labels,
@@ -80,6 +84,39 @@ function renderRevenueExpenseProfitChart(ctxId, labels, revenue, expenses, profi
     });
 }
 
+/* ---------------------------------------------------------
+   SÉRIE DO SERVIDOR → GRÁFICO
+   O endpoint (/dashboard/reports/series) já devolve os
+   períodos agrupados e com zeros: uma requisição e nenhuma
+   agregação aqui.
+--------------------------------------------------------- */
+function loadRevenueExpenseProfitSeries(ctxId, url) {
+
+    return fetch(url, { headers: { "Accept": "application/json" } })
+        .then(function (response) {
+            if (!response.ok) throw new Error("HTTP " + response.status);
+            return response.json();
+        })
+        .then(function (serie) {
+            return renderRevenueExpenseProfitChart(
+                ctxId,
+                serie.labels.map(function (label) {
+                    return formatBucketLabel(label, serie.bucket);
+                }),
+                serie.revenue,
+                serie.expenses,
+                serie.profit
+            );
+        });
+}
+
+function formatBucketLabel(isoDate, bucket) {
+    const [ano, mes, dia] = isoDate.split("-");
+    if (bucket === "month") return mes + "/" + ano;
+    if (bucket === "week") return "sem. " + dia + "/" + mes;
+    return dia + "/" + mes;
+}
+
 /* ---------------------------------------------------------
    GRÁFICO DE LINHA — FATURAMENTO MENSAL
 --------------------------------------------------------- */
@@ -207,6 +244,7 @@ function renderCashFlowChart(ctxId, labels, openValues, closeValues) {
    EXPORTA FUNÇÕES (CASO USE MODULES)
 --------------------------------------------------------- */
 window.renderRevenueExpenseProfitChart = renderRevenueExpenseProfitChart;
+window.loadRevenueExpenseProfitSeries = loadRevenueExpenseProfitSeries;
 window.renderRevenueLineChart = renderRevenueLineChart;
 window.renderExpenseCategoryChart = renderExpenseCategoryChart;
 window.renderCashFlowChart = renderCashFlowChart;
@@ -0,0 +1,41 @@
+/* =========================================================
+   report_jobs.js
+   Acompanha um job de relatório (períodos longos)
+   ========================================================= */
+
+/* ---------------------------------------------------------
+   Consulta `statusUrl` a cada `intervalMs` até o job
+   terminar; chama onDone(job) ou onError(job).
+   Sem dependências (não precisa do Chart.js).
+--------------------------------------------------------- */
+function pollReportJob(statusUrl, onDone, onError, intervalMs) {
+
+    intervalMs = intervalMs || 2000;
+
+    function consultar() {
+        fetch(statusUrl, { headers: { "Accept": "application/json" } })
+            .then(function (response) {
+                if (!response.ok) {
+                    throw new Error("HTTP " + response.status);
+                }
+                return response.json();
+            })
+            .then(function (job) {
+                if (job.status === "CONCLUIDO") {
+                    onDone(job);
+                } else if (job.status === "ERRO") {
+                    if (onError) onError(job);
+                } else {
+                    setTimeout(consultar, intervalMs);
+                }
+            })
+            .catch(function (e) {
+                console.error("Falha ao consultar o relatório:", e);
+                setTimeout(consultar, intervalMs * 2);
+            });
+    }
+
+    consultar();
+}
+
+window.pollReportJob = pollReportJob;
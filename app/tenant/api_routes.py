@@ -0,0 +1,327 @@
+from flask import (
+    Blueprint, request,
+    jsonify, abort
+)
+from flask_login import login_required, current_user
+from sqlalchemy import func
+from sqlalchemy.orm import joinedload
+from datetime import datetime
+
+from app.extensions import db
+from app.models.user import User
+from app.models.service import Service
+from app.models.appointment import Appointment
+from app.models.available_slot import AvailableSlot
+from app.utils.dates import filtro_periodo, hoje_local
+from app.utils.pagination import paginar, limite_pagina
+
+
+# =========================================================
+# BLUEPRINT
+# =========================================================
+# Painéis do dashboard servidos sob demanda, cada um com
+# paginação por keyset. O HTML inicial do dashboard traz
+# só os totais e a primeira página de cada painel.
+# =========================================================
+
+tenant_api_bp = Blueprint(
+    "tenant_api",
+    __name__,
+    url_prefix="/dashboard/api"
+)
+
+
+# =========================================================
+# ENDPOINTS
+# =========================================================
+@tenant_api_bp.route("/appointments", methods=["GET"])
+@login_required
+def appointments():
+    return _responder(pagina_agendamentos)
+
+
+@tenant_api_bp.route("/slots", methods=["GET"])
+@login_required
+def slots():
+    return _responder(pagina_horarios)
+
+
+@tenant_api_bp.route("/services", methods=["GET"])
+@login_required
+def services():
+    return _responder(pagina_servicos)
+
+
+@tenant_api_bp.route("/barbers", methods=["GET"])
+@login_required
+def barbers():
+    return _responder(pagina_barbeiros)
+
+
+def _responder(pagina):
+    if not (current_user.is_tenant_admin() or current_user.is_barber()):
+        abort(403)
+
+    try:
+        return jsonify(
+            pagina(
+                request.args,
+                cursor=request.args.get("cursor"),
+                limite=limite_pagina(request.args.get("limit"))
+            )
+        )
+    except ValueError:
+        abort(400)
+
+
+# =========================================================
+# PÁGINAS (usadas também pelo HTML inicial do dashboard)
+# =========================================================
+def pagina_agendamentos(filtros, cursor=None, limite=None):
+    """
+    Agenda a partir de hoje (ou do dia filtrado),
+    em ordem de data_hora.
+    """
+    # Barbeiro e serviço no mesmo SELECT (JOIN): custo
+    # constante por página, sem uma consulta por linha
+    query = _filtrar_agendamentos(
+        Appointment.query.options(
+            joinedload(Appointment.barber),
+            joinedload(Appointment.service).lazyload(Service.barber)
+        ),
+        filtros
+    )
+
+    itens, next_cursor = paginar(
+        query,
+        [Appointment.data_hora, Appointment.id],
+        lambda a: (a.data_hora, a.id),
+        cursor=cursor,
+        limite=limite or limite_pagina(None)
+    )
+
+    return {
+        "items": [
+            {
+                "id": a.id,
+                "data_hora": a.data_hora.strftime("%d/%m/%Y %H:%M"),
+                "cliente_nome": a.cliente_nome,
+                "cliente_whatsapp": a.cliente_whatsapp,
+                "barber_nome": a.barber.nome if a.barber else None,
+                "service_nome": a.service.nome if a.service else None,
+                "status": a.status
+            }
+            for a in itens
+        ],
+        "next_cursor": next_cursor
+    }
+
+
+def pagina_horarios(filtros, cursor=None, limite=None):
+    """
+    Horários materializados a partir de hoje (no fuso
+    da barbearia)
+    """
+    query = db.session.query(
+        AvailableSlot.id,
+        AvailableSlot.data,
+        AvailableSlot.hora,
+        AvailableSlot.disponivel,
+        AvailableSlot.bloqueado_manual,
+        User.nome.label("barber_nome")
+    ).outerjoin(
+        User, User.id == AvailableSlot.barber_id
+    ).filter(
+        AvailableSlot.tenant_id == current_user.tenant_id,
+        AvailableSlot.data >= hoje_local(current_user.tenant_id)
+    )
+
+    barber_id = filtros.get("barber_id", type=int)
+    if barber_id:
+        query = query.filter(AvailableSlot.barber_id == barber_id)
+
+    itens, next_cursor = paginar(
+        query,
+        [AvailableSlot.data, AvailableSlot.hora, AvailableSlot.id],
+        lambda s: (s.data, s.hora, s.id),
+        cursor=cursor,
+        limite=limite or limite_pagina(None)
+    )
+
+    return {
+        "items": [
+            {
+                "id": s.id,
+                "data": s.data.strftime("%d/%m/%Y"),
+                "hora": s.hora.strftime("%H:%M"),
+                "barber_nome": s.barber_nome,
+                "disponivel": s.disponivel,
+                "status": (
+                    "DISPONIVEL" if s.disponivel
+                    else "BLOQUEADO" if s.bloqueado_manual
+                    else "OCUPADO"
+                )
+            }
+            for s in itens
+        ],
+        "next_cursor": next_cursor
+    }
+
+
+def pagina_servicos(filtros, cursor=None, limite=None):
+    query = db.session.query(
+        Service.id,
+        Service.nome,
+        Service.descricao,
+        Service.preco,
+        Service.duracao_min,
+        Service.barber_id,
+        Service.ativo,
+        User.nome.label("barber_nome")
+    ).outerjoin(
+        User, User.id == Service.barber_id
+    ).filter(
+        Service.tenant_id == current_user.tenant_id,
+        Service.excluido == False
+    )
+
+    itens, next_cursor = paginar(
+        query,
+        [Service.nome, Service.id],
+        lambda s: (s.nome, s.id),
+        cursor=cursor,
+        limite=limite or limite_pagina(None)
+    )
+
+    return {
+        "items": [
+            {
+                "id": s.id,
+                "nome": s.nome,
+                "descricao": s.descricao,
+                "preco": float(s.preco),
+                "duracao_min": s.duracao_min,
+                "barber_id": s.barber_id,
+                "barber_nome": s.barber_nome,
+                "ativo": s.ativo
+            }
+            for s in itens
+        ],
+        "next_cursor": next_cursor
+    }
+
+
+def pagina_barbeiros(filtros, cursor=None, limite=None):
+    query = db.session.query(
+        User.id,
+        User.nome,
+        User.email,
+        User.ativo
+    ).filter(
+        User.tenant_id == current_user.tenant_id,
+        User.role == "BARBER",
+        User.excluido == False
+    )
+
+    itens, next_cursor = paginar(
+        query,
+        [User.nome, User.id],
+        lambda b: (b.nome, b.id),
+        cursor=cursor,
+        limite=limite or limite_pagina(None)
+    )
+
+    return {
+        "items": [
+            {
+                "id": b.id,
+                "nome": b.nome,
+                "email": b.email,
+                "ativo": b.ativo
+            }
+            for b in itens
+        ],
+        "next_cursor": next_cursor
+    }
+
+
+# =========================================================
+# TOTAIS DO DASHBOARD (UMA CONSULTA)
+# =========================================================
+def resumo(filtros):
+    """
+    Contagens dos cards em uma única ida ao banco,
+    com subconsultas escalares.
+    """
+    tenant_id = current_user.tenant_id
+
+    servicos = db.session.query(func.count(Service.id)).filter(
+        Service.tenant_id == tenant_id,
+        Service.excluido == False
+    ).scalar_subquery()
+
+    barbeiros = db.session.query(func.count(User.id)).filter(
+        User.tenant_id == tenant_id,
+        User.role == "BARBER",
+        User.excluido == False
+    ).scalar_subquery()
+
+    agendamentos = _filtrar_agendamentos(
+        db.session.query(func.count(Appointment.id)),
+        filtros
+    ).scalar_subquery()
+
+    horarios_livres = db.session.query(func.count(AvailableSlot.id)).filter(
+        AvailableSlot.tenant_id == tenant_id,
+        AvailableSlot.disponivel == True,
+        AvailableSlot.data >= hoje_local(current_user.tenant_id)
+    ).scalar_subquery()
+
+    row = db.session.query(
+        servicos, barbeiros, agendamentos, horarios_livres
+    ).one()
+
+    return {
+        "servicos": row[0],
+        "barbeiros": row[1],
+        "agendamentos": row[2],
+        "horarios_livres": row[3],
+    }
+
+
+# =========================================================
+# HELPERS
+# =========================================================
+def _filtrar_agendamentos(query, filtros):
+    """
+    Filtros da agenda: data (um dia; padrão = de hoje em
+    diante), status e barbeiro. Barbeiro logado vê só
+    a própria agenda.
+    """
+    query = query.filter(
+        Appointment.tenant_id == current_user.tenant_id
+    )
+
+    if current_user.is_barber():
+        query = query.filter(Appointment.barber_id == current_user.id)
+    elif filtros.get("barber_id"):
+        query = query.filter(
+            Appointment.barber_id == int(filtros.get("barber_id"))
+        )
+
+    if filtros.get("data"):
+        dia = datetime.strptime(filtros.get("data"), "%Y-%m-%d").date()
+        query = query.filter(
+            *filtro_periodo(Appointment.data_hora, dia, dia)
+        )
+    else:
+        query = query.filter(
+            Appointment.data_hora >= datetime.combine(
+                hoje_local(current_user.tenant_id), datetime.min.time()
+            )
+        )
+
+    if filtros.get("status"):
+        query = query.filter(Appointment.status == filtros.get("status"))
+
+    return query
@@ -1,15 +1,21 @@
 from flask import (
     Blueprint, render_template,
     request, redirect, url_for,
-    flash, abort
+    flash, abort, Response,
+    stream_with_context
 )
 from flask_login import login_required, current_user
+from datetime import datetime
 from decimal import Decimal
+import csv
+import io
+import json
 
 from app.extensions import db
 from app.models.cash_session import CashSession
 from app.models.cash_movement import CashMovement
 from app.models.payment import Payment
+from app.utils.dates import hoje_local
 
 # =========================================================
 # BLUEPRINT
@@ -37,14 +43,19 @@ def overview():
     caixa_aberto = CashSession.caixa_aberto(tenant_id)
 
     movimentos = []
+    next_cursor = None
     saldo_atual = Decimal("0.00")
 
     if caixa_aberto:
-        movimentos = CashMovement.query.filter_by(
-            cash_session_id=caixa_aberto.id
-        ).order_by(
-            CashMovement.criado_em.desc()
-        ).all()
+        # Mais recentes primeiro, uma página por vez
+        try:
+            movimentos, next_cursor = CashMovement.pagina_da_sessao(
+                caixa_aberto.id,
+                cursor=request.args.get("cursor"),
+                decrescente=True
+            )
+        except ValueError:
+            abort(400)
 
         saldo_atual = caixa_aberto.saldo_calculado
 
@@ -52,6 +63,7 @@ def overview():
         "tenant_cash.html",
         caixa_aberto=caixa_aberto,
         movimentos=movimentos,
+        next_cursor=next_cursor,
         saldo_atual=saldo_atual
     )
 
@@ -94,6 +106,8 @@ def open_cash():
             descricao="Saldo inicial do caixa"
         )
 
+    db.session.commit()
+
     flash("Caixa aberto com sucesso", "success")
     return redirect(url_for("cash.overview"))
 
@@ -120,6 +134,7 @@ def close_cash():
         valor_final=caixa.saldo_calculado,
         observacoes="Fechamento de caixa"
     )
+    db.session.commit()
 
     flash("Caixa fechado com sucesso", "success")
     return redirect(url_for("cash.overview"))
@@ -173,6 +188,8 @@ def manual_movement():
             descricao=descricao
         )
 
+    db.session.commit()
+
     flash("Movimentação registrada com sucesso", "success")
     return redirect(url_for("cash.overview"))
 
@@ -194,32 +211,138 @@ def sync_payments():
         flash("Abra o caixa antes de sincronizar pagamentos", "danger")
         return redirect(url_for("cash.overview"))
 
-    pagamentos = Payment.query.filter_by(
-        tenant_id=tenant_id,
-        status="PAGO",
-        sincronizado_caixa=False
+    pagamentos = db.session.query(
+        Payment.id,
+        Payment.valor,
+        Payment.metodo_pagamento
+    ).filter(
+        Payment.tenant_id == tenant_id,
+        Payment.status == "PAGO",
+        Payment.sincronizado_caixa == False
+    ).order_by(
+        Payment.id.asc()
     ).all()
 
     if not pagamentos:
         flash("Nenhum pagamento pendente para sincronizar", "warning")
         return redirect(url_for("cash.overview"))
 
-    for p in pagamentos:
-        CashMovement.registrar_entrada(
+    # Um INSERT por lote + um UPDATE nos totais + um UPDATE
+    # nos pagamentos, tudo num único commit
+    try:
+        CashMovement.registrar_pagamentos(
             tenant_id=tenant_id,
             cash_session=caixa,
             usuario_id=current_user.id,
-            valor=p.valor,
-            categoria="PAGAMENTO",
-            descricao=f"Pagamento #{p.id}",
-            metodo_pagamento=p.metodo_pagamento,
-            payment_id=p.id
+            pagamentos=pagamentos
         )
-
-        p.sincronizado_caixa = True
-        db.session.add(p)
-
-    db.session.commit()
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
 
     flash("Pagamentos sincronizados com o caixa", "success")
     return redirect(url_for("cash.overview"))
+
+
+# =========================================================
+# EXPORTAR MOVIMENTAÇÕES (CSV / JSONL)
+# =========================================================
+# A resposta é gerada linha a linha enquanto o banco entrega
+# os lotes: a memória fica constante, seja um dia ou um ano.
+# =========================================================
+
+COLUNAS_EXPORTACAO = [
+    "id",
+    "criado_em",
+    "cash_session_id",
+    "tipo",
+    "categoria",
+    "descricao",
+    "valor",
+    "metodo_pagamento",
+    "appointment_id",
+    "payment_id",
+    "expense_id",
+]
+
+
+@cash_bp.route("/export", methods=["GET"])
+@login_required
+def export_movements():
+
+    if not current_user.is_tenant_admin():
+        abort(403)
+
+    formato = request.args.get("format", "csv")
+    if formato not in ("csv", "jsonl"):
+        abort(400)
+
+    hoje = hoje_local(current_user.tenant_id)
+
+    try:
+        start = request.args.get("start")
+        end = request.args.get("end")
+
+        start_date = (
+            datetime.strptime(start, "%Y-%m-%d").date()
+            if start else hoje.replace(day=1)
+        )
+        end_date = (
+            datetime.strptime(end, "%Y-%m-%d").date()
+            if end else hoje
+        )
+    except ValueError:
+        abort(400)
+
+    linhas = CashMovement.exportar(
+        current_user.tenant_id, start_date, end_date
+    )
+
+    gerar = _gerar_csv if formato == "csv" else _gerar_jsonl
+    nome = f"movimentacoes_{start_date:%Y%m%d}_{end_date:%Y%m%d}.{formato}"
+
+    return Response(
+        stream_with_context(gerar(linhas)),
+        mimetype=(
+            "text/csv" if formato == "csv"
+            else "application/x-ndjson"
+        ),
+        headers={
+            "Content-Disposition": f'attachment; filename="{nome}"'
+        }
+    )
+
+
+def _gerar_csv(linhas):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    writer.writerow(COLUNAS_EXPORTACAO)
+
+    for linha in linhas:
+        writer.writerow(_valores_exportacao(linha))
+
+        # Esvazia o buffer a cada linha: nada se acumula
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate(0)
+
+    yield buffer.getvalue()
+
+
+def _gerar_jsonl(linhas):
+    for linha in linhas:
+        yield json.dumps(
+            dict(zip(COLUNAS_EXPORTACAO, _valores_exportacao(linha))),
+            ensure_ascii=False
+        ) + "\n"
+
+
+def _valores_exportacao(linha):
+    return [
+        v.isoformat() if isinstance(v, datetime)
+        else str(v) if isinstance(v, Decimal)
+        else v
+        for v in linha
+    ]
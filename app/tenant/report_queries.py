@@ -0,0 +1,339 @@
+from decimal import Decimal
+
+from flask import current_app
+
+from app.extensions import db
+from app.models.service import Service
+from app.models.user import User
+from app.models.expense import Expense
+from app.models.appointment import Appointment
+from app.models.cash_movement import CashMovement
+from app.models.daily_financial import DailyFinancial, TIPO_DESPESA
+from app.utils.db import soma_se, conta_se
+from app.utils import timebucket
+
+# =========================================================
+# CONSULTAS DOS RELATÓRIOS
+# =========================================================
+# Cada tabela é lida UMA vez por relatório: as várias
+# somas/contagens saem da mesma passada com agregação
+# condicional (soma_se), e os filtros de período são
+# sobre data_local (dia no fuso do tenant, gravado no
+# insert), coberto por (tenant_id, data_local).
+# =========================================================
+
+TOP_SERVICOS = 5
+
+
+def visao_geral(tenant_id, data_inicio, data_fim):
+    """
+    Indicadores de /dashboard/reports/ (2 consultas).
+    Retorna só tipos simples: o payload vai para o cache.
+    """
+    # Faturamento = apenas categoria SERVICO
+    totais = totais_financeiros(tenant_id, data_inicio, data_fim)
+
+    total_agendamentos, top_services = resumo_agendamentos(
+        tenant_id, data_inicio, data_fim
+    )
+
+    faturamento = totais["faturamento"]
+
+    return {
+        "faturamento": faturamento,
+        "despesas": totais["despesas"],
+        "lucro": faturamento - totais["despesas"],
+        "ticket_medio": (
+            faturamento / total_agendamentos
+            if total_agendamentos > 0 else Decimal("0.00")
+        ),
+        "total_agendamentos": total_agendamentos,
+        "top_services": top_services,
+        "entradas": totais["entradas"],
+        "saidas": totais["saidas"],
+        "saldo_caixa": totais["entradas"] - totais["saidas"],
+    }
+
+
+def totais_financeiros(tenant_id, data_inicio, data_fim):
+    """
+    faturamento, despesas, entradas e saídas do período.
+
+    Lê o consolidado diário (daily_financials); com
+    REPORTS_USE_ROLLUP desligado, calcula direto das
+    tabelas (ex.: antes do backfill).
+    """
+    if current_app.config.get("REPORTS_USE_ROLLUP", True):
+        return DailyFinancial.totais(tenant_id, data_inicio, data_fim)
+
+    totais = totais_caixa(tenant_id, data_inicio, data_fim)
+
+    totais["despesas"] = Decimal(
+        Expense.total_por_periodo(tenant_id, data_inicio, data_fim) or 0
+    )
+
+    return totais
+
+
+def totais_caixa(tenant_id, data_inicio, data_fim):
+    """
+    Uma passada em cash_movements:
+    faturamento (SERVICO), entradas e saídas.
+    """
+    row = db.session.query(
+        soma_se(CashMovement.valor, CashMovement.categoria == "SERVICO"),
+        soma_se(CashMovement.valor, CashMovement.tipo == "ENTRADA"),
+        soma_se(CashMovement.valor, CashMovement.tipo == "SAIDA")
+    ).filter(
+        CashMovement.tenant_id == tenant_id,
+        CashMovement.data_local.between(data_inicio, data_fim)
+    ).one()
+
+    return {
+        "faturamento": Decimal(row[0] or 0),
+        "entradas": Decimal(row[1] or 0),
+        "saidas": Decimal(row[2] or 0),
+    }
+
+
+def resumo_agendamentos(tenant_id, data_inicio, data_fim,
+                        limite=TOP_SERVICOS):
+    """
+    Uma passada em appointments (agrupada por serviço):
+    total de concluídos e os serviços mais feitos.
+
+    O número de grupos é o número de serviços do tenant
+    (dezenas), então o total e o top saem do mesmo resultado.
+    Serviços excluídos contam no total, mas não no top.
+    """
+    grupos = db.session.query(
+        Service.nome,
+        Service.excluido,
+        db.func.count(Appointment.id)
+    ).select_from(
+        Appointment
+    ).outerjoin(
+        Service, Service.id == Appointment.service_id
+    ).filter(
+        Appointment.tenant_id == tenant_id,
+        Appointment.status == "CONCLUIDO",
+        Appointment.data_local.between(data_inicio, data_fim)
+    ).group_by(
+        Service.nome,
+        Service.excluido
+    ).all()
+
+    total = sum(quantidade for _, _, quantidade in grupos)
+
+    por_nome = {}
+    for nome, excluido, quantidade in grupos:
+        if nome is not None and not excluido:
+            por_nome[nome] = por_nome.get(nome, 0) + quantidade
+
+    top = sorted(por_nome.items(), key=lambda item: -item[1])[:limite]
+
+    return total, top
+
+
+# =========================================================
+# DESEMPENHO POR BARBEIRO
+# =========================================================
+def desempenho_barbeiros(tenant_id, data_inicio, data_fim):
+    """
+    Uma linha por barbeiro com agendamentos no período:
+    concluídos, cancelados, total e faturamento.
+
+    Uma consulta agrupada: appointments + users (barbeiro)
+    + services + a soma das entradas de caixa de cada
+    agendamento (subconsulta agrupada por appointment_id,
+    para um agendamento com mais de um movimento não
+    duplicar as contagens). Concluído sem movimento no
+    caixa entra pelo preço do serviço.
+
+    Sem comissão: ela é aplicada depois (comissao_barbeiros),
+    então o percentual não entra na chave do cache.
+    """
+    do_periodo = db.select(Appointment.id).where(
+        Appointment.tenant_id == tenant_id,
+        Appointment.data_local.between(data_inicio, data_fim)
+    )
+
+    recebido = db.select(
+        CashMovement.appointment_id,
+        db.func.sum(CashMovement.valor).label("valor")
+    ).where(
+        CashMovement.tenant_id == tenant_id,
+        CashMovement.tipo == "ENTRADA",
+        CashMovement.categoria == "SERVICO",
+        CashMovement.appointment_id.in_(do_periodo)
+    ).group_by(
+        CashMovement.appointment_id
+    ).subquery()
+
+    concluido = Appointment.status == "CONCLUIDO"
+
+    rows = db.session.query(
+        User.id,
+        User.nome,
+        conta_se(concluido),
+        conta_se(Appointment.status == "CANCELADO"),
+        db.func.count(Appointment.id),
+        soma_se(
+            db.func.coalesce(recebido.c.valor, Service.preco, 0),
+            concluido
+        )
+    ).select_from(
+        Appointment
+    ).join(
+        User, User.id == Appointment.barber_id
+    ).outerjoin(
+        Service, Service.id == Appointment.service_id
+    ).outerjoin(
+        recebido, recebido.c.appointment_id == Appointment.id
+    ).filter(
+        Appointment.tenant_id == tenant_id,
+        Appointment.data_local.between(data_inicio, data_fim)
+    ).group_by(
+        User.id,
+        User.nome
+    ).all()
+
+    linhas = [
+        {
+            "barber_id": barber_id,
+            "nome": nome,
+            "concluidos": int(concluidos or 0),
+            "cancelados": int(cancelados or 0),
+            "total": int(total or 0),
+            "faturamento": Decimal(faturamento or 0),
+        }
+        for barber_id, nome, concluidos, cancelados, total, faturamento
+        in rows
+    ]
+
+    return sorted(linhas, key=lambda l: (-l["faturamento"], l["nome"]))
+
+
+def comissao_barbeiros(linhas, percentual):
+    """
+    Completa as linhas de desempenho_barbeiros com ticket
+    médio, taxa de cancelamento (%) e comissão
+    """
+    percentual = Decimal(percentual)
+    centavos = Decimal("0.01")
+
+    resultado = []
+    for linha in linhas:
+        concluidos = linha["concluidos"]
+        faturamento = Decimal(linha["faturamento"])
+
+        resultado.append({
+            **linha,
+            "ticket_medio": (
+                (faturamento / concluidos).quantize(centavos)
+                if concluidos else Decimal("0.00")
+            ),
+            "taxa_cancelamento": (
+                (Decimal(linha["cancelados"]) * 100 / linha["total"])
+                .quantize(Decimal("0.1"))
+                if linha["total"] else Decimal("0.0")
+            ),
+            "comissao": (faturamento * percentual / 100).quantize(centavos),
+        })
+
+    return resultado
+
+
+# =========================================================
+# SÉRIE TEMPORAL (GRÁFICO FATURAMENTO × DESPESAS × LUCRO)
+# =========================================================
+def serie_financeira(tenant_id, data_inicio, data_fim, granularidade):
+    """
+    Faturamento, despesas e lucro por dia / semana / mês,
+    com todos os períodos do intervalo (zeros incluídos).
+    Pronta para o gráfico: listas paralelas a "labels".
+    """
+    zero = (Decimal("0.00"), Decimal("0.00"))
+
+    if current_app.config.get("REPORTS_USE_ROLLUP", True):
+        linhas = _serie_consolidada(
+            tenant_id, data_inicio, data_fim, granularidade
+        )
+    else:
+        linhas = _serie_bruta(
+            tenant_id, data_inicio, data_fim, granularidade
+        )
+
+    serie = timebucket.preencher(
+        linhas, data_inicio, data_fim, granularidade, zero
+    )
+
+    return {
+        "bucket": granularidade,
+        "labels": [inicio.isoformat() for inicio, _ in serie],
+        "revenue": [float(f) for _, (f, d) in serie],
+        "expenses": [float(d) for _, (f, d) in serie],
+        "profit": [float(f - d) for _, (f, d) in serie],
+    }
+
+
+def _serie_consolidada(tenant_id, data_inicio, data_fim, granularidade):
+    periodo = timebucket.periodo(DailyFinancial.dia, granularidade)
+
+    rows = db.session.query(
+        periodo,
+        soma_se(
+            DailyFinancial.total,
+            DailyFinancial.tipo != TIPO_DESPESA,
+            DailyFinancial.categoria == "SERVICO"
+        ),
+        soma_se(DailyFinancial.total, DailyFinancial.tipo == TIPO_DESPESA)
+    ).filter(
+        DailyFinancial.tenant_id == tenant_id,
+        DailyFinancial.dia >= data_inicio,
+        DailyFinancial.dia <= data_fim
+    ).group_by(
+        periodo
+    ).all()
+
+    return [
+        (p, (Decimal(faturamento or 0), Decimal(despesas or 0)))
+        for p, faturamento, despesas in rows
+    ]
+
+
+def _serie_bruta(tenant_id, data_inicio, data_fim, granularidade):
+    periodo_mov = timebucket.periodo(CashMovement.data_local, granularidade)
+
+    faturamento = dict(
+        db.session.query(
+            periodo_mov,
+            db.func.sum(CashMovement.valor)
+        ).filter(
+            CashMovement.tenant_id == tenant_id,
+            CashMovement.categoria == "SERVICO",
+            CashMovement.data_local.between(data_inicio, data_fim)
+        ).group_by(
+            periodo_mov
+        ).all()
+    )
+
+    periodo_desp = timebucket.periodo(Expense.data, granularidade)
+
+    despesas = dict(
+        db.session.query(
+            periodo_desp,
+            db.func.sum(Expense.valor)
+        ).filter(
+            Expense.tenant_id == tenant_id,
+            Expense.data >= data_inicio,
+            Expense.data <= data_fim
+        ).group_by(
+            periodo_desp
+        ).all()
+    )
+
+    return [
+        (p, (Decimal(faturamento.get(p) or 0), Decimal(despesas.get(p) or 0)))
+        for p in set(faturamento) | set(despesas)
+    ]
@@ -1,18 +1,23 @@
 from flask import (
     Blueprint, render_template,
-    request, abort
+    request, abort, jsonify,
+    current_app, url_for, Response
 )
 from flask_login import login_required, current_user
-from sqlalchemy import func
-from datetime import date, datetime
-from decimal import Decimal
-
-from app.extensions import db
-from app.models.appointment import Appointment
-from app.models.service import Service
-from app.models.expense import Expense
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+
 from app.models.cash_session import CashSession
 from app.models.cash_movement import CashMovement
+from app.models.report_job import ReportJob, CONCLUIDO
+from app.tenant.report_queries import (
+    visao_geral, serie_financeira,
+    desempenho_barbeiros, comissao_barbeiros
+)
+from app.utils.report_cache import obter_ou_calcular
+from app.utils.report_jobs import solicitar
+from app.utils.dates import hoje_local
+from app.utils import timebucket
 
 
 # =========================================================
@@ -26,6 +31,10 @@ tenant_reports_bp = Blueprint(
 )
 
 
+# Pontos no gráfico (ex.: ~2,7 anos por dia)
+SERIE_MAXIMO_PERIODOS = 1000
+
+
 # =========================================================
 # RELATÓRIOS — VISÃO GERAL
 # =========================================================
@@ -41,120 +50,184 @@ def overview():
     # =====================================================
     # FILTRO DE PERÍODO
     # =====================================================
-    start = request.args.get("start")
-    end = request.args.get("end")
-
-    start_date = (
-        datetime.strptime(start, "%Y-%m-%d").date()
-        if start else date.today().replace(day=1)
-    )
-
-    end_date = (
-        datetime.strptime(end, "%Y-%m-%d").date()
-        if end else date.today()
-    )
+    start_date, end_date = _periodo_da_requisicao()
 
     # =====================================================
-    # FATURAMENTO — vem de CashMovement
-    # Apenas categoria SERVICO conta
+    # PERÍODO LONGO: calculado num job em segundo plano;
+    # a página acompanha o job e recarrega ao terminar
     # =====================================================
-    faturamento = db.session.query(
-        func.coalesce(func.sum(CashMovement.valor), 0)
-    ).filter(
-        CashMovement.tenant_id == tenant_id,
-        CashMovement.categoria == "SERVICO",
-        func.date(CashMovement.criado_em).between(start_date, end_date)
-    ).scalar()
+    periodo_longo = _periodo_longo(start_date, end_date)
 
-    faturamento = Decimal(faturamento or 0)
+    if periodo_longo:
+        job = _solicitar_overview(start_date, end_date)
 
-    # =====================================================
-    # DESPESAS
-    # =====================================================
-    despesas = db.session.query(
-        func.coalesce(func.sum(Expense.valor), 0)
-    ).filter(
-        Expense.tenant_id == tenant_id,
-        Expense.data.between(start_date, end_date)
-    ).scalar()
+        if job.status != CONCLUIDO:
+            return render_template(
+                "tenant_reports.html",
+                start_date=start_date,
+                end_date=end_date,
+                periodo_longo=periodo_longo,
+                job=job
+            )
 
-    despesas = Decimal(despesas or 0)
+        dados = job.payload
 
     # =====================================================
-    # LUCRO
+    # INDICADORES (cache por tenant + período)
     # =====================================================
-    lucro = faturamento - despesas
+    else:
+        dados = obter_ou_calcular(
+            tenant_id, "overview", start_date, end_date,
+            lambda: visao_geral(tenant_id, start_date, end_date)
+        )
 
-    # =====================================================
-    # AGENDAMENTOS / TICKET MÉDIO
-    # =====================================================
-    total_agendamentos = Appointment.query.filter(
-        Appointment.tenant_id == tenant_id,
-        Appointment.status == "CONCLUIDO",
-        Appointment.data_hora.between(start_date, end_date)
-    ).count()
-
-    ticket_medio = (
-        faturamento / total_agendamentos
-        if total_agendamentos > 0 else Decimal("0.00")
+    return render_template(
+        "tenant_reports.html",
+        start_date=start_date,
+        end_date=end_date,
+        periodo_longo=periodo_longo,
+        job=None,
+        **dados
     )
 
-    # =====================================================
-    # TOP SERVIÇOS
-    # =====================================================
-    top_services = db.session.query(
-        Service.nome,
-        func.count(Appointment.id)
-    ).join(
-        Appointment, Appointment.service_id == Service.id
-    ).filter(
-        Appointment.tenant_id == tenant_id,
-        Appointment.status == "CONCLUIDO",
-        Appointment.data_hora.between(start_date, end_date),
-        Service.excluido == False
-    ).group_by(
-        Service.nome
-    ).order_by(
-        func.count(Appointment.id).desc()
-    ).limit(5).all()
 
-    # =====================================================
-    # FLUXO DE CAIXA
-    # =====================================================
-    entradas = db.session.query(
-        func.coalesce(func.sum(CashMovement.valor), 0)
-    ).filter(
-        CashMovement.tenant_id == tenant_id,
-        CashMovement.tipo == "ENTRADA",
-        func.date(CashMovement.criado_em).between(start_date, end_date)
-    ).scalar()
-
-    saidas = db.session.query(
-        func.coalesce(func.sum(CashMovement.valor), 0)
-    ).filter(
-        CashMovement.tenant_id == tenant_id,
-        CashMovement.tipo == "SAIDA",
-        func.date(CashMovement.criado_em).between(start_date, end_date)
-    ).scalar()
-
-    entradas = Decimal(entradas or 0)
-    saidas = Decimal(saidas or 0)
-
-    saldo_caixa = entradas - saidas
+# =========================================================
+# DESEMPENHO E COMISSÃO POR BARBEIRO
+# =========================================================
+@tenant_reports_bp.route("/barbers", methods=["GET"])
+@login_required
+def barbers():
+    """
+    ?start=&end=&commission=<percentual>
+    """
+    if not current_user.is_tenant_admin():
+        abort(403)
+
+    tenant_id = current_user.tenant_id
+    start_date, end_date = _periodo_da_requisicao()
+
+    try:
+        percentual = Decimal(request.args.get(
+            "commission",
+            current_app.config.get("BARBER_COMMISSION_PERCENT", "40")
+        ))
+    except InvalidOperation:
+        abort(400)
+
+    # NaN / sNaN / Infinity passam pelo Decimal(); comparar
+    # NaN levanta InvalidOperation
+    if (not percentual.is_finite() or not (0 <= percentual <= 100)
+            or start_date > end_date):
+        abort(400)
+
+    # Cache guarda só o agrupamento; comissão é calculada
+    # por cima (mudar o percentual não refaz a consulta)
+    linhas = comissao_barbeiros(
+        obter_ou_calcular(
+            tenant_id, "barbers", start_date, end_date,
+            lambda: desempenho_barbeiros(tenant_id, start_date, end_date)
+        ),
+        percentual
+    )
+
+    totais = {
+        campo: sum(linha[campo] for linha in linhas)
+        for campo in ("concluidos", "cancelados", "total",
+                      "faturamento", "comissao")
+    }
 
     return render_template(
-        "tenant_reports.html",
+        "tenant_reports_barbers.html",
         start_date=start_date,
         end_date=end_date,
-        faturamento=faturamento,
-        despesas=despesas,
-        lucro=lucro,
-        ticket_medio=ticket_medio,
-        total_agendamentos=total_agendamentos,
-        top_services=top_services,
-        entradas=entradas,
-        saidas=saidas,
-        saldo_caixa=saldo_caixa
+        percentual=percentual,
+        linhas=linhas,
+        totais=totais
+    )
+
+
+# =========================================================
+# JOBS DE RELATÓRIO (PERÍODOS LONGOS)
+# =========================================================
+@tenant_reports_bp.route("/jobs", methods=["POST"])
+@login_required
+def submit_job():
+    """
+    Enfileira a visão geral do período (start / end) e
+    devolve o id na hora (202)
+    """
+    if not current_user.is_tenant_admin():
+        abort(403)
+
+    start_date, end_date = _periodo_da_requisicao()
+
+    if start_date > end_date:
+        abort(400)
+
+    job = _solicitar_overview(start_date, end_date)
+
+    return jsonify({
+        **job.para_dict(),
+        "url": url_for("tenant_reports.job_status", job_id=job.id)
+    }), 202
+
+
+@tenant_reports_bp.route("/jobs/<int:job_id>", methods=["GET"])
+@login_required
+def job_status(job_id):
+
+    return jsonify(_job_do_tenant(job_id).para_dict())
+
+
+@tenant_reports_bp.route("/jobs/<int:job_id>/download", methods=["GET"])
+@login_required
+def job_download(job_id):
+    """
+    Resultado guardado do job (JSON), para baixar de novo
+    """
+    job = _job_do_tenant(job_id)
+
+    if job.status != CONCLUIDO:
+        abort(409)
+
+    return Response(
+        job.resultado,
+        mimetype="application/json",
+        headers={
+            "Content-Disposition":
+                f"attachment; filename=relatorio_{job.tipo}_{job.id}.json"
+        }
+    )
+
+
+# =========================================================
+# SÉRIE PARA O GRÁFICO (JSON)
+# =========================================================
+@tenant_reports_bp.route("/series", methods=["GET"])
+@login_required
+def series():
+    """
+    Faturamento / despesas / lucro por período:
+    ?start=YYYY-MM-DD&end=YYYY-MM-DD&bucket=day|week|month
+    """
+    if not current_user.is_tenant_admin():
+        abort(403)
+
+    tenant_id = current_user.tenant_id
+    start_date, end_date = _periodo_da_requisicao()
+
+    bucket = request.args.get("bucket", timebucket.DIA)
+    if bucket not in timebucket.GRANULARIDADES or start_date > end_date:
+        abort(400)
+
+    if len(timebucket.periodos(start_date, end_date, bucket)) > SERIE_MAXIMO_PERIODOS:
+        abort(400)
+
+    return jsonify(
+        obter_ou_calcular(
+            tenant_id, f"series:{bucket}", start_date, end_date,
+            lambda: serie_financeira(tenant_id, start_date, end_date, bucket)
+        )
     )
 
 
@@ -192,14 +265,71 @@ def cash_detail(session_id):
     if session.tenant_id != current_user.tenant_id:
         abort(403)
 
-    movements = CashMovement.query.filter_by(
-        cash_session_id=session.id
-    ).order_by(
-        CashMovement.criado_em.asc()
-    ).all()
+    try:
+        movements, next_cursor = CashMovement.pagina_da_sessao(
+            session.id,
+            cursor=request.args.get("cursor")
+        )
+    except ValueError:
+        abort(400)
 
     return render_template(
         "reports/cash_detail.html",
         session=session,
-        movements=movements
+        movements=movements,
+        next_cursor=next_cursor
     )
+
+
+# =========================================================
+# HELPERS
+# =========================================================
+def _periodo_da_requisicao():
+    """
+    (start, end) da query string; padrão = mês atual até hoje
+    """
+    start = request.args.get("start")
+    end = request.args.get("end")
+    hoje = hoje_local(current_user.tenant_id)
+
+    try:
+        start_date = (
+            datetime.strptime(start, "%Y-%m-%d").date()
+            if start else hoje.replace(day=1)
+        )
+
+        end_date = (
+            datetime.strptime(end, "%Y-%m-%d").date()
+            if end else hoje
+        )
+    except ValueError:
+        abort(400)
+
+    return start_date, end_date
+
+
+def _periodo_longo(start_date, end_date):
+    return (end_date - start_date).days > current_app.config.get(
+        "REPORT_JOBS_MIN_DAYS", 92
+    )
+
+
+def _solicitar_overview(start_date, end_date):
+    return solicitar(
+        current_user.tenant_id,
+        current_user.id,
+        "tenant_overview",
+        {"start": start_date.isoformat(), "end": end_date.isoformat()}
+    )
+
+
+def _job_do_tenant(job_id):
+    if not current_user.is_tenant_admin():
+        abort(403)
+
+    job = ReportJob.query.get_or_404(job_id)
+
+    if job.tenant_id != current_user.tenant_id:
+        abort(404)
+
+    return job
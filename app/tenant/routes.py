@@ -5,7 +5,8 @@ from flask import (
 )
 from flask_login import login_required, current_user
 from werkzeug.utils import secure_filename
-from datetime import datetime, timedelta
+from werkzeug.datastructures import MultiDict
+from datetime import datetime
 import os
 
 from app.extensions import db
@@ -13,9 +14,22 @@ from app.models.user import User
 from app.models.service import Service
 from app.models.appointment import Appointment
 from app.models.available_slot import AvailableSlot
-from app.models.cash_session import CashSession
-from app.models.cash_movement import CashMovement
+from app.models.barber_schedule import BarberSchedule
+from app.models.schedule_exception import ScheduleException
 from app.models.tenant import Tenant
+from app.utils.tenant_cache import invalidate_tenant
+from app.utils.dates import hoje_local
+from app.tenant.services import (
+    concluir_agendamento,
+    concluir_agendamentos
+)
+from app.tenant.api_routes import (
+    pagina_agendamentos,
+    pagina_horarios,
+    pagina_servicos,
+    pagina_barbeiros,
+    resumo
+)
 
 # ============================
 # CLOUDINARY
@@ -35,6 +49,24 @@ tenant_bp = Blueprint(
 )
 
 
+# =========================================================
+# HELPERS
+# =========================================================
+
+def _intervalo_minutos(valor):
+    """
+    Intervalo da grade em minutos: inteiro > 0, ou None
+    se inválido (0 ou negativo faria a expansão da agenda
+    nunca terminar)
+    """
+    try:
+        intervalo = int(valor)
+    except (TypeError, ValueError):
+        return None
+
+    return intervalo if intervalo > 0 else None
+
+
 # =========================================================
 # DASHBOARD PRINCIPAL + AGENDA
 # =========================================================
@@ -48,60 +80,6 @@ def dashboard():
 
     tenant_id = current_user.tenant_id
 
-    # =====================================================
-    # FILTROS
-    # =====================================================
-    filtro_data = request.args.get("data")
-    filtro_status = request.args.get("status")
-    filtro_barbeiro = request.args.get("barber_id")
-
-    q_appointments = Appointment.query.filter_by(
-        tenant_id=tenant_id
-    )
-
-    if current_user.is_barber():
-        q_appointments = q_appointments.filter(
-            Appointment.barber_id == current_user.id
-        )
-
-    if filtro_data:
-        data = datetime.strptime(filtro_data, "%Y-%m-%d").date()
-        q_appointments = q_appointments.filter(
-            db.func.date(Appointment.data_hora) == data
-        )
-
-    if filtro_status:
-        q_appointments = q_appointments.filter(
-            Appointment.status == filtro_status
-        )
-
-    if filtro_barbeiro and current_user.is_tenant_admin():
-        q_appointments = q_appointments.filter(
-            Appointment.barber_id == int(filtro_barbeiro)
-        )
-
-    appointments = q_appointments.order_by(
-        Appointment.data_hora.asc()
-    ).all()
-
-    services = Service.query.filter_by(
-        tenant_id=tenant_id,
-        excluido=False
-    ).all()
-
-    barbers = User.query.filter_by(
-        tenant_id=tenant_id,
-        role="BARBER",
-        excluido=False
-    ).all()
-
-    slots = AvailableSlot.query.filter_by(
-        tenant_id=tenant_id
-    ).order_by(
-        AvailableSlot.data.asc(),
-        AvailableSlot.hora.asc()
-    ).all()
-
     # =====================================================
     # POST (Apenas ADMIN)
     # =====================================================
@@ -252,7 +230,11 @@ def dashboard():
         if action == "generate_slots":
             barber_id = int(request.form.get("barber_id"))
             weekdays = [int(d) for d in request.form.getlist("weekdays")]
-            intervalo = int(request.form.get("intervalo", 30))
+            intervalo = _intervalo_minutos(request.form.get("intervalo", 30))
+
+            if intervalo is None:
+                flash("Intervalo inválido", "danger")
+                return redirect(url_for("tenant.dashboard"))
 
             data_inicio = datetime.strptime(
                 request.form.get("data_inicio"), "%Y-%m-%d"
@@ -268,40 +250,194 @@ def dashboard():
                 request.form.get("hora_fim"), "%H:%M"
             ).time()
 
-            dia = data_inicio
-            while dia <= data_fim:
-                if dia.weekday() in weekdays:
-                    atual = datetime.combine(dia, hora_inicio)
-                    fim = datetime.combine(dia, hora_fim)
-
-                    while atual < fim:
-                        if not AvailableSlot.query.filter_by(
-                            tenant_id=tenant_id,
-                            barber_id=barber_id,
-                            data=dia,
-                            hora=atual.time()
-                        ).first():
-                            db.session.add(
-                                AvailableSlot(
-                                    tenant_id=tenant_id,
-                                    barber_id=barber_id,
-                                    data=dia,
-                                    hora=atual.time()
-                                )
-                            )
-                        atual += timedelta(minutes=intervalo)
-                dia += timedelta(days=1)
+            criados, ignorados = AvailableSlot.inserir_em_lote(
+                tenant_id=tenant_id,
+                barber_id=barber_id,
+                horarios=AvailableSlot.candidatos(
+                    data_inicio, data_fim, weekdays,
+                    hora_inicio, hora_fim, intervalo
+                )
+            )
+
+            db.session.commit()
+            flash(
+                f"Horários gerados: {criados} criados, "
+                f"{ignorados} já existiam",
+                "success"
+            )
+            return redirect(url_for("tenant.dashboard"))
+
+        # -----------------------------
+        # REGRA DE AGENDA (HORÁRIOS VIRTUAIS)
+        # -----------------------------
+        if action == "create_schedule":
+            barber = User.query.filter_by(
+                id=request.form.get("barber_id", type=int),
+                tenant_id=tenant_id,
+                role="BARBER",
+                excluido=False
+            ).first()
+
+            if not barber:
+                flash("Barbeiro inválido", "danger")
+                return redirect(url_for("tenant.dashboard"))
+
+            weekdays = [int(d) for d in request.form.getlist("weekdays")]
+
+            hora_inicio = datetime.strptime(
+                request.form.get("hora_inicio"), "%H:%M"
+            ).time()
+            hora_fim = datetime.strptime(
+                request.form.get("hora_fim"), "%H:%M"
+            ).time()
+
+            valido_de = datetime.strptime(
+                request.form.get("valido_de"), "%Y-%m-%d"
+            ).date()
+            valido_ate = (
+                datetime.strptime(
+                    request.form.get("valido_ate"), "%Y-%m-%d"
+                ).date()
+                if request.form.get("valido_ate") else None
+            )
+
+            intervalo = _intervalo_minutos(request.form.get("intervalo", 30))
+
+            if not weekdays or hora_inicio >= hora_fim or intervalo is None:
+                flash("Regra de agenda inválida", "danger")
+                return redirect(url_for("tenant.dashboard"))
+
+            for dia in weekdays:
+                db.session.add(
+                    BarberSchedule(
+                        tenant_id=tenant_id,
+                        barber_id=barber.id,
+                        dia_semana=dia,
+                        hora_inicio=hora_inicio,
+                        hora_fim=hora_fim,
+                        intervalo_min=intervalo,
+                        valido_de=valido_de,
+                        valido_ate=valido_ate
+                    )
+                )
+
+            db.session.commit()
+            flash("Regra de agenda cadastrada", "success")
+            return redirect(url_for("tenant.dashboard"))
+
+        if action == "delete_schedule":
+            schedule = BarberSchedule.query.get_or_404(
+                request.form.get("schedule_id")
+            )
+
+            if schedule.tenant_id != tenant_id:
+                abort(403)
+
+            db.session.delete(schedule)
+            db.session.commit()
+            flash("Regra de agenda removida", "success")
+            return redirect(url_for("tenant.dashboard"))
+
+        # -----------------------------
+        # BLOQUEIOS / FECHAMENTOS
+        # -----------------------------
+        if action == "create_exception":
+            barber_id = request.form.get("barber_id", type=int)
+
+            if barber_id and not User.query.filter_by(
+                id=barber_id,
+                tenant_id=tenant_id,
+                role="BARBER"
+            ).first():
+                flash("Barbeiro inválido", "danger")
+                return redirect(url_for("tenant.dashboard"))
+
+            hora_inicio = request.form.get("hora_inicio")
+            hora_fim = request.form.get("hora_fim")
+
+            db.session.add(
+                ScheduleException(
+                    tenant_id=tenant_id,
+                    barber_id=barber_id,
+                    data=datetime.strptime(
+                        request.form.get("data"), "%Y-%m-%d"
+                    ).date(),
+                    hora_inicio=(
+                        datetime.strptime(hora_inicio, "%H:%M").time()
+                        if hora_inicio and hora_fim else None
+                    ),
+                    hora_fim=(
+                        datetime.strptime(hora_fim, "%H:%M").time()
+                        if hora_inicio and hora_fim else None
+                    ),
+                    tipo="BLOQUEIO" if barber_id else "FECHAMENTO",
+                    motivo=request.form.get("motivo")
+                )
+            )
+
+            db.session.commit()
+            flash("Bloqueio cadastrado", "success")
+            return redirect(url_for("tenant.dashboard"))
+
+        if action == "delete_exception":
+            exception = ScheduleException.query.get_or_404(
+                request.form.get("exception_id")
+            )
 
+            if exception.tenant_id != tenant_id:
+                abort(403)
+
+            db.session.delete(exception)
             db.session.commit()
-            flash("Horários gerados", "success")
+            flash("Bloqueio removido", "success")
             return redirect(url_for("tenant.dashboard"))
 
+    # =====================================================
+    # GET — TOTAIS + PRIMEIRA PÁGINA DE CADA PAINEL
+    # =====================================================
+    # As páginas seguintes vêm de /dashboard/api/*
+    paginas = {
+        "appointments": pagina_agendamentos(request.args),
+        "slots": pagina_horarios(MultiDict()),
+        "services": pagina_servicos(MultiDict()),
+        "barbers": pagina_barbeiros(MultiDict()),
+    }
+
+    # Só id/nome: alimenta selects e nomes nas tabelas
+    barbers = db.session.query(
+        User.id,
+        User.nome
+    ).filter_by(
+        tenant_id=tenant_id,
+        role="BARBER",
+        excluido=False
+    ).order_by(
+        User.nome.asc()
+    ).all()
+
+    schedules = BarberSchedule.query.filter_by(
+        tenant_id=tenant_id,
+        ativo=True
+    ).order_by(
+        BarberSchedule.barber_id.asc(),
+        BarberSchedule.dia_semana.asc(),
+        BarberSchedule.hora_inicio.asc()
+    ).all()
+
+    exceptions = ScheduleException.query.filter(
+        ScheduleException.tenant_id == tenant_id,
+        ScheduleException.data >= hoje_local(tenant_id)
+    ).order_by(
+        ScheduleException.data.asc()
+    ).all()
+
     return render_template(
         "tenant_dashboard.html",
-        services=services,
+        resumo=resumo(request.args),
+        paginas=paginas,
         barbers=barbers,
-        appointments=appointments,
-        slots=slots
+        schedules=schedules,
+        exceptions=exceptions
     )
 
 
@@ -313,31 +449,55 @@ def dashboard():
 @login_required
 def complete_appointment(appointment_id):
 
-    appointment = Appointment.query.get_or_404(appointment_id)
+    tenant_id = db.session.query(
+        Appointment.tenant_id
+    ).filter_by(
+        id=appointment_id
+    ).scalar()
 
-    if appointment.tenant_id != current_user.tenant_id:
-        abort(403)
+    if tenant_id is None:
+        abort(404)
 
-    appointment.concluir()
-    service = Service.query.get(appointment.service_id)
+    if tenant_id != current_user.tenant_id:
+        abort(403)
 
-    cash_session = CashSession.get_or_create_aberta(
+    concluido = concluir_agendamento(
         tenant_id=current_user.tenant_id,
-        usuario_id=current_user.id
+        usuario_id=current_user.id,
+        appointment_id=appointment_id
     )
 
-    CashMovement.registrar_entrada(
+    if concluido:
+        flash("Serviço concluído", "success")
+    else:
+        flash("Este agendamento já foi concluído ou cancelado", "warning")
+
+    return redirect(url_for("tenant.dashboard"))
+
+
+@tenant_bp.route("/appointments/complete", methods=["POST"])
+@login_required
+def complete_appointments():
+    """
+    Conclui os agendamentos selecionados em UMA transação
+    """
+
+    if not (current_user.is_tenant_admin() or current_user.is_barber()):
+        abort(403)
+
+    ids = request.form.getlist("appointment_ids", type=int)
+
+    if not ids:
+        flash("Selecione ao menos um agendamento", "warning")
+        return redirect(url_for("tenant.dashboard"))
+
+    concluidos = concluir_agendamentos(
         tenant_id=current_user.tenant_id,
-        cash_session=cash_session,
         usuario_id=current_user.id,
-        valor=service.preco,
-        categoria="SERVICO",
-        descricao=f"Serviço: {service.nome}",
-        appointment_id=appointment.id
+        appointment_ids=ids
     )
 
-    db.session.commit()
-    flash("Serviço concluído", "success")
+    flash(f"{len(concluidos)} serviço(s) concluído(s)", "success")
     return redirect(url_for("tenant.dashboard"))
 
 
@@ -427,6 +587,8 @@ def company_settings():
         tenant.atualizado_em = datetime.utcnow()
 
         db.session.commit()
+        invalidate_tenant(tenant)
+
         flash("Dados da empresa atualizados com sucesso!", "success")
         return redirect(url_for("tenant.company_settings"))
 
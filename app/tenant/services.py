@@ -0,0 +1,86 @@
+from sqlalchemy.orm import joinedload
+
+from app.extensions import db
+from app.models.service import Service
+from app.models.appointment import Appointment
+from app.models.cash_session import CashSession
+from app.models.cash_movement import CashMovement
+
+
+# =========================================================
+# AGENDAMENTOS — CONCLUSÃO
+# =========================================================
+# Concluir um agendamento mexe em três tabelas:
+#   appointments (status) + cash_movements (entrada)
+#   + cash_sessions (totais)
+# Tudo numa única transação: ou entra tudo, ou nada.
+# =========================================================
+
+def concluir_agendamentos(tenant_id, usuario_id, appointment_ids):
+    """
+    Conclui os agendamentos AGENDADO da lista, lança a
+    entrada de cada serviço no caixa aberto (abrindo um se
+    preciso) e faz UM commit.
+
+    Ids de outro tenant ou já concluídos/cancelados são
+    ignorados. Retorna os agendamentos concluídos.
+    """
+    if not appointment_ids:
+        return []
+
+    # Trava as linhas (Postgres) para duas conclusões
+    # simultâneas não lançarem a mesma entrada duas vezes
+    agendamentos = Appointment.query.options(
+        joinedload(Appointment.service, innerjoin=True)
+        .lazyload(Service.barber)
+    ).filter(
+        Appointment.tenant_id == tenant_id,
+        Appointment.id.in_(appointment_ids),
+        Appointment.status == "AGENDADO"
+    ).order_by(
+        Appointment.data_hora.asc()
+    ).with_for_update(
+        of=Appointment
+    ).all()
+
+    if not agendamentos:
+        db.session.rollback()
+        return []
+
+    try:
+        cash_session = CashSession.get_or_create_aberta(
+            tenant_id=tenant_id,
+            usuario_id=usuario_id
+        )
+
+        for appointment in agendamentos:
+            appointment.concluir()
+
+            CashMovement.registrar_entrada(
+                tenant_id=tenant_id,
+                cash_session=cash_session,
+                usuario_id=usuario_id,
+                valor=appointment.service.preco,
+                categoria="SERVICO",
+                descricao=f"Serviço: {appointment.service.nome}",
+                appointment_id=appointment.id
+            )
+
+        db.session.commit()
+
+    except Exception:
+        db.session.rollback()
+        raise
+
+    return agendamentos
+
+
+def concluir_agendamento(tenant_id, usuario_id, appointment_id):
+    """
+    Atalho para um único agendamento.
+    Retorna o agendamento concluído ou None.
+    """
+    concluidos = concluir_agendamentos(
+        tenant_id, usuario_id, [appointment_id]
+    )
+    return concluidos[0] if concluidos else None
@@ -0,0 +1,81 @@
+import threading
+import time
+from collections import OrderedDict
+
+# =========================================================
+# CACHE LRU EM MEMÓRIA (POR PROCESSO)
+# =========================================================
+# Cache simples, thread-safe, com:
+# - limite de itens (descarta o menos usado)
+# - TTL opcional por item (None = não expira)
+# - contadores de acerto / erro
+#
+# Cada worker do gunicorn tem o seu; por isso todo uso
+# deve ter TTL curto ou invalidação explícita.
+# =========================================================
+
+_AUSENTE = object()
+
+
+class LRUCache:
+
+    def __init__(self, maxsize=1024, ttl=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+
+        self._itens = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+    # =====================================================
+    # LEITURA / ESCRITA
+    # =====================================================
+    def get(self, key, default=None):
+        with self._lock:
+            item = self._itens.get(key, _AUSENTE)
+
+            if item is not _AUSENTE:
+                valor, expira_em = item
+
+                if expira_em is None or expira_em > time.monotonic():
+                    self._itens.move_to_end(key)
+                    self.hits += 1
+                    return valor
+
+                del self._itens[key]
+
+            self.misses += 1
+            return default
+
+    def set(self, key, value, ttl=_AUSENTE):
+        ttl = self.ttl if ttl is _AUSENTE else ttl
+        expira_em = time.monotonic() + ttl if ttl is not None else None
+
+        with self._lock:
+            self._itens[key] = (value, expira_em)
+            self._itens.move_to_end(key)
+
+            while len(self._itens) > self.maxsize:
+                self._itens.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._itens.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._itens.clear()
+
+    # =====================================================
+    # MÉTRICAS
+    # =====================================================
+    def stats(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._itens),
+                "maxsize": self.maxsize,
+            }
@@ -0,0 +1,87 @@
+from datetime import datetime, date, time, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+# =========================================================
+# INTERVALOS DE DATA (FILTROS "SARGABLE")
+# =========================================================
+# Filtros como func.date(coluna) == dia impedem o uso de
+# índices. Os helpers abaixo convertem dias em intervalos
+# semiabertos [inicio, fim) sobre a própria coluna DateTime.
+# =========================================================
+
+
+def intervalo_dia(dia: date):
+    """
+    Intervalo [00:00 do dia, 00:00 do dia seguinte)
+    """
+    inicio = datetime.combine(dia, time.min)
+    return inicio, inicio + timedelta(days=1)
+
+
+def intervalo_periodo(data_inicio: date, data_fim: date):
+    """
+    Intervalo semiaberto cobrindo os dias data_inicio..data_fim
+    (inclusive).
+    """
+    inicio = datetime.combine(data_inicio, time.min)
+    fim = datetime.combine(data_fim, time.min) + timedelta(days=1)
+    return inicio, fim
+
+
+def filtro_periodo(coluna, data_inicio: date, data_fim: date):
+    """
+    Condições SQLAlchemy para coluna DateTime dentro do período
+    (dias inclusivos), sem aplicar função sobre a coluna.
+    """
+    inicio, fim = intervalo_periodo(data_inicio, data_fim)
+    return coluna >= inicio, coluna < fim
+
+
+# =========================================================
+# DIA LOCAL
+# =========================================================
+# Os timestamps são gravados em UTC "ingênuo"
+# (datetime.utcnow). Para agrupar por dia, convertemos
+# para o fuso da barbearia antes de pegar a data.
+# =========================================================
+
+
+def fuso_padrao() -> str:
+    from flask import current_app
+    return current_app.config.get("TIMEZONE", "UTC")
+
+
+def data_local(momento_utc: datetime, fuso: str = None) -> date:
+    """
+    Data local (no fuso informado ou no TIMEZONE da config)
+    de um datetime UTC sem tzinfo.
+    """
+    return momento_utc.replace(
+        tzinfo=timezone.utc
+    ).astimezone(
+        ZoneInfo(fuso or fuso_padrao())
+    ).date()
+
+
+def agora_local(tenant_id=None) -> datetime:
+    """
+    Data e hora atuais no fuso do tenant (ou no TIMEZONE da
+    app), sem tzinfo: comparável com a agenda (data + hora
+    locais da barbearia)
+    """
+    from app.utils.tenant_cache import fuso_do_tenant
+
+    fuso = fuso_do_tenant(tenant_id) if tenant_id else None
+
+    return datetime.utcnow().replace(
+        tzinfo=timezone.utc
+    ).astimezone(
+        ZoneInfo(fuso or fuso_padrao())
+    ).replace(tzinfo=None)
+
+
+def hoje_local(tenant_id=None) -> date:
+    """
+    Data de hoje no fuso do tenant (ou no TIMEZONE da app)
+    """
+    return agora_local(tenant_id).date()
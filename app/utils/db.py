@@ -0,0 +1,161 @@
+from sqlalchemy import insert, update, select, func, case
+from sqlalchemy.dialects import postgresql, sqlite
+
+from app.extensions import db
+
+# =========================================================
+# HELPERS DE SQL PORTÁVEL (POSTGRES / SQLITE)
+# =========================================================
+
+
+def dialeto() -> str:
+    """
+    Nome do dialeto do banco conectado (postgresql, sqlite...)
+    """
+    return db.session.get_bind().dialect.name
+
+
+def insert_ignore(tabela):
+    """
+    INSERT que ignora linhas que violariam uma constraint única:
+    - Postgres: INSERT ... ON CONFLICT DO NOTHING
+    - SQLite:   INSERT OR IGNORE
+    - Outros:   INSERT comum
+    """
+    nome = dialeto()
+
+    if nome == "postgresql":
+        return postgresql.insert(tabela).on_conflict_do_nothing()
+
+    if nome == "sqlite":
+        return sqlite.insert(tabela).prefix_with("OR IGNORE")
+
+    return insert(tabela)
+
+
+def em_lotes(itens, tamanho):
+    """
+    Divide um iterável em listas de até `tamanho` itens
+    """
+    lote = []
+
+    for item in itens:
+        lote.append(item)
+        if len(lote) >= tamanho:
+            yield lote
+            lote = []
+
+    if lote:
+        yield lote
+
+
+def incrementar(modelo, pk, **deltas):
+    """
+    Soma valores a colunas direto no banco, sem ler antes:
+
+        UPDATE t SET col = col + :v WHERE id = :pk RETURNING col
+
+    Atualizações concorrentes na mesma linha se serializam
+    no banco e nenhuma se perde. Retorna a linha com os
+    valores novos (None se a linha não existe).
+    Não faz commit.
+    """
+    colunas = [getattr(modelo, nome) for nome in deltas]
+
+    stmt = update(modelo).where(
+        modelo.id == pk
+    ).values({
+        coluna: coluna + valor
+        for coluna, valor in zip(colunas, deltas.values())
+    }).execution_options(
+        synchronize_session=False
+    )
+
+    if db.session.get_bind().dialect.update_returning:
+        return db.session.execute(stmt.returning(*colunas)).first()
+
+    # Sem RETURNING: relê na mesma transação
+    db.session.execute(stmt)
+    return db.session.execute(
+        select(*colunas).where(modelo.id == pk)
+    ).first()
+
+
+def somar_ou_inserir(modelo, chave, **deltas):
+    """
+    Upsert acumulativo numa tabela de totais:
+
+        INSERT (chave..., deltas...)
+        ON CONFLICT (chave...) DO UPDATE SET col = col + excluded.col
+
+    `chave` são as colunas da constraint única (dict).
+    Uma única instrução no Postgres e no SQLite; em outros
+    bancos, UPDATE e, se nada mudou, INSERT.
+    Não faz commit.
+    """
+    nome = dialeto()
+    tabela = modelo.__table__
+
+    if nome in ("postgresql", "sqlite"):
+        dialect_insert = (
+            postgresql.insert if nome == "postgresql" else sqlite.insert
+        )
+        stmt = dialect_insert(tabela).values(**chave, **deltas)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=list(chave),
+            set_={
+                coluna: tabela.c[coluna] + stmt.excluded[coluna]
+                for coluna in deltas
+            }
+        )
+        db.session.execute(stmt)
+        return
+
+    result = db.session.execute(
+        update(tabela).where(*[
+            tabela.c[coluna] == valor for coluna, valor in chave.items()
+        ]).values({
+            coluna: tabela.c[coluna] + valor
+            for coluna, valor in deltas.items()
+        })
+    )
+
+    if result.rowcount == 0:
+        db.session.execute(insert(tabela).values(**chave, **deltas))
+
+
+# =========================================================
+# AGREGAÇÃO CONDICIONAL
+# =========================================================
+# Várias somas/contagens com filtros diferentes numa única
+# passada pela tabela:
+#   Postgres: SUM(x) FILTER (WHERE cond)
+#   Outros:   SUM(CASE WHEN cond THEN x END)
+# =========================================================
+
+
+def soma_se(coluna, *condicoes):
+    """
+    SUM(coluna) só das linhas que atendem às condições
+    (0 quando nenhuma atende)
+    """
+    condicao = db.and_(*condicoes)
+
+    if dialeto() == "postgresql":
+        soma = func.sum(coluna).filter(condicao)
+    else:
+        soma = func.sum(case((condicao, coluna)))
+
+    return func.coalesce(soma, 0)
+
+
+def conta_se(*condicoes):
+    """
+    COUNT(*) só das linhas que atendem às condições
+    """
+    condicao = db.and_(*condicoes)
+
+    if dialeto() == "postgresql":
+        return func.count().filter(condicao)
+
+    return func.coalesce(func.sum(case((condicao, 1), else_=0)), 0)
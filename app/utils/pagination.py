@@ -0,0 +1,108 @@
+import base64
+import json
+from datetime import date, datetime, time
+from decimal import Decimal
+
+from sqlalchemy import tuple_
+
+# =========================================================
+# PAGINAÇÃO POR KEYSET (SEM OFFSET)
+# =========================================================
+# A página seguinte começa depois da última chave vista:
+#
+#   WHERE (col1, col2, id) > (:v1, :v2, :id)
+#   ORDER BY col1, col2, id
+#   LIMIT :n + 1
+#
+# Custo constante por página, usando o índice da ordenação.
+# Em ordem decrescente a comparação vira "<" (mais recentes
+# primeiro; o índice é percorrido de trás para frente).
+# O cursor é opaco para o front (base64 de JSON tipado).
+# =========================================================
+
+PAGINA_PADRAO = 50
+PAGINA_MAXIMA = 200
+
+
+def limite_pagina(valor, padrao=PAGINA_PADRAO, maximo=PAGINA_MAXIMA):
+    """
+    Normaliza o "limit" vindo da query string
+    """
+    if not valor:
+        return padrao
+    return max(1, min(int(valor), maximo))
+
+
+def paginar(query, chaves, chave_de, cursor=None, limite=PAGINA_PADRAO,
+            decrescente=False):
+    """
+    Aplica keyset e retorna (itens, next_cursor).
+
+    - chaves: colunas da ordenação (a última deve ser única)
+    - chave_de: função item → tupla com os valores das chaves
+    - cursor: "next_cursor" da página anterior
+    - decrescente: todas as chaves em ordem DESC
+    """
+    if cursor:
+        anterior = tuple_(*decodificar_cursor(cursor))
+        query = query.filter(
+            tuple_(*chaves) < anterior if decrescente
+            else tuple_(*chaves) > anterior
+        )
+
+    itens = query.order_by(
+        *[c.desc() if decrescente else c.asc() for c in chaves]
+    ).limit(limite + 1).all()
+
+    next_cursor = None
+    if len(itens) > limite:
+        itens = itens[:limite]
+        next_cursor = codificar_cursor(chave_de(itens[-1]))
+
+    return itens, next_cursor
+
+
+# =========================================================
+# CURSOR
+# =========================================================
+def codificar_cursor(valores):
+    bruto = json.dumps([_serializar(v) for v in valores])
+    return base64.urlsafe_b64encode(bruto.encode()).decode()
+
+
+def decodificar_cursor(cursor):
+    """
+    Levanta ValueError se o cursor for inválido
+    """
+    try:
+        bruto = base64.urlsafe_b64decode(cursor.encode()).decode()
+        return [_desserializar(v) for v in json.loads(bruto)]
+    except (TypeError, KeyError, json.JSONDecodeError, UnicodeDecodeError) as e:
+        raise ValueError("cursor inválido") from e
+
+
+def _serializar(valor):
+    # datetime antes de date (datetime é subclasse de date)
+    if isinstance(valor, datetime):
+        return ["dt", valor.isoformat()]
+    if isinstance(valor, date):
+        return ["d", valor.isoformat()]
+    if isinstance(valor, time):
+        return ["t", valor.isoformat()]
+    if isinstance(valor, Decimal):
+        return ["n", str(valor)]
+    return ["v", valor]
+
+
+_TIPOS = {
+    "dt": datetime.fromisoformat,
+    "d": date.fromisoformat,
+    "t": time.fromisoformat,
+    "n": Decimal,
+    "v": lambda v: v,
+}
+
+
+def _desserializar(par):
+    tipo, valor = par
+    return _TIPOS[tipo](valor)
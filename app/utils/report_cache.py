@@ -0,0 +1,246 @@
+import pickle
+import threading
+
+from flask import current_app
+
+from app.utils.cache import LRUCache
+
+# =========================================================
+# CACHE DE RELATÓRIOS (TENANT + PERÍODO + TIPO)
+# =========================================================
+# Chave: relatorio:<tenant>:<tipo>:<inicio>:<fim>:<escopo><versão>
+#
+# A versão é um contador por tenant, incrementado após o
+# commit de qualquer escrita em CashMovement, Expense ou
+# Appointment (ver registrar_eventos). Chaves de versões
+# antigas nunca mais são lidas e saem por LRU / TTL.
+#
+# - Período que inclui hoje: versão "atual" + TTL curto
+# - Período fechado (fim < hoje): versão "historico". Só
+#   muda com escrita retroativa (data no passado,
+#   reconstrução do consolidado).
+#
+# Backend plugável: LRU em memória (padrão, por processo)
+# ou Redis compartilhado (REPORT_CACHE_URL=redis://...).
+#
+# Em memória, a versão só sobe no processo que fez a
+# escrita (outro worker do gunicorn, `flask
+# rebuild-daily-financials`): os demais só enxergam a
+# mudança quando a entrada expira. Por isso o histórico
+# fica sem TTL apenas no Redis, onde a versão é
+# compartilhada; em memória usa REPORT_CACHE_HISTORY_TTL.
+# =========================================================
+
+ATUAL = "atual"
+HISTORICO = "historico"
+
+_backend = None
+_eventos_registrados = False
+
+
+# =========================================================
+# BACKENDS
+# =========================================================
+class MemoriaBackend:
+    """
+    LRU por processo. As versões ficam fora do LRU: se uma
+    versão fosse descartada e voltasse a 0, entradas antigas
+    com "v0" seriam servidas de novo.
+    """
+
+    # Versões valem só neste processo
+    compartilhado = False
+
+    def __init__(self, maxsize):
+        self._itens = LRUCache(maxsize=maxsize)
+        self._versoes = {}
+        self._lock = threading.Lock()
+
+    def get(self, chave):
+        return self._itens.get(chave)
+
+    def set(self, chave, valor, ttl=None):
+        self._itens.set(chave, valor, ttl=ttl)
+
+    def versao(self, chave):
+        return self._versoes.get(chave, 0)
+
+    def incrementar(self, chave):
+        with self._lock:
+            self._versoes[chave] = self._versoes.get(chave, 0) + 1
+
+
+class RedisBackend:
+    """
+    Store compartilhado entre workers. Valores em pickle;
+    versões com INCR (atômico).
+    """
+
+    # Versões vistas por todos os workers / processos
+    compartilhado = True
+
+    def __init__(self, url):
+        import redis
+
+        self._redis = redis.Redis.from_url(url)
+
+    def get(self, chave):
+        bruto = self._redis.get(chave)
+        return pickle.loads(bruto) if bruto is not None else None
+
+    def set(self, chave, valor, ttl=None):
+        self._redis.set(chave, pickle.dumps(valor), ex=ttl)
+
+    def versao(self, chave):
+        return int(self._redis.get(chave) or 0)
+
+    def incrementar(self, chave):
+        self._redis.incr(chave)
+
+
+def _get_backend():
+    global _backend
+
+    if _backend is None:
+        url = current_app.config.get("REPORT_CACHE_URL")
+
+        if url and url.startswith("redis"):
+            try:
+                _backend = RedisBackend(url)
+            except ImportError:
+                print("⚠️ REPORT_CACHE_URL definido mas o pacote redis "
+                      "não está instalado — usando cache em memória")
+
+        if _backend is None:
+            _backend = MemoriaBackend(
+                maxsize=current_app.config.get("REPORT_CACHE_SIZE", 1024)
+            )
+
+    return _backend
+
+
+# =========================================================
+# API
+# =========================================================
+def obter_ou_calcular(tenant_id, tipo, data_inicio, data_fim, calcular):
+    """
+    Payload do relatório do cache, ou calcular() guardado
+    no cache. calcular não recebe argumentos.
+    """
+    from app.utils.dates import hoje_local
+
+    backend = _get_backend()
+
+    fechado = data_fim < hoje_local(tenant_id)
+    escopo = HISTORICO if fechado else ATUAL
+
+    versao = backend.versao(_chave_versao(tenant_id, escopo))
+    chave = (
+        f"relatorio:{tenant_id}:{tipo}:"
+        f"{data_inicio.isoformat()}:{data_fim.isoformat()}:"
+        f"{escopo}{versao}"
+    )
+
+    payload = backend.get(chave)
+
+    if payload is None:
+        payload = calcular()
+        backend.set(chave, payload, ttl=_ttl(backend, fechado))
+
+    return payload
+
+
+def _ttl(backend, fechado):
+    """
+    Período aberto: TTL curto. Fechado: sem TTL só com
+    versões compartilhadas (Redis); em memória, TTL finito
+    para invalidações de outros processos chegarem aqui.
+    """
+    if not fechado:
+        return current_app.config.get("REPORT_CACHE_TTL", 300)
+
+    if backend.compartilhado:
+        return None
+
+    return current_app.config.get("REPORT_CACHE_HISTORY_TTL", 3600)
+
+
+def invalidar_tenant(tenant_id, retroativo=False):
+    """
+    Invalida os relatórios do tenant que incluem hoje; com
+    retroativo=True, também os de períodos fechados.
+    Chamar APÓS o commit.
+    """
+    backend = _get_backend()
+
+    backend.incrementar(_chave_versao(tenant_id, ATUAL))
+    if retroativo:
+        backend.incrementar(_chave_versao(tenant_id, HISTORICO))
+
+
+def marcar_alteracao(session, tenant_id, retroativo=False):
+    """
+    Registra na sessão do SQLAlchemy que o tenant teve
+    escrita; a invalidação acontece no commit. Para escritas
+    em lote (Core) que não passam pelo flush do ORM.
+    """
+    alterados = session.info.setdefault("relatorios_alterados", {})
+    alterados[tenant_id] = alterados.get(tenant_id, False) or retroativo
+
+
+def _chave_versao(tenant_id, escopo):
+    return f"relatorio:versao:{escopo}:{tenant_id}"
+
+
+# =========================================================
+# EVENTOS DA SESSÃO
+# =========================================================
+def registrar_eventos(sessao):
+    """
+    Liga a invalidação às escritas do ORM:
+    - after_flush: anota os tenants de CashMovement,
+      Expense e Appointment novos/alterados/removidos
+    - after_commit: incrementa as versões
+    - after_rollback: descarta as anotações
+
+    Idempotente (create_app pode rodar mais de uma vez).
+    """
+    global _eventos_registrados
+
+    if _eventos_registrados:
+        return
+    _eventos_registrados = True
+
+    from sqlalchemy import event
+    from app.models.appointment import Appointment
+    from app.models.cash_movement import CashMovement
+    from app.models.expense import Expense
+    from app.utils.dates import hoje_local
+
+    modelos = (Appointment, CashMovement, Expense)
+
+    def _retroativo(obj):
+        hoje = hoje_local(obj.tenant_id)
+
+        if isinstance(obj, Expense) and obj.data:
+            return obj.data < hoje
+        if isinstance(obj, Appointment) and obj.data_local:
+            return obj.data_local < hoje
+        return False
+
+    @event.listens_for(sessao, "after_flush")
+    def _anotar(session, flush_context):
+        for obj in (*session.new, *session.dirty, *session.deleted):
+            if isinstance(obj, modelos) and obj.tenant_id:
+                marcar_alteracao(session, obj.tenant_id, _retroativo(obj))
+
+    @event.listens_for(sessao, "after_commit")
+    def _invalidar(session):
+        alterados = session.info.pop("relatorios_alterados", None)
+
+        for tenant_id, retroativo in (alterados or {}).items():
+            invalidar_tenant(tenant_id, retroativo=retroativo)
+
+    @event.listens_for(sessao, "after_rollback")
+    def _descartar(session):
+        session.info.pop("relatorios_alterados", None)
@@ -0,0 +1,199 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+from flask import current_app
+
+from app.extensions import db
+from app.models.report_job import ReportJob
+
+# =========================================================
+# JOBS DE RELATÓRIO (EXECUÇÃO)
+# =========================================================
+# TIPOS: nome do job → função(tenant_id, parametros) que
+# devolve o payload (só tipos simples / Decimal / date).
+#
+# Dois modos (REPORT_JOBS_EXECUTOR):
+# - "thread" (padrão): o processo web executa o job num
+#   pool de REPORT_JOBS_WORKERS threads logo após o commit
+# - "worker": só enfileira; `flask report-worker` (processo
+#   separado, um ou vários) consome a fila do banco
+#
+# Nos dois casos a reserva passa por ReportJob.reservar,
+# então um job nunca roda em dois lugares ao mesmo tempo, e
+# o worker separado também recupera jobs de threads que
+# morreram com o processo (deploy, restart).
+#
+# Jobs finalizados há mais de REPORT_JOBS_RETENTION_DAYS
+# são removidos no máximo uma vez por hora por processo:
+# pelo loop do worker ou, no modo "thread", ao fim de um job.
+# =========================================================
+
+# Intervalo mínimo entre limpezas de jobs antigos (segundos)
+LIMPEZA_INTERVALO = 3600
+
+_executor = None
+_executor_lock = threading.Lock()
+
+_ultima_limpeza = None
+_limpeza_lock = threading.Lock()
+
+
+def _overview_tenant(tenant_id, parametros):
+    from app.tenant.report_queries import visao_geral
+
+    return visao_geral(
+        tenant_id,
+        date.fromisoformat(parametros["start"]),
+        date.fromisoformat(parametros["end"])
+    )
+
+
+def _dashboard_admin(tenant_id, parametros):
+    from app.admin.services import financeiro_global
+
+    return financeiro_global(parametros["days"])
+
+
+TIPOS = {
+    "tenant_overview": _overview_tenant,
+    "admin_dashboard": _dashboard_admin,
+}
+
+
+# =========================================================
+# API
+# =========================================================
+def solicitar(tenant_id, usuario_id, tipo, parametros):
+    """
+    Enfileira (ou reaproveita) o job e, no modo "thread",
+    agenda a execução. Faz commit. Retorna o job.
+    """
+    if tipo not in TIPOS:
+        raise ValueError(f"tipo de relatório inválido: {tipo}")
+
+    job, novo = ReportJob.enfileirar(
+        tenant_id, usuario_id, tipo, parametros,
+        reaproveitar_por=current_app.config.get("REPORT_JOBS_REUSE_TTL", 300)
+    )
+    db.session.commit()
+
+    if novo and current_app.config.get("REPORT_JOBS_EXECUTOR") == "thread":
+        _get_executor().submit(
+            _executar_no_app,
+            current_app._get_current_object(),
+            job.id
+        )
+
+    return job
+
+
+def processar(job_id=None):
+    """
+    Reserva um job (o indicado ou o próximo da fila),
+    calcula e grava o resultado. Precisa de app context.
+    Retorna o id processado, ou None se não havia job.
+    """
+    job_id = ReportJob.reservar(
+        job_id,
+        expira_em=current_app.config.get("REPORT_JOBS_TIMEOUT", 600)
+    )
+
+    if job_id is None:
+        return None
+
+    job = db.session.get(ReportJob, job_id)
+
+    try:
+        payload = TIPOS[job.tipo](job.tenant_id, job.params)
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.exception("Job de relatório %s falhou", job_id)
+        ReportJob.falhar(job_id, e)
+        return job_id
+
+    ReportJob.concluir(job_id, payload)
+    return job_id
+
+
+def executar_fila(intervalo=2.0, parar=None):
+    """
+    Loop do `flask report-worker`: processa a fila e, quando
+    ela esvazia, espera `intervalo` segundos. Limpa jobs
+    antigos (REPORT_JOBS_RETENTION_DAYS) uma vez por hora.
+    """
+    while not (parar and parar()):
+        limpar_antigos()
+
+        if processar() is None:
+            db.session.remove()
+            time.sleep(intervalo)
+
+
+def limpar_antigos():
+    """
+    Remove jobs finalizados há mais de
+    REPORT_JOBS_RETENTION_DAYS, se a última limpeza deste
+    processo foi há mais de LIMPEZA_INTERVALO. Faz commit.
+    Retorna quantos foram removidos.
+    """
+    global _ultima_limpeza
+
+    with _limpeza_lock:
+        agora = time.monotonic()
+
+        if (_ultima_limpeza is not None
+                and agora - _ultima_limpeza < LIMPEZA_INTERVALO):
+            return 0
+
+        _ultima_limpeza = agora
+
+    removidos = ReportJob.limpar(
+        current_app.config.get("REPORT_JOBS_RETENTION_DAYS", 30)
+    )
+    db.session.commit()
+
+    if removidos:
+        current_app.logger.info(
+            "%s jobs de relatório antigos removidos", removidos
+        )
+
+    return removidos
+
+
+# =========================================================
+# POOL DE THREADS (MODO "thread")
+# =========================================================
+def _get_executor():
+    global _executor
+
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=current_app.config.get("REPORT_JOBS_WORKERS", 2),
+                thread_name_prefix="report-job"
+            )
+
+    return _executor
+
+
+def _executar_no_app(app, job_id):
+    """
+    Executa o job na thread, com novas tentativas enquanto
+    ele voltar para a fila (até MAXIMO_TENTATIVAS), e depois
+    a limpeza periódica de jobs antigos
+    """
+    with app.app_context():
+        try:
+            for _ in range(ReportJob.MAXIMO_TENTATIVAS):
+                if processar(job_id) is None:
+                    break
+
+            try:
+                limpar_antigos()
+            except Exception:
+                db.session.rollback()
+                app.logger.exception("Limpeza de jobs de relatório falhou")
+        finally:
+            db.session.remove()
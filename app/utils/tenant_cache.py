@@ -0,0 +1,156 @@
+from collections import namedtuple
+
+from flask import current_app
+
+from app.models.tenant import Tenant
+from app.utils.cache import LRUCache
+
+# =========================================================
+# CACHE DE TENANTS (SLUG / ID → SNAPSHOT)
+# =========================================================
+# O tenant quase nunca muda, mas é consultado em toda
+# página pública (/<slug>/agendar) e em todo render do
+# dashboard (branding). Guardamos um snapshot imutável,
+# desacoplado da sessão do SQLAlchemy.
+#
+# Invalidação explícita após commits que alteram o tenant
+# (invalidate_tenant); o TTL limita a defasagem entre
+# workers diferentes.
+# =========================================================
+
+TenantSnapshot = namedtuple(
+    "TenantSnapshot",
+    [
+        "id",
+        "nome",
+        "slug",
+        "logo",
+        "descricao",
+        "whatsapp",
+        "endereco",
+        "horario_funcionamento",
+        "fuso_horario",
+        "ativo",
+    ]
+)
+
+_cache = None
+
+
+def _get_cache():
+    global _cache
+
+    if _cache is None:
+        _cache = LRUCache(
+            maxsize=current_app.config.get("TENANT_CACHE_SIZE", 1024),
+            ttl=current_app.config.get("TENANT_CACHE_TTL", 300)
+        )
+
+    return _cache
+
+
+def _snapshot(tenant):
+    return TenantSnapshot(
+        id=tenant.id,
+        nome=tenant.nome,
+        slug=tenant.slug,
+        logo=tenant.logo,
+        descricao=tenant.descricao,
+        whatsapp=tenant.whatsapp,
+        endereco=tenant.endereco,
+        horario_funcionamento=tenant.horario_funcionamento,
+        fuso_horario=tenant.fuso_horario,
+        ativo=tenant.ativo
+    )
+
+
+def _guardar(tenant, snap=None):
+    snap = snap or _snapshot(tenant)
+    cache = _get_cache()
+    cache.set(("slug", snap.slug), snap)
+    cache.set(("id", snap.id), snap)
+    return snap
+
+
+# =========================================================
+# API
+# =========================================================
+
+def get_tenant_by_slug(slug):
+    """
+    Snapshot do tenant ATIVO com este slug (ou None)
+    """
+    snap = _get_cache().get(("slug", slug))
+
+    if snap is None:
+        tenant = Tenant.query.filter_by(slug=slug).first()
+        if not tenant:
+            return None
+        snap = _guardar(tenant)
+
+    return snap if snap.ativo else None
+
+
+def get_tenant_by_id(tenant_id):
+    """
+    Snapshot do tenant pelo id (ativo ou não), ou None
+    """
+    if not tenant_id:
+        return None
+
+    snap = _get_cache().get(("id", tenant_id))
+
+    if snap is None:
+        tenant = Tenant.query.get(tenant_id)
+        if not tenant:
+            return None
+        snap = _guardar(tenant)
+
+    return snap
+
+
+def fuso_do_tenant(tenant_id, connection=None):
+    """
+    Fuso horário do tenant (ou o TIMEZONE da app).
+
+    Dentro de um flush (eventos before_insert) a sessão não
+    pode ser consultada: passe a connection do evento.
+    """
+    snap = _get_cache().get(("id", tenant_id)) if tenant_id else None
+
+    if snap is None and tenant_id:
+        if connection is None:
+            snap = get_tenant_by_id(tenant_id)
+        else:
+            row = connection.execute(
+                Tenant.__table__.select().where(Tenant.id == tenant_id)
+            ).mappings().first()
+
+            if row:
+                snap = _guardar(None, TenantSnapshot(
+                    **{campo: row[campo] for campo in TenantSnapshot._fields}
+                ))
+
+    if snap is not None and snap.fuso_horario:
+        return snap.fuso_horario
+
+    return current_app.config.get("TIMEZONE", "UTC")
+
+
+def invalidate_tenant(tenant):
+    """
+    Remove o tenant do cache. Chamar APÓS o commit.
+    """
+    cache = _get_cache()
+    antigo = cache.get(("id", tenant.id))
+
+    cache.delete(("id", tenant.id))
+    cache.delete(("slug", tenant.slug))
+
+    # Slug pode ter mudado
+    if antigo is not None:
+        cache.delete(("slug", antigo.slug))
+
+
+def cache_stats():
+    return _get_cache().stats()
@@ -0,0 +1,119 @@
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import func, cast, Date
+
+from app.utils.db import dialeto
+
+# =========================================================
+# AGRUPAMENTO POR PERÍODO (DIA / SEMANA / MÊS)
+# =========================================================
+# Expressão SQL com o INÍCIO do período de cada linha,
+# escrita para cada banco:
+#
+#   Postgres: date_trunc('week', col)::date
+#   SQLite:   date(col, 'weekday 0', '-6 days')
+#
+# Semanas começam na segunda (ISO). O resultado volta do
+# banco como date (Postgres) ou texto 'YYYY-MM-DD'
+# (SQLite); inicio_do_periodo normaliza.
+#
+# Períodos sem linhas são preenchidos com zero no servidor
+# (preencher), então o gráfico recebe a série completa.
+# =========================================================
+
+DIA = "day"
+SEMANA = "week"
+MES = "month"
+
+GRANULARIDADES = (DIA, SEMANA, MES)
+
+_MODIFICADORES_SQLITE = {
+    DIA: (),
+    SEMANA: ("weekday 0", "-6 days"),
+    MES: ("start of month",),
+}
+
+
+def periodo(coluna, granularidade):
+    """
+    Expressão SQL: data de início do período da coluna
+    (Date ou DateTime)
+    """
+    _validar(granularidade)
+    nome = dialeto()
+
+    if nome == "postgresql":
+        return cast(func.date_trunc(granularidade, coluna), Date)
+
+    if nome == "sqlite":
+        return func.date(coluna, *_MODIFICADORES_SQLITE[granularidade])
+
+    raise NotImplementedError(f"timebucket não suporta o banco {nome}")
+
+
+def inicio_do_periodo(valor, granularidade=DIA):
+    """
+    Início do período de uma data (ou do valor devolvido
+    pela expressão `periodo`)
+    """
+    _validar(granularidade)
+
+    if isinstance(valor, str):
+        valor = date.fromisoformat(valor[:10])
+    elif isinstance(valor, datetime):
+        valor = valor.date()
+
+    if granularidade == SEMANA:
+        return valor - timedelta(days=valor.weekday())
+    if granularidade == MES:
+        return valor.replace(day=1)
+    return valor
+
+
+def periodos(data_inicio, data_fim, granularidade):
+    """
+    Inícios de todos os períodos que tocam [data_inicio, data_fim]
+    """
+    atual = inicio_do_periodo(data_inicio, granularidade)
+    resultado = []
+
+    while atual <= data_fim:
+        resultado.append(atual)
+        atual = _proximo(atual, granularidade)
+
+    return resultado
+
+
+def preencher(linhas, data_inicio, data_fim, granularidade, zero):
+    """
+    Série completa [(inicio, valores)] a partir das linhas
+    (periodo, valores) do banco, com `zero` nos períodos
+    sem linha.
+    """
+    por_periodo = {
+        inicio_do_periodo(p, granularidade): valores
+        for p, valores in linhas
+    }
+
+    return [
+        (inicio, por_periodo.get(inicio, zero))
+        for inicio in periodos(data_inicio, data_fim, granularidade)
+    ]
+
+
+# =========================================================
+# HELPERS
+# =========================================================
+def _proximo(inicio, granularidade):
+    if granularidade == DIA:
+        return inicio + timedelta(days=1)
+    if granularidade == SEMANA:
+        return inicio + timedelta(days=7)
+    if inicio.month == 12:
+        return inicio.replace(year=inicio.year + 1, month=1)
+    return inicio.replace(month=inicio.month + 1)
+
+
+def _validar(granularidade):
+    if granularidade not in GRANULARIDADES:
+        raise ValueError(f"granularidade inválida: {granularidade}")
@@ -54,6 +54,57 @@ class BaseConfig:
     UPLOAD_FOLDER.mkdir(parents=True, exist_ok=True)
     UPLOAD_LOGOS_FOLDER.mkdir(parents=True, exist_ok=True)
 
+    # -----------------------------------------------------
+    # Cache de tenants (slug → snapshot), por processo
+    # -----------------------------------------------------
+    TENANT_CACHE_TTL = int(os.getenv("TENANT_CACHE_TTL", "300"))  # segundos
+    TENANT_CACHE_SIZE = 1024
+
+    # -----------------------------------------------------
+    # Cache do caixa aberto (tenant → id da sessão), por processo
+    # -----------------------------------------------------
+    CASH_SESSION_CACHE_TTL = int(os.getenv("CASH_SESSION_CACHE_TTL", "300"))  # segundos
+    CASH_SESSION_CACHE_SIZE = 1024
+
+    # -----------------------------------------------------
+    # Retenção de horário enquanto o cliente preenche o form
+    # -----------------------------------------------------
+    SLOT_HOLD_MINUTES = int(os.getenv("SLOT_HOLD_MINUTES", "5"))
+
+    # -----------------------------------------------------
+    # Relatórios: ler totais do consolidado diário
+    # (daily_financials). Desligar só antes do backfill.
+    # -----------------------------------------------------
+    REPORTS_USE_ROLLUP = os.getenv("REPORTS_USE_ROLLUP", "1") == "1"
+
+    # -----------------------------------------------------
+    # Cache de relatórios: em memória (padrão) ou Redis
+    # compartilhado entre workers (REPORT_CACHE_URL=redis://)
+    # -----------------------------------------------------
+    REPORT_CACHE_URL = os.getenv("REPORT_CACHE_URL")
+    REPORT_CACHE_TTL = int(os.getenv("REPORT_CACHE_TTL", "300"))  # segundos, período aberto
+    # Período fechado no cache em memória (no Redis não expira)
+    REPORT_CACHE_HISTORY_TTL = int(os.getenv("REPORT_CACHE_HISTORY_TTL", "3600"))  # segundos
+    REPORT_CACHE_SIZE = 1024
+
+    # -----------------------------------------------------
+    # Comissão padrão dos barbeiros (% do faturamento) no
+    # relatório por barbeiro; a tela permite outro valor
+    # -----------------------------------------------------
+    BARBER_COMMISSION_PERCENT = os.getenv("BARBER_COMMISSION_PERCENT", "40")
+
+    # -----------------------------------------------------
+    # Jobs de relatório (períodos longos calculados fora da
+    # requisição). Executor "thread" = pool no processo web;
+    # "worker" = só enfileira, consumido por `flask report-worker`
+    # -----------------------------------------------------
+    REPORT_JOBS_EXECUTOR = os.getenv("REPORT_JOBS_EXECUTOR", "thread")
+    REPORT_JOBS_WORKERS = int(os.getenv("REPORT_JOBS_WORKERS", "2"))
+    REPORT_JOBS_MIN_DAYS = int(os.getenv("REPORT_JOBS_MIN_DAYS", "92"))  # acima disso vira job
+    REPORT_JOBS_REUSE_TTL = int(os.getenv("REPORT_JOBS_REUSE_TTL", "300"))  # segundos
+    REPORT_JOBS_TIMEOUT = 600  # segundos até um job PROCESSANDO voltar para a fila
+    REPORT_JOBS_RETENTION_DAYS = 30  # limpeza horária, pelo worker ou ao fim de um job em thread
+
     # -----------------------------------------------------
     # Timezone
     # -----------------------------------------------------
@@ -0,0 +1,41 @@
+"""daily financials rollup table
+
+Revision ID: 0d4b8f2c6e91
+Revises: f2a9c4e7b318
+Create Date: 2026-10-18 16:05:12.830462
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0d4b8f2c6e91'
+down_revision = 'f2a9c4e7b318'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('daily_financials',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('tenant_id', sa.Integer(), nullable=False),
+    sa.Column('dia', sa.Date(), nullable=False),
+    sa.Column('tipo', sa.String(length=20), nullable=False),
+    sa.Column('categoria', sa.String(length=50), server_default='', nullable=False),
+    sa.Column('metodo_pagamento', sa.String(length=30), server_default='', nullable=False),
+    sa.Column('total', sa.Numeric(precision=12, scale=2), nullable=False),
+    sa.Column('quantidade', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['tenant_id'], ['tenants.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint(
+        'tenant_id', 'dia', 'tipo', 'categoria', 'metodo_pagamento',
+        name='uq_daily_financials_chave'
+    )
+    )
+
+    # Backfill: flask rebuild-daily-financials
+    # (a conversão para o dia local usa o TIMEZONE da app)
+
+
+def downgrade():
+    op.drop_table('daily_financials')
@@ -0,0 +1,42 @@
+"""barber schedule interval must be positive
+
+Revision ID: 1f6a3b8d2c94
+Revises: e9b52f7c4a13
+Create Date: 2026-10-18 16:02:37.441920
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '1f6a3b8d2c94'
+down_revision = 'e9b52f7c4a13'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Regras gravadas antes da validação com intervalo <= 0
+    # travavam a expansão da agenda. Desativa (para a
+    # barbearia revisar) e volta ao intervalo padrão, senão
+    # a constraint não pode ser criada.
+    op.execute(sa.text("""
+        UPDATE barber_schedules
+        SET intervalo_min = 30,
+            ativo = false
+        WHERE intervalo_min <= 0
+    """))
+
+    with op.batch_alter_table('barber_schedules', schema=None) as batch_op:
+        batch_op.create_check_constraint(
+            'ck_barber_schedules_intervalo_positivo',
+            'intervalo_min > 0'
+        )
+
+
+def downgrade():
+    with op.batch_alter_table('barber_schedules', schema=None) as batch_op:
+        batch_op.drop_constraint(
+            'ck_barber_schedules_intervalo_positivo',
+            type_='check'
+        )
@@ -0,0 +1,74 @@
+"""barber schedule rules and schedule exceptions
+
+Revision ID: 3c9e5a1f0b27
+Revises: 7b3f2d9a4c61
+Create Date: 2026-10-18 11:26:05.902144
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '3c9e5a1f0b27'
+down_revision = '7b3f2d9a4c61'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('barber_schedules',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('tenant_id', sa.Integer(), nullable=False),
+    sa.Column('barber_id', sa.Integer(), nullable=False),
+    sa.Column('dia_semana', sa.Integer(), nullable=False),
+    sa.Column('hora_inicio', sa.Time(), nullable=False),
+    sa.Column('hora_fim', sa.Time(), nullable=False),
+    sa.Column('intervalo_min', sa.Integer(), nullable=False),
+    sa.Column('valido_de', sa.Date(), nullable=False),
+    sa.Column('valido_ate', sa.Date(), nullable=True),
+    sa.Column('ativo', sa.Boolean(), nullable=False),
+    sa.Column('criado_em', sa.DateTime(), nullable=False),
+    sa.Column('atualizado_em', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['barber_id'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['tenant_id'], ['tenants.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('barber_schedules', schema=None) as batch_op:
+        batch_op.create_index(
+            'ix_barber_schedules_tenant_barber',
+            ['tenant_id', 'barber_id'],
+            unique=False
+        )
+
+    op.create_table('schedule_exceptions',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('tenant_id', sa.Integer(), nullable=False),
+    sa.Column('barber_id', sa.Integer(), nullable=True),
+    sa.Column('data', sa.Date(), nullable=False),
+    sa.Column('hora_inicio', sa.Time(), nullable=True),
+    sa.Column('hora_fim', sa.Time(), nullable=True),
+    sa.Column('tipo', sa.String(length=20), nullable=False),
+    sa.Column('motivo', sa.String(length=255), nullable=True),
+    sa.Column('criado_em', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['barber_id'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['tenant_id'], ['tenants.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('schedule_exceptions', schema=None) as batch_op:
+        batch_op.create_index(
+            'ix_schedule_exceptions_tenant_data',
+            ['tenant_id', 'data'],
+            unique=False
+        )
+
+
+def downgrade():
+    with op.batch_alter_table('schedule_exceptions', schema=None) as batch_op:
+        batch_op.drop_index('ix_schedule_exceptions_tenant_data')
+
+    op.drop_table('schedule_exceptions')
+
+    with op.batch_alter_table('barber_schedules', schema=None) as batch_op:
+        batch_op.drop_index('ix_barber_schedules_tenant_barber')
+
+    op.drop_table('barber_schedules')
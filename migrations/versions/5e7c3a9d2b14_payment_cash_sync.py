@@ -0,0 +1,95 @@
+"""payment cash sync flag and unique cash movement per payment
+
+Revision ID: 5e7c3a9d2b14
+Revises: 9a2d6e4b1f83
+Create Date: 2026-10-18 14:12:48.306417
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '5e7c3a9d2b14'
+down_revision = '9a2d6e4b1f83'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('payments', schema=None) as batch_op:
+        batch_op.add_column(sa.Column(
+            'sincronizado_caixa',
+            sa.Boolean(),
+            nullable=False,
+            server_default=sa.false()
+        ))
+
+    # Movimentos duplicados do mesmo pagamento (mantém o de
+    # menor id). Saem do total das sessões antes de serem
+    # removidos, para os totais continuarem batendo com os
+    # movimentos.
+    duplicados = """
+        SELECT id FROM (
+            SELECT
+                id,
+                ROW_NUMBER() OVER (
+                    PARTITION BY payment_id
+                    ORDER BY id ASC
+                ) AS rn
+            FROM cash_movements
+            WHERE payment_id IS NOT NULL
+        ) duplicados
+        WHERE rn > 1
+    """
+
+    op.execute(sa.text(f"""
+        UPDATE cash_sessions
+        SET total_entradas = total_entradas - COALESCE((
+                SELECT SUM(m.valor) FROM cash_movements m
+                WHERE m.cash_session_id = cash_sessions.id
+                  AND m.tipo = 'ENTRADA'
+                  AND m.id IN ({duplicados})
+            ), 0),
+            total_saidas = total_saidas - COALESCE((
+                SELECT SUM(m.valor) FROM cash_movements m
+                WHERE m.cash_session_id = cash_sessions.id
+                  AND m.tipo = 'SAIDA'
+                  AND m.id IN ({duplicados})
+            ), 0)
+        WHERE id IN (
+            SELECT cash_session_id FROM cash_movements
+            WHERE id IN ({duplicados})
+        )
+    """))
+
+    op.execute(sa.text(f"""
+        DELETE FROM cash_movements
+        WHERE id IN ({duplicados})
+    """))
+
+    # Pagamentos que já têm movimento no caixa
+    op.execute(sa.text("""
+        UPDATE payments
+        SET sincronizado_caixa = :sim
+        WHERE id IN (
+            SELECT payment_id FROM cash_movements
+            WHERE payment_id IS NOT NULL
+        )
+    """).bindparams(sim=True))
+
+    with op.batch_alter_table('cash_movements', schema=None) as batch_op:
+        batch_op.create_unique_constraint(
+            'uq_cash_movements_payment_id',
+            ['payment_id']
+        )
+
+
+def downgrade():
+    with op.batch_alter_table('cash_movements', schema=None) as batch_op:
+        batch_op.drop_constraint(
+            'uq_cash_movements_payment_id',
+            type_='unique'
+        )
+
+    with op.batch_alter_table('payments', schema=None) as batch_op:
+        batch_op.drop_column('sincronizado_caixa')
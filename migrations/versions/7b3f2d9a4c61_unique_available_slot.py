@@ -0,0 +1,50 @@
+"""unique available slot per barber, date and time
+
+Revision ID: 7b3f2d9a4c61
+Revises: e4a1c7d92f10
+Create Date: 2026-10-18 10:03:27.540912
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '7b3f2d9a4c61'
+down_revision = 'e4a1c7d92f10'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Remove duplicados antes de criar a constraint.
+    # Mantém o slot ocupado/bloqueado (disponivel = false) se houver,
+    # senão o de menor id.
+    op.execute(sa.text("""
+        DELETE FROM available_slots
+        WHERE id IN (
+            SELECT id FROM (
+                SELECT
+                    id,
+                    ROW_NUMBER() OVER (
+                        PARTITION BY tenant_id, barber_id, data, hora
+                        ORDER BY disponivel ASC, id ASC
+                    ) AS rn
+                FROM available_slots
+            ) duplicados
+            WHERE rn > 1
+        )
+    """))
+
+    with op.batch_alter_table('available_slots', schema=None) as batch_op:
+        batch_op.create_unique_constraint(
+            'uq_available_slots_barber_data_hora',
+            ['tenant_id', 'barber_id', 'data', 'hora']
+        )
+
+
+def downgrade():
+    with op.batch_alter_table('available_slots', schema=None) as batch_op:
+        batch_op.drop_constraint(
+            'uq_available_slots_barber_data_hora',
+            type_='unique'
+        )
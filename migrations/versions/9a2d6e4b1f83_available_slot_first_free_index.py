@@ -0,0 +1,29 @@
+"""index for first free slot across barbers
+
+Revision ID: 9a2d6e4b1f83
+Revises: 3c9e5a1f0b27
+Create Date: 2026-10-18 13:05:12.402117
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '9a2d6e4b1f83'
+down_revision = '3c9e5a1f0b27'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('available_slots', schema=None) as batch_op:
+        batch_op.create_index(
+            'ix_available_slots_tenant_disponivel_data_hora',
+            ['tenant_id', 'disponivel', 'data', 'hora'],
+            unique=False
+        )
+
+
+def downgrade():
+    with op.batch_alter_table('available_slots', schema=None) as batch_op:
+        batch_op.drop_index('ix_available_slots_tenant_disponivel_data_hora')
@@ -0,0 +1,135 @@
+"""tenant timezone and local date columns for daily reports
+
+Revision ID: a47e2c9f5d08
+Revises: 0d4b8f2c6e91
+Create Date: 2026-10-18 17:20:41.518203
+"""
+
+from datetime import timezone
+from zoneinfo import ZoneInfo
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'a47e2c9f5d08'
+down_revision = '0d4b8f2c6e91'
+branch_labels = None
+depends_on = None
+
+# Mesmo valor de BaseConfig.TIMEZONE (tenants sem fuso)
+FUSO_PADRAO = 'America/Sao_Paulo'
+LOTE = 5000
+
+TABELAS_UTC = ('cash_movements', 'payments')
+
+
+def upgrade():
+    with op.batch_alter_table('tenants', schema=None) as batch_op:
+        batch_op.add_column(sa.Column(
+            'fuso_horario', sa.String(length=64), nullable=True
+        ))
+
+    for tabela in (*TABELAS_UTC, 'appointments'):
+        with op.batch_alter_table(tabela, schema=None) as batch_op:
+            batch_op.add_column(sa.Column(
+                'data_local', sa.Date(), nullable=True
+            ))
+
+    bind = op.get_bind()
+
+    # data_hora do agendamento já é o horário local
+    op.execute(sa.text(
+        "UPDATE appointments SET data_local = DATE(data_hora)"
+    ))
+
+    # criado_em é UTC ingênuo: converte para o fuso do tenant
+    for tabela in TABELAS_UTC:
+        if bind.dialect.name == 'postgresql':
+            op.execute(sa.text(f"""
+                UPDATE {tabela} AS x
+                SET data_local = (
+                    (x.criado_em AT TIME ZONE 'UTC')
+                    AT TIME ZONE COALESCE(t.fuso_horario, :fuso)
+                )::date
+                FROM tenants t
+                WHERE t.id = x.tenant_id
+            """).bindparams(fuso=FUSO_PADRAO))
+        else:
+            _preencher_em_lotes(bind, tabela)
+
+    for tabela in (*TABELAS_UTC, 'appointments'):
+        with op.batch_alter_table(tabela, schema=None) as batch_op:
+            batch_op.alter_column(
+                'data_local', existing_type=sa.Date(), nullable=False
+            )
+            batch_op.create_index(
+                f'ix_{tabela}_tenant_data_local',
+                ['tenant_id', 'data_local'],
+                unique=False
+            )
+
+
+def downgrade():
+    for tabela in (*TABELAS_UTC, 'appointments'):
+        with op.batch_alter_table(tabela, schema=None) as batch_op:
+            batch_op.drop_index(f'ix_{tabela}_tenant_data_local')
+            batch_op.drop_column('data_local')
+
+    with op.batch_alter_table('tenants', schema=None) as batch_op:
+        batch_op.drop_column('fuso_horario')
+
+
+def _preencher_em_lotes(bind, tabela):
+    """
+    Bancos sem AT TIME ZONE (SQLite): converte em Python,
+    LOTE linhas por vez, em ordem de id.
+    """
+    tenants = sa.table(
+        'tenants',
+        sa.column('id', sa.Integer),
+        sa.column('fuso_horario', sa.String)
+    )
+    linhas = sa.table(
+        tabela,
+        sa.column('id', sa.Integer),
+        sa.column('tenant_id', sa.Integer),
+        sa.column('criado_em', sa.DateTime),
+        sa.column('data_local', sa.Date)
+    )
+
+    fusos = {
+        tenant_id: ZoneInfo(fuso or FUSO_PADRAO)
+        for tenant_id, fuso in bind.execute(
+            sa.select(tenants.c.id, tenants.c.fuso_horario)
+        )
+    }
+    padrao = ZoneInfo(FUSO_PADRAO)
+
+    atualizar = sa.update(linhas).where(
+        linhas.c.id == sa.bindparam('_id')
+    ).values(data_local=sa.bindparam('_dia'))
+
+    ultimo_id = 0
+    while True:
+        lote = bind.execute(
+            sa.select(linhas.c.id, linhas.c.tenant_id, linhas.c.criado_em)
+            .where(linhas.c.id > ultimo_id)
+            .order_by(linhas.c.id)
+            .limit(LOTE)
+        ).all()
+
+        if not lote:
+            break
+
+        bind.execute(atualizar, [
+            {
+                '_id': id_,
+                '_dia': criado_em.replace(tzinfo=timezone.utc).astimezone(
+                    fusos.get(tenant_id, padrao)
+                ).date()
+            }
+            for id_, tenant_id, criado_em in lote
+        ])
+
+        ultimo_id = lote[-1][0]
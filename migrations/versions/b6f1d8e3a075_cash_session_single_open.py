@@ -0,0 +1,52 @@
+"""at most one open cash session per tenant
+
+Revision ID: b6f1d8e3a075
+Revises: 5e7c3a9d2b14
+Create Date: 2026-10-18 14:47:21.518093
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'b6f1d8e3a075'
+down_revision = '5e7c3a9d2b14'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Fecha caixas abertos em duplicidade antes de criar o
+    # índice. Mantém aberto o mais recente de cada tenant.
+    op.execute(sa.text("""
+        UPDATE cash_sessions
+        SET status = 'FECHADO',
+            fechado_em = CURRENT_TIMESTAMP
+        WHERE id IN (
+            SELECT id FROM (
+                SELECT
+                    id,
+                    ROW_NUMBER() OVER (
+                        PARTITION BY tenant_id
+                        ORDER BY id DESC
+                    ) AS rn
+                FROM cash_sessions
+                WHERE status = 'ABERTO'
+            ) duplicados
+            WHERE rn > 1
+        )
+    """))
+
+    with op.batch_alter_table('cash_sessions', schema=None) as batch_op:
+        batch_op.create_index(
+            'uq_cash_sessions_tenant_aberto',
+            ['tenant_id'],
+            unique=True,
+            postgresql_where=sa.text("status = 'ABERTO'"),
+            sqlite_where=sa.text("status = 'ABERTO'")
+        )
+
+
+def downgrade():
+    with op.batch_alter_table('cash_sessions', schema=None) as batch_op:
+        batch_op.drop_index('uq_cash_sessions_tenant_aberto')
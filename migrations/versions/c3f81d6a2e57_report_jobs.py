@@ -0,0 +1,54 @@
+"""report jobs queue
+
+Revision ID: c3f81d6a2e57
+Revises: a47e2c9f5d08
+Create Date: 2026-10-18 18:02:19.774310
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'c3f81d6a2e57'
+down_revision = 'a47e2c9f5d08'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('report_jobs',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('tenant_id', sa.Integer(), nullable=True),
+    sa.Column('usuario_id', sa.Integer(), nullable=False),
+    sa.Column('tipo', sa.String(length=40), nullable=False),
+    sa.Column('parametros', sa.String(length=255), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('tentativas', sa.Integer(), nullable=False),
+    sa.Column('resultado', sa.Text(), nullable=True),
+    sa.Column('erro', sa.String(length=255), nullable=True),
+    sa.Column('criado_em', sa.DateTime(), nullable=False),
+    sa.Column('iniciado_em', sa.DateTime(), nullable=True),
+    sa.Column('concluido_em', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['tenant_id'], ['tenants.id'], ),
+    sa.ForeignKeyConstraint(['usuario_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('report_jobs', schema=None) as batch_op:
+        batch_op.create_index(
+            'ix_report_jobs_status_criado_em',
+            ['status', 'criado_em'],
+            unique=False
+        )
+        batch_op.create_index(
+            'ix_report_jobs_tenant_tipo_parametros',
+            ['tenant_id', 'tipo', 'parametros'],
+            unique=False
+        )
+
+
+def downgrade():
+    with op.batch_alter_table('report_jobs', schema=None) as batch_op:
+        batch_op.drop_index('ix_report_jobs_tenant_tipo_parametros')
+        batch_op.drop_index('ix_report_jobs_status_criado_em')
+
+    op.drop_table('report_jobs')
@@ -0,0 +1,53 @@
+"""composite indexes for appointment and cash movement date ranges
+
+Revision ID: e4a1c7d92f10
+Revises: d8e1b0c23abc
+Create Date: 2026-10-18 09:12:40.118233
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'e4a1c7d92f10'
+down_revision = 'd8e1b0c23abc'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # APPOINTMENTS
+    with op.batch_alter_table('appointments', schema=None) as batch_op:
+        batch_op.create_index(
+            'ix_appointments_tenant_data_hora',
+            ['tenant_id', 'data_hora'],
+            unique=False
+        )
+        batch_op.create_index(
+            'ix_appointments_tenant_barber_data_hora',
+            ['tenant_id', 'barber_id', 'data_hora'],
+            unique=False
+        )
+        batch_op.create_index(
+            'ix_appointments_tenant_status_data_hora',
+            ['tenant_id', 'status', 'data_hora'],
+            unique=False
+        )
+
+    # CASH MOVEMENTS
+    with op.batch_alter_table('cash_movements', schema=None) as batch_op:
+        batch_op.create_index(
+            'ix_cash_movements_tenant_criado_em',
+            ['tenant_id', 'criado_em'],
+            unique=False
+        )
+
+
+def downgrade():
+    with op.batch_alter_table('cash_movements', schema=None) as batch_op:
+        batch_op.drop_index('ix_cash_movements_tenant_criado_em')
+
+    with op.batch_alter_table('appointments', schema=None) as batch_op:
+        batch_op.drop_index('ix_appointments_tenant_status_data_hora')
+        batch_op.drop_index('ix_appointments_tenant_barber_data_hora')
+        batch_op.drop_index('ix_appointments_tenant_data_hora')
@@ -0,0 +1,62 @@
+"""platform daily metrics rollup
+
+Revision ID: e9b52f7c4a13
+Revises: c3f81d6a2e57
+Create Date: 2026-10-18 19:11:53.204916
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'e9b52f7c4a13'
+down_revision = 'c3f81d6a2e57'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('platform_daily_metrics',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('tenant_id', sa.Integer(), nullable=False),
+    sa.Column('dia', sa.Date(), nullable=False),
+    sa.Column('entradas', sa.Numeric(precision=12, scale=2), nullable=False),
+    sa.Column('quantidade_entradas', sa.Integer(), nullable=False),
+    sa.Column('saidas', sa.Numeric(precision=12, scale=2), nullable=False),
+    sa.Column('quantidade_saidas', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['tenant_id'], ['tenants.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('tenant_id', 'dia', name='uq_platform_daily_metrics_tenant_dia')
+    )
+    with op.batch_alter_table('platform_daily_metrics', schema=None) as batch_op:
+        batch_op.create_index(
+            'ix_platform_daily_metrics_dia_tenant',
+            ['dia', 'tenant_id'],
+            unique=False
+        )
+
+    # Backfill a partir do consolidado diário (já no dia local)
+    op.execute(sa.text("""
+        INSERT INTO platform_daily_metrics (
+            tenant_id, dia,
+            entradas, quantidade_entradas,
+            saidas, quantidade_saidas
+        )
+        SELECT
+            tenant_id,
+            dia,
+            COALESCE(SUM(CASE WHEN tipo = 'ENTRADA' THEN total END), 0),
+            COALESCE(SUM(CASE WHEN tipo = 'ENTRADA' THEN quantidade END), 0),
+            COALESCE(SUM(CASE WHEN tipo = 'SAIDA' THEN total END), 0),
+            COALESCE(SUM(CASE WHEN tipo = 'SAIDA' THEN quantidade END), 0)
+        FROM daily_financials
+        WHERE tipo IN ('ENTRADA', 'SAIDA')
+        GROUP BY tenant_id, dia
+    """))
+
+
+def downgrade():
+    with op.batch_alter_table('platform_daily_metrics', schema=None) as batch_op:
+        batch_op.drop_index('ix_platform_daily_metrics_dia_tenant')
+
+    op.drop_table('platform_daily_metrics')
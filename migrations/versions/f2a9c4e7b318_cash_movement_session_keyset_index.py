@@ -0,0 +1,29 @@
+"""cash movement index for keyset pagination per session
+
+Revision ID: f2a9c4e7b318
+Revises: b6f1d8e3a075
+Create Date: 2026-10-18 15:20:36.774180
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'f2a9c4e7b318'
+down_revision = 'b6f1d8e3a075'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('cash_movements', schema=None) as batch_op:
+        batch_op.create_index(
+            'ix_cash_movements_session_criado_em_id',
+            ['cash_session_id', 'criado_em', 'id'],
+            unique=False
+        )
+
+
+def downgrade():
+    with op.batch_alter_table('cash_movements', schema=None) as batch_op:
+        batch_op.drop_index('ix_cash_movements_session_criado_em_id')
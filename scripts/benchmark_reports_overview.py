@@ -0,0 +1,307 @@
+"""
+Benchmark das consultas de /dashboard/reports/
+
+Compara, sobre uma base sintética:
+- antes:  uma consulta por indicador (3 em cash_movements,
+          2 em appointments)
+- depois: uma passada por tabela (agregação condicional)
+- consolidado: leitura de daily_financials
+
+Uso (da raiz do projeto):
+
+    python scripts/benchmark_reports_overview.py
+    python scripts/benchmark_reports_overview.py --rows 200000 --repeat 3
+
+Por padrão cria um SQLite próprio em /tmp. Com --database-url
+as tabelas do benchmark são APAGADAS e recriadas: nunca
+aponte para um banco com dados reais.
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+TENANTS = 5
+BARBEIROS_POR_TENANT = 4
+SERVICOS_POR_TENANT = 8
+LOTE = 10_000
+
+
+def argumentos():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--rows", type=int, default=1_000_000,
+                        help="movimentos de caixa (agendamentos = rows / 2)")
+    parser.add_argument("--days", type=int, default=365,
+                        help="dias de histórico")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--database-url", default=None)
+    parser.add_argument("--reuse", action="store_true",
+                        help="não repopula se a base já existir")
+    return parser.parse_args()
+
+
+# =========================================================
+# CARGA
+# =========================================================
+def popular(args):
+    from app.extensions import db
+    from app.models import (
+        Tenant, User, Service, Appointment,
+        CashSession, CashMovement, Expense
+    )
+    from app.models.daily_financial import DailyFinancial
+
+    db.drop_all()
+    db.create_all()
+
+    rnd = random.Random(42)
+    agora = datetime.utcnow().replace(microsecond=0)
+    inicio = agora - timedelta(days=args.days)
+    segundos = args.days * 86400
+
+    tenants = []
+    for i in range(TENANTS):
+        tenant = Tenant(nome=f"Bench {i}", slug=f"bench-{i}", ativo=True)
+        db.session.add(tenant)
+        db.session.flush()
+
+        dono = User(nome=f"Dono {i}", email=f"dono{i}@bench",
+                    role="TENANT_ADMIN", tenant_id=tenant.id, senha="x")
+        barbeiros = [
+            User(nome=f"B{i}.{j}", email=f"b{i}.{j}@bench",
+                 role="BARBER", tenant_id=tenant.id, senha="x")
+            for j in range(BARBEIROS_POR_TENANT)
+        ]
+        db.session.add(dono)
+        db.session.add_all(barbeiros)
+        db.session.flush()
+
+        servicos = [
+            Service(nome=f"Serviço {j}", preco=Decimal(30 + j * 5),
+                    duracao_min=30, tenant_id=tenant.id,
+                    barber_id=barbeiros[j % len(barbeiros)].id)
+            for j in range(SERVICOS_POR_TENANT)
+        ]
+        db.session.add_all(servicos)
+
+        caixa = CashSession(tenant_id=tenant.id,
+                            usuario_abertura_id=dono.id,
+                            status="FECHADO")
+        db.session.add(caixa)
+        db.session.flush()
+
+        tenants.append((tenant.id, dono.id, caixa.id,
+                        [b.id for b in barbeiros],
+                        [s.id for s in servicos]))
+
+    db.session.commit()
+
+    def momento():
+        return inicio + timedelta(seconds=rnd.randrange(segundos))
+
+    tipos = ["ENTRADA"] * 8 + ["SAIDA"] * 2
+    categorias = {"ENTRADA": ["SERVICO"] * 4 + ["PAGAMENTO", "MANUAL"],
+                  "SAIDA": ["MANUAL", "SANGRIA"]}
+    metodos = ["PIX", "DINHEIRO", "CARTAO"]
+
+    def movimentos():
+        for _ in range(args.rows):
+            tenant_id, dono_id, caixa_id, _, _ = rnd.choice(tenants)
+            tipo = rnd.choice(tipos)
+            criado_em = momento()
+            yield {
+                "tenant_id": tenant_id,
+                "cash_session_id": caixa_id,
+                "usuario_id": dono_id,
+                "tipo": tipo,
+                "categoria": rnd.choice(categorias[tipo]),
+                "metodo_pagamento": rnd.choice(metodos),
+                "valor": Decimal(rnd.randrange(1000, 20000)) / 100,
+                "criado_em": criado_em,
+                "data_local": data_local(criado_em),
+            }
+
+    def agendamentos():
+        status = ["CONCLUIDO"] * 6 + ["AGENDADO", "CANCELADO"]
+        for _ in range(args.rows // 2):
+            tenant_id, _, _, barbeiros, servicos = rnd.choice(tenants)
+            data_hora = momento()
+            yield {
+                "tenant_id": tenant_id,
+                "barber_id": rnd.choice(barbeiros),
+                "service_id": rnd.choice(servicos),
+                "cliente_nome": "Cliente",
+                "cliente_whatsapp": "11999999999",
+                "data_hora": data_hora,
+                "data_local": data_hora.date(),
+                "status": rnd.choice(status),
+                "criado_em": agora,
+            }
+
+    def despesas():
+        for _ in range(args.rows // 100):
+            tenant_id = rnd.choice(tenants)[0]
+            yield {
+                "tenant_id": tenant_id,
+                "categoria": rnd.choice(["ALUGUEL", "PRODUTOS", "LUZ"]),
+                "valor": Decimal(rnd.randrange(1000, 50000)) / 100,
+                "data": momento().date(),
+                "criado_em": agora,
+            }
+
+    from app.utils.db import em_lotes
+    from app.utils.dates import data_local
+
+    for modelo, linhas in [(CashMovement, movimentos()),
+                           (Appointment, agendamentos()),
+                           (Expense, despesas())]:
+        for lote in em_lotes(linhas, LOTE):
+            db.session.execute(db.insert(modelo), lote)
+        db.session.commit()
+
+    for tenant in tenants:
+        DailyFinancial.reconstruir(tenant[0])
+        db.session.commit()
+
+
+# =========================================================
+# CONSULTAS
+# =========================================================
+def antes(tenant_id, data_inicio, data_fim):
+    """Uma consulta por indicador (como era a visão geral)"""
+    from sqlalchemy import func
+    from app.extensions import db
+    from app.models import Appointment, Service, CashMovement
+    periodo = (CashMovement.data_local.between(data_inicio, data_fim),)
+
+    def soma(*filtros):
+        return db.session.query(
+            func.coalesce(func.sum(CashMovement.valor), 0)
+        ).filter(
+            CashMovement.tenant_id == tenant_id, *periodo, *filtros
+        ).scalar()
+
+    faturamento = soma(CashMovement.categoria == "SERVICO")
+    entradas = soma(CashMovement.tipo == "ENTRADA")
+    saidas = soma(CashMovement.tipo == "SAIDA")
+
+    periodo_ag = (Appointment.data_local.between(data_inicio, data_fim),)
+
+    total = Appointment.query.filter(
+        Appointment.tenant_id == tenant_id,
+        Appointment.status == "CONCLUIDO",
+        *periodo_ag
+    ).count()
+
+    top = db.session.query(
+        Service.nome, func.count(Appointment.id)
+    ).join(
+        Appointment, Appointment.service_id == Service.id
+    ).filter(
+        Appointment.tenant_id == tenant_id,
+        Appointment.status == "CONCLUIDO",
+        *periodo_ag,
+        Service.excluido == False
+    ).group_by(
+        Service.nome
+    ).order_by(
+        func.count(Appointment.id).desc()
+    ).limit(5).all()
+
+    return Decimal(faturamento), Decimal(entradas), Decimal(saidas), total, top
+
+
+def depois(tenant_id, data_inicio, data_fim):
+    """Uma passada em cash_movements e uma em appointments"""
+    from app.tenant.report_queries import totais_caixa, resumo_agendamentos
+
+    totais = totais_caixa(tenant_id, data_inicio, data_fim)
+    total, top = resumo_agendamentos(tenant_id, data_inicio, data_fim)
+
+    return (totais["faturamento"], totais["entradas"], totais["saidas"],
+            total, top)
+
+
+def consolidado(tenant_id, data_inicio, data_fim):
+    """Totais financeiros lidos de daily_financials"""
+    from app.models.daily_financial import DailyFinancial
+
+    return DailyFinancial.totais(tenant_id, data_inicio, data_fim)
+
+
+def cronometrar(funcao, repeticoes, *args):
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        resultado = funcao(*args)
+        tempos.append((time.perf_counter() - inicio) * 1000)
+    return statistics.median(tempos), resultado
+
+
+# =========================================================
+# MAIN
+# =========================================================
+def main():
+    args = argumentos()
+
+    url = args.database_url or "sqlite:///" + os.path.join(
+        tempfile.gettempdir(), "bench_reports.db"
+    )
+    os.environ["DATABASE_URL"] = url
+    os.environ.setdefault("FLASK_ENV", "development")
+
+    from app import create_app
+    from app.extensions import db
+    from app.models import CashMovement
+    from app.utils.dates import hoje_local
+
+    app = create_app()
+
+    with app.app_context():
+        existente = (
+            args.reuse
+            and db.inspect(db.engine).has_table("daily_financials")
+            and db.session.query(CashMovement.id).limit(1).first()
+        )
+
+        if not existente:
+            print(f"Populando {args.rows:,} movimentos em {url} ...")
+            inicio = time.perf_counter()
+            popular(args)
+            print(f"  pronto em {time.perf_counter() - inicio:.1f}s")
+
+        hoje = hoje_local()
+        periodos = [
+            ("mês atual", hoje.replace(day=1), hoje),
+            ("90 dias", hoje - timedelta(days=90), hoje),
+            ("1 ano", hoje - timedelta(days=365), hoje),
+        ]
+
+        print(f"\n{'período':<12}{'antes':>12}{'depois':>12}"
+              f"{'consolidado':>14}   (mediana de {args.repeat}, ms)")
+
+        for nome, data_inicio, data_fim in periodos:
+            t_antes, r_antes = cronometrar(
+                antes, args.repeat, 1, data_inicio, data_fim)
+            t_depois, r_depois = cronometrar(
+                depois, args.repeat, 1, data_inicio, data_fim)
+            t_rollup, _ = cronometrar(
+                consolidado, args.repeat, 1, data_inicio, data_fim)
+
+            if r_antes[:4] != r_depois[:4]:
+                print(f"  ⚠ resultados diferentes: {r_antes[:4]} != {r_depois[:4]}")
+
+            print(f"{nome:<12}{t_antes:>12.1f}{t_depois:>12.1f}{t_rollup:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
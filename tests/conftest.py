@@ -0,0 +1,164 @@
+import os
+from contextlib import contextmanager
+from datetime import time, timedelta
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import event
+
+os.environ.setdefault("FLASK_ENV", "testing")
+
+from app import create_app
+from app.extensions import db
+from app.models import Tenant, User, Service, AvailableSlot
+from app.utils.dates import hoje_local
+
+
+# =========================================================
+# APP / BANCO
+# =========================================================
+# SQLite em arquivo (um por teste): os testes de
+# concorrência abrem várias conexões. TEST_DATABASE_URL
+# aponta para outro banco (ex.: Postgres) se definido.
+# =========================================================
+
+@pytest.fixture
+def app(tmp_path):
+    app = create_app({
+        "SQLALCHEMY_DATABASE_URI": os.getenv(
+            "TEST_DATABASE_URL",
+            f"sqlite:///{tmp_path / 'test.db'}"
+        ),
+    })
+
+    _limpar_caches()
+
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+    _limpar_caches()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+def _limpar_caches():
+    """
+    Caches por processo guardam ids do banco anterior
+    """
+    from app.utils import tenant_cache, report_cache, report_jobs
+    from app.models import cash_session
+    from app.booking import holds
+
+    tenant_cache._cache = None
+    cash_session._cache = None
+    report_cache._backend = None
+    report_jobs._ultima_limpeza = None
+
+    with holds._lock:
+        holds._holds.clear()
+        holds._por_token.clear()
+
+
+# =========================================================
+# DADOS
+# =========================================================
+
+@pytest.fixture
+def tenant(app):
+    tenant = Tenant(nome="Barbearia Teste", slug="teste", ativo=True)
+    db.session.add(tenant)
+    db.session.commit()
+    return tenant
+
+
+@pytest.fixture
+def admin(tenant):
+    return _usuario(tenant, "admin@teste.com", "TENANT_ADMIN")
+
+
+@pytest.fixture
+def barber(tenant):
+    return _usuario(tenant, "barbeiro@teste.com", "BARBER")
+
+
+@pytest.fixture
+def service(tenant, barber):
+    service = Service(
+        tenant_id=tenant.id,
+        barber_id=barber.id,
+        nome="Corte",
+        preco=Decimal("40.00"),
+        duracao_min=30
+    )
+    db.session.add(service)
+    db.session.commit()
+    return service
+
+
+@pytest.fixture
+def slot(tenant, barber):
+    """
+    Horário livre amanhã às 10:00
+    """
+    slot = AvailableSlot(
+        tenant_id=tenant.id,
+        barber_id=barber.id,
+        data=hoje_local(tenant.id) + timedelta(days=1),
+        hora=time(10, 0),
+        disponivel=True
+    )
+    db.session.add(slot)
+    db.session.commit()
+    return slot
+
+
+def _usuario(tenant, email, role):
+    usuario = User(
+        nome=email.split("@")[0],
+        email=email,
+        role=role,
+        tenant_id=tenant.id,
+        ativo=True
+    )
+    usuario.set_password("senha")
+    db.session.add(usuario)
+    db.session.commit()
+    return usuario
+
+
+def login(client, usuario):
+    with client.session_transaction() as sessao:
+        sessao["_user_id"] = str(usuario.id)
+        sessao["_fresh"] = True
+
+
+# =========================================================
+# CONTAGEM DE CONSULTAS
+# =========================================================
+
+@contextmanager
+def contar_consultas():
+    """
+    Conta os comandos SQL emitidos no bloco:
+
+        with contar_consultas() as consultas:
+            ...
+        assert len(consultas) == 1
+    """
+    engine = db.engine
+    consultas = []
+
+    def _registrar(conn, cursor, statement, parameters, context, executemany):
+        consultas.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _registrar)
+    try:
+        yield consultas
+    finally:
+        event.remove(engine, "before_cursor_execute", _registrar)
@@ -0,0 +1,162 @@
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import func, text
+
+from app.extensions import db
+from app.models import Appointment, Service, User
+from app.utils.dates import filtro_periodo, hoje_local
+from tests.conftest import contar_consultas, login
+
+
+def _agendar(tenant, barber, service, data_hora, status="AGENDADO"):
+    appointment = Appointment(
+        tenant_id=tenant.id,
+        barber_id=barber.id,
+        service_id=service.id,
+        cliente_nome="Cliente",
+        cliente_whatsapp="11999990000",
+        data_hora=data_hora,
+        status=status
+    )
+    db.session.add(appointment)
+    return appointment
+
+
+# =========================================================
+# FILTROS DE DIA "SARGABLE"
+# =========================================================
+
+DIA = date(2026, 3, 10)
+
+
+@pytest.fixture
+def agenda_nas_bordas(tenant, barber, service):
+    """
+    Agendamentos em torno das viradas de dia do período
+    """
+    for data_hora in [
+        datetime(2026, 3, 9, 23, 59, 59),
+        datetime(2026, 3, 10, 0, 0),
+        datetime(2026, 3, 10, 14, 30),
+        datetime(2026, 3, 11, 23, 59, 59, 999999),
+        datetime(2026, 3, 12, 0, 0),
+    ]:
+        _agendar(tenant, barber, service, data_hora)
+
+    db.session.commit()
+
+
+@pytest.mark.parametrize("data_fim", [DIA, DIA + timedelta(days=1)])
+def test_filtro_periodo_igual_ao_filtro_por_func_date(app, tenant,
+                                                      agenda_nas_bordas,
+                                                      data_fim):
+    base = db.session.query(Appointment.id).filter(
+        Appointment.tenant_id == tenant.id
+    )
+
+    por_intervalo = base.filter(
+        *filtro_periodo(Appointment.data_hora, DIA, data_fim)
+    ).all()
+
+    por_func_date = base.filter(
+        func.date(Appointment.data_hora).between(
+            DIA.isoformat(), data_fim.isoformat()
+        )
+    ).all()
+
+    assert por_intervalo
+    assert sorted(por_intervalo) == sorted(por_func_date)
+
+
+def test_filtro_do_dia_usa_indice_composto(app, tenant, barber,
+                                           agenda_nas_bordas):
+    if db.engine.dialect.name != "sqlite":
+        pytest.skip("plano verificado com EXPLAIN QUERY PLAN do SQLite")
+
+    query = db.session.query(Appointment.id).filter(
+        Appointment.tenant_id == tenant.id,
+        Appointment.barber_id == barber.id,
+        *filtro_periodo(Appointment.data_hora, DIA, DIA)
+    )
+
+    sql = query.statement.compile(
+        db.engine, compile_kwargs={"literal_binds": True}
+    )
+    plano = " ".join(
+        str(linha[-1])
+        for linha in db.session.execute(text(f"EXPLAIN QUERY PLAN {sql}"))
+    )
+
+    # Busca pelo índice com o intervalo na própria coluna
+    # (func.date(data_hora) viraria SCAN / filtro por linha)
+    assert (
+        "ix_appointments_tenant_barber_data_hora "
+        "(tenant_id=? AND barber_id=? AND data_hora>? AND data_hora<?)"
+    ) in plano
+
+
+# =========================================================
+# PAINEL DA AGENDA SEM N+1
+# =========================================================
+
+def _semear_agenda(tenant, inicio, quantidade):
+    """
+    Agendamentos futuros de índice inicio..inicio+quantidade,
+    cada um com barbeiro e serviço próprios (nada a
+    aproveitar do identity map)
+    """
+    amanha = hoje_local(tenant.id) + timedelta(days=1)
+
+    for i in range(inicio, inicio + quantidade):
+        barbeiro = User(
+            nome=f"Barbeiro {i}",
+            email=f"barbeiro{i}@agenda.com",
+            role="BARBER",
+            tenant_id=tenant.id
+        )
+        barbeiro.set_password("senha")
+        db.session.add(barbeiro)
+        db.session.flush()
+
+        servico = Service(
+            tenant_id=tenant.id,
+            barber_id=barbeiro.id,
+            nome=f"Serviço {i}",
+            preco=Decimal("30.00")
+        )
+        db.session.add(servico)
+        db.session.flush()
+
+        _agendar(
+            tenant, barbeiro, servico,
+            datetime.combine(amanha, time(8)) + timedelta(minutes=10 * i)
+        )
+
+    db.session.commit()
+
+
+def _consultas_do_painel(client):
+    db.session.expire_all()
+
+    with contar_consultas() as consultas:
+        resposta = client.get("/dashboard/api/appointments?limit=100")
+
+    assert resposta.status_code == 200
+    return len(consultas), len(resposta.get_json()["items"])
+
+
+def test_painel_de_agendamentos_tem_consultas_constantes(client, tenant,
+                                                         admin):
+    login(client, admin)
+
+    _semear_agenda(tenant, 0, 2)
+    consultas_poucos, itens = _consultas_do_painel(client)
+    assert itens == 2
+
+    _semear_agenda(tenant, 2, 28)
+    consultas_muitos, itens = _consultas_do_painel(client)
+    assert itens == 30
+
+    assert consultas_muitos == consultas_poucos
@@ -0,0 +1,286 @@
+import threading
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+
+import pytest
+
+from app.booking import holds
+from app.extensions import db
+from app.models import Appointment, AvailableSlot, BarberSchedule, Service
+from app.utils.dates import hoje_local
+from tests.conftest import contar_consultas
+
+
+# =========================================================
+# RESERVA CONCORRENTE
+# =========================================================
+
+def test_reserva_concorrente_cria_um_unico_agendamento(app, tenant, barber,
+                                                       service, slot):
+    """
+    Vários clientes confirmam o mesmo horário ao mesmo tempo:
+    o UPDATE condicional deixa só um deles levar o slot
+    """
+    threads_total = 8
+    url = f"/{tenant.slug}/agendar"
+    dados = {
+        "barber_id": barber.id,
+        "service_id": service.id,
+        "slot_id": str(slot.id),
+    }
+    largada = threading.Barrier(threads_total)
+    respostas = []
+    erros = []
+
+    def agendar(i):
+        try:
+            client = app.test_client()
+            largada.wait()
+            resposta = client.post(url, data={
+                **dados,
+                "cliente_nome": f"Cliente {i}",
+                "cliente_whatsapp": f"1199999000{i}",
+            })
+            respostas.append(resposta.status_code)
+        except Exception as e:  # falha na thread reprova o teste
+            erros.append(e)
+
+    threads = [
+        threading.Thread(target=agendar, args=(i,))
+        for i in range(threads_total)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert not erros
+    assert respostas == [302] * threads_total
+
+    db.session.expire_all()
+
+    assert Appointment.query.filter_by(
+        tenant_id=tenant.id,
+        barber_id=barber.id
+    ).count() == 1
+    assert db.session.get(AvailableSlot, slot.id).disponivel is False
+
+
+# =========================================================
+# VALIDAÇÃO DO POST EM UMA CONSULTA
+# =========================================================
+
+def test_validacao_do_agendamento_faz_um_unico_select(app, tenant, barber,
+                                                      service, slot):
+    from app.booking.routes import _validar_agendamento
+
+    slug, tenant_id = tenant.slug, tenant.id
+    inicio = datetime.combine(slot.data, slot.hora)
+
+    casos = [
+        (barber.id, service.id, slot.id, None),     # slot materializado
+        (barber.id, service.id, None, inicio),      # horário virtual
+        (barber.id + 99, service.id, slot.id, None),  # barbeiro inválido
+    ]
+
+    for barber_id, service_id, slot_id, hora in casos:
+        db.session.expire_all()
+
+        with contar_consultas() as consultas:
+            validacao = _validar_agendamento(
+                slug, barber_id, service_id, slot_id, hora
+            )
+
+        assert validacao.tenant_id == tenant_id
+        assert len(consultas) == 1
+        assert consultas[0].lstrip().upper().startswith("SELECT")
+
+
+# =========================================================
+# FEEDS NÃO OFERECEM HORÁRIOS JÁ PASSADOS
+# =========================================================
+
+@pytest.fixture
+def agenda_de_hoje(tenant, barber, monkeypatch):
+    """
+    "Agora" = hoje 12:00 no fuso da barbearia. Slots às
+    09:00, 12:00 e 15:00; regra de 08:00 às 14:00 de hora
+    em hora (virtuais 08, 10, 11 e 13h).
+    """
+    hoje = hoje_local(tenant.id)
+
+    monkeypatch.setattr(
+        "app.booking.routes.agora_local",
+        lambda tenant_id=None: datetime.combine(hoje, time(12, 0))
+    )
+
+    for hora in (time(9), time(12), time(15)):
+        db.session.add(AvailableSlot(
+            tenant_id=tenant.id,
+            barber_id=barber.id,
+            data=hoje,
+            hora=hora
+        ))
+
+    db.session.add(BarberSchedule(
+        tenant_id=tenant.id,
+        barber_id=barber.id,
+        dia_semana=hoje.weekday(),
+        hora_inicio=time(8),
+        hora_fim=time(14),
+        intervalo_min=60,
+        valido_de=hoje
+    ))
+    db.session.commit()
+
+    return hoje
+
+
+def test_feed_de_horarios_omite_horarios_passados(client, tenant, barber,
+                                                  service, agenda_de_hoje):
+    for extra in ("", f"&service_id={service.id}"):
+        resposta = client.get(
+            f"/{tenant.slug}/slots?barber_id={barber.id}"
+            f"&inicio={agenda_de_hoje.isoformat()}"
+            f"&fim={agenda_de_hoje.isoformat()}{extra}"
+        )
+
+        assert resposta.status_code == 200
+        assert [s["hora"] for s in resposta.get_json()["slots"]] == [
+            "13:00", "15:00"
+        ]
+
+
+def test_primeiro_disponivel_omite_horarios_passados(client, tenant,
+                                                     service, agenda_de_hoje):
+    resposta = client.get(
+        f"/{tenant.slug}/slots/first?service_id={service.id}&limit=5"
+    )
+
+    assert resposta.status_code == 200
+
+    horarios = [
+        (s["data"], s["hora"]) for s in resposta.get_json()["slots"]
+    ]
+    hoje = agenda_de_hoje.isoformat()
+
+    assert [h for d, h in horarios if d == hoje] == ["13:00", "15:00"]
+
+
+def test_post_recusa_horario_virtual_passado(client, tenant, barber,
+                                             service, agenda_de_hoje):
+    """
+    POST direto num horário da regra que já passou (o feed
+    não o oferece): nada é materializado nem agendado
+    """
+    ontem = agenda_de_hoje - timedelta(days=1)
+
+    db.session.add(BarberSchedule(
+        tenant_id=tenant.id,
+        barber_id=barber.id,
+        dia_semana=ontem.weekday(),
+        hora_inicio=time(8),
+        hora_fim=time(14),
+        intervalo_min=60,
+        valido_de=ontem
+    ))
+    db.session.commit()
+
+    for inicio in (
+        datetime.combine(ontem, time(10)),
+        datetime.combine(agenda_de_hoje, time(11)),
+    ):
+        resposta = client.post(f"/{tenant.slug}/agendar", data={
+            "barber_id": barber.id,
+            "service_id": service.id,
+            "slot_id": inicio.strftime("%Y-%m-%dT%H:%M"),
+            "cliente_nome": "Cliente",
+            "cliente_whatsapp": "11999990000",
+        }, follow_redirects=True)
+
+        assert "Horário indisponível" in resposta.get_data(as_text=True)
+
+    assert Appointment.query.count() == 0
+    assert AvailableSlot.query.filter_by(disponivel=False).count() == 0
+
+
+# =========================================================
+# HOLD NO MEIO DO SERVIÇO
+# =========================================================
+
+@pytest.fixture
+def servico_longo_e_hold(tenant, barber):
+    """
+    Serviço de 60 min; slots amanhã 10:00, 10:30 e 11:00,
+    com 10:30 segurado por outro cliente
+    """
+    amanha = hoje_local(tenant.id) + timedelta(days=1)
+
+    servico = Service(
+        tenant_id=tenant.id,
+        barber_id=barber.id,
+        nome="Corte + Barba",
+        preco=Decimal("70.00"),
+        duracao_min=60
+    )
+    db.session.add(servico)
+
+    for hora in (time(10), time(10, 30), time(11)):
+        db.session.add(AvailableSlot(
+            tenant_id=tenant.id,
+            barber_id=barber.id,
+            data=amanha,
+            hora=hora
+        ))
+    db.session.commit()
+
+    holds.segurar(tenant.id, barber.id, amanha, time(10, 30), 5, "outro")
+
+    return servico, amanha
+
+
+def test_feed_omite_inicio_cujo_servico_cruza_hold(client, tenant, barber,
+                                                   servico_longo_e_hold):
+    servico, amanha = servico_longo_e_hold
+
+    resposta = client.get(
+        f"/{tenant.slug}/slots?barber_id={barber.id}"
+        f"&inicio={amanha.isoformat()}&fim={amanha.isoformat()}"
+        f"&service_id={servico.id}"
+    )
+    assert [s["hora"] for s in resposta.get_json()["slots"]] == []
+
+    resposta = client.get(
+        f"/{tenant.slug}/slots/first?service_id={servico.id}"
+    )
+    assert [
+        s["hora"] for s in resposta.get_json()["slots"]
+        if s["data"] == amanha.isoformat()
+    ] == []
+
+    # O dono do hold continua vendo o horário
+    resposta = client.get(
+        f"/{tenant.slug}/slots?barber_id={barber.id}"
+        f"&inicio={amanha.isoformat()}&fim={amanha.isoformat()}"
+        f"&service_id={servico.id}&hold=outro"
+    )
+    assert [s["hora"] for s in resposta.get_json()["slots"]] == [
+        "10:00", "10:30"
+    ]
+
+
+def test_post_recusa_servico_que_cruza_hold(client, tenant, barber,
+                                            servico_longo_e_hold):
+    servico, amanha = servico_longo_e_hold
+
+    resposta = client.post(f"/{tenant.slug}/agendar", data={
+        "barber_id": barber.id,
+        "service_id": servico.id,
+        "slot_id": f"{amanha.isoformat()}T10:00",
+        "cliente_nome": "Cliente",
+        "cliente_whatsapp": "11999990000",
+    }, follow_redirects=True)
+
+    assert "reservado por outro cliente" in resposta.get_data(as_text=True)
+    assert Appointment.query.count() == 0
+    assert AvailableSlot.query.filter_by(disponivel=False).count() == 0
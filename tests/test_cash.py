@@ -0,0 +1,125 @@
+import threading
+from datetime import date
+from decimal import Decimal
+
+from sqlalchemy import func
+
+from app.extensions import db
+from app.models import CashSession, CashMovement, DailyFinancial
+from tests.conftest import login
+
+
+# =========================================================
+# TOTAIS DA SESSÃO SOB CONCORRÊNCIA
+# =========================================================
+
+def test_entradas_concorrentes_nao_perdem_total(app, tenant, admin):
+    """
+    Entradas simultâneas na mesma sessão: o incremento no
+    banco mantém total_entradas == soma dos movimentos
+    """
+    caixa = CashSession.abrir_caixa(tenant.id, admin.id)
+    db.session.commit()
+    caixa_id = caixa.id
+
+    threads_total = 8
+    por_thread = 5
+    largada = threading.Barrier(threads_total)
+    erros = []
+
+    clients = []
+    for _ in range(threads_total):
+        client = app.test_client()
+        login(client, admin)
+        clients.append(client)
+
+    def lancar(i):
+        try:
+            client = clients[i]
+            largada.wait()
+
+            for j in range(por_thread):
+                resposta = client.post("/dashboard/cash/movement", data={
+                    "tipo": "ENTRADA",
+                    "valor": f"{i + 1}.{j}5",
+                    "descricao": f"Entrada {i}-{j}",
+                })
+                assert resposta.status_code == 302
+        except Exception as e:  # falha na thread reprova o teste
+            erros.append(e)
+
+    threads = [
+        threading.Thread(target=lancar, args=(i,))
+        for i in range(threads_total)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert not erros
+
+    db.session.expire_all()
+
+    quantidade, soma = db.session.query(
+        func.count(CashMovement.id),
+        func.sum(CashMovement.valor)
+    ).filter(
+        CashMovement.cash_session_id == caixa_id,
+        CashMovement.tipo == "ENTRADA"
+    ).one()
+
+    esperado = sum(
+        Decimal(f"{i + 1}.{j}5")
+        for i in range(threads_total)
+        for j in range(por_thread)
+    )
+
+    assert quantidade == threads_total * por_thread
+    assert Decimal(soma) == esperado
+    assert db.session.get(CashSession, caixa_id).total_entradas == esperado
+
+
+# =========================================================
+# AJUSTES NO CONSOLIDADO DIÁRIO
+# =========================================================
+
+def _consolidado(tenant_id):
+    return sorted(
+        (tipo, categoria, Decimal(total), quantidade)
+        for tipo, categoria, total, quantidade in db.session.query(
+            DailyFinancial.tipo,
+            DailyFinancial.categoria,
+            DailyFinancial.total,
+            DailyFinancial.quantidade
+        ).filter(DailyFinancial.tenant_id == tenant_id)
+    )
+
+
+def test_ajustes_mantem_sinal_no_consolidado(app, tenant, admin):
+    caixa = CashSession.abrir_caixa(tenant.id, admin.id)
+
+    for valor in ("5.00", "-5.00", "-2.50"):
+        CashMovement.registrar_ajuste(tenant.id, caixa, admin.id, valor)
+
+    db.session.commit()
+
+    incremental = _consolidado(tenant.id)
+
+    assert incremental == [
+        ("ENTRADA", "AJUSTE", Decimal("5.00"), 1),
+        ("SAIDA", "AJUSTE", Decimal("7.50"), 2),
+    ]
+
+    # Total da sessão bate com o consolidado
+    totais = DailyFinancial.totais(
+        tenant.id, date.min, date.max
+    )
+    assert caixa.total_entradas == totais["entradas"] == Decimal("5.00")
+    assert caixa.total_saidas == totais["saidas"] == Decimal("7.50")
+
+    # Reconstruir a partir dos movimentos dá o mesmo resultado
+    DailyFinancial.reconstruir(tenant.id)
+    db.session.commit()
+
+    assert _consolidado(tenant.id) == incremental
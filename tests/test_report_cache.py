@@ -0,0 +1,94 @@
+import sys
+import types
+from datetime import timedelta
+
+from app.utils import report_cache
+from app.utils.dates import hoje_local
+
+
+class _RedisFalso:
+    """
+    Store em dicionário com a parte da API do redis usada
+    pelo RedisBackend; instâncias do mesmo servidor
+    compartilham `dados`
+    """
+
+    def __init__(self, dados):
+        self.dados = dados
+        self.ttls = {}
+
+    def get(self, chave):
+        return self.dados.get(chave)
+
+    def set(self, chave, valor, ex=None):
+        self.dados[chave] = valor
+        self.ttls[chave] = ex
+
+    def incr(self, chave):
+        self.dados[chave] = str(int(self.dados.get(chave) or 0) + 1).encode()
+
+
+def _relatorio_fechado(tenant_id, calculos):
+    fim = hoje_local(tenant_id) - timedelta(days=1)
+
+    def calcular():
+        calculos.append(1)
+        return {"calculo": len(calculos)}
+
+    return report_cache.obter_ou_calcular(
+        tenant_id, "overview", fim - timedelta(days=30), fim, calcular
+    )
+
+
+def test_historico_no_redis_invalida_por_outra_instancia(app, tenant,
+                                                         monkeypatch):
+    dados = {}
+    servidor = types.SimpleNamespace(
+        Redis=types.SimpleNamespace(from_url=lambda url: _RedisFalso(dados))
+    )
+    monkeypatch.setitem(sys.modules, "redis", servidor)
+
+    worker_a = report_cache.RedisBackend("redis://teste")
+    worker_b = report_cache.RedisBackend("redis://teste")
+    monkeypatch.setattr(report_cache, "_backend", worker_a)
+
+    calculos = []
+    assert _relatorio_fechado(tenant.id, calculos) == {"calculo": 1}
+    assert _relatorio_fechado(tenant.id, calculos) == {"calculo": 1}
+
+    # Versão compartilhada: período fechado pode ficar sem TTL
+    assert None in worker_a._redis.ttls.values()
+
+    # Escrita retroativa tratada por outro processo
+    worker_b.incrementar(
+        report_cache._chave_versao(tenant.id, report_cache.HISTORICO)
+    )
+
+    assert _relatorio_fechado(tenant.id, calculos) == {"calculo": 2}
+
+
+def test_historico_em_memoria_expira_apesar_da_versao_local(app, tenant,
+                                                            monkeypatch):
+    import app.utils.cache as cache
+
+    worker_a = report_cache.MemoriaBackend(maxsize=16)
+    worker_b = report_cache.MemoriaBackend(maxsize=16)
+    monkeypatch.setattr(report_cache, "_backend", worker_a)
+
+    agora = [1000.0]
+    monkeypatch.setattr(
+        cache, "time", types.SimpleNamespace(monotonic=lambda: agora[0])
+    )
+
+    calculos = []
+    assert _relatorio_fechado(tenant.id, calculos) == {"calculo": 1}
+
+    # A versão de outro processo não chega a este
+    worker_b.incrementar(
+        report_cache._chave_versao(tenant.id, report_cache.HISTORICO)
+    )
+    assert _relatorio_fechado(tenant.id, calculos) == {"calculo": 1}
+
+    # ...mas a entrada tem TTL finito e é recalculada
+    agora[0] += app.config["REPORT_CACHE_HISTORY_TTL"] + 1
+    assert _relatorio_fechado(tenant.id, calculos) == {"calculo": 2}
@@ -0,0 +1,57 @@
+from datetime import datetime, timedelta
+
+from app.extensions import db
+from app.models.report_job import ReportJob, CONCLUIDO
+from app.utils import report_jobs
+
+
+def _job_finalizado(usuario, dias_atras):
+    job = ReportJob(
+        tenant_id=None,
+        usuario_id=usuario.id,
+        tipo="admin_dashboard",
+        parametros=f'{{"days":{dias_atras}}}',
+        status=CONCLUIDO,
+        resultado="{}",
+        concluido_em=datetime.utcnow() - timedelta(days=dias_atras)
+    )
+    db.session.add(job)
+    return job
+
+
+def test_job_em_thread_remove_resultados_vencidos(app, admin):
+    """
+    Modo "thread": sem `flask report-worker`, a retenção
+    roda ao fim de cada job executado no processo web
+    """
+    vencido = _job_finalizado(admin, 40)
+    recente = _job_finalizado(admin, 2)
+
+    job, novo = ReportJob.enfileirar(
+        None, admin.id, "admin_dashboard", {"days": 7},
+        reaproveitar_por=0
+    )
+    db.session.commit()
+    assert novo
+
+    ids = (vencido.id, recente.id, job.id)
+
+    report_jobs._executar_no_app(app, job.id)
+
+    db.session.expire_all()
+    vencido_id, recente_id, job_id = ids
+
+    assert db.session.get(ReportJob, vencido_id) is None
+    assert db.session.get(ReportJob, recente_id) is not None
+    assert db.session.get(ReportJob, job_id).status == CONCLUIDO
+
+
+def test_limpeza_roda_no_maximo_uma_vez_por_intervalo(app, admin):
+    assert report_jobs.limpar_antigos() == 0
+
+    _job_finalizado(admin, 40)
+    db.session.commit()
+
+    # Dentro do intervalo: não consulta de novo
+    assert report_jobs.limpar_antigos() == 0
+    assert ReportJob.query.count() == 1
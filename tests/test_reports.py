@@ -0,0 +1,39 @@
+import pytest
+
+from tests.conftest import login
+
+
+@pytest.mark.parametrize("comissao", ["nan", "snan", "Infinity", "-1", "101", "abc"])
+def test_comissao_invalida_responde_400(client, admin, comissao):
+    login(client, admin)
+
+    resposta = client.get(f"/dashboard/reports/barbers?commission={comissao}")
+
+    assert resposta.status_code == 400
+
+
+def test_comissao_valida_responde_200(client, admin):
+    login(client, admin)
+
+    resposta = client.get("/dashboard/reports/barbers?commission=35.5")
+
+    assert resposta.status_code == 200
+
+
+@pytest.mark.parametrize("minimo, mensal", [(92, False), (10, True)])
+def test_agrupamento_mensal_segue_report_jobs_min_days(app, client, admin,
+                                                       minimo, mensal):
+    """
+    O gráfico começa por mês exatamente quando a rota trata
+    o período como longo (REPORT_JOBS_MIN_DAYS)
+    """
+    app.config["REPORT_JOBS_MIN_DAYS"] = minimo
+    app.config["REPORT_JOBS_EXECUTOR"] = "worker"
+    login(client, admin)
+
+    resposta = client.get(
+        "/dashboard/reports/?start=2026-01-01&end=2026-01-31"
+    )
+
+    assert resposta.status_code == 200
+    assert ('bucketSelect.value = "month"' in resposta.get_data(as_text=True)) is mensal